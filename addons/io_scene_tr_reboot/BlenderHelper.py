@@ -1,7 +1,9 @@
+import hashlib
 from types import TracebackType
 from typing import Any, ClassVar, Iterable, NamedTuple, Sequence, cast
 import bpy
 import bmesh
+import numpy
 from io_scene_tr_reboot.BlenderNaming import BlenderNaming
 from io_scene_tr_reboot.util.Enumerable import Enumerable
 from io_scene_tr_reboot.util.SlotsBase import SlotsBase
@@ -13,6 +15,10 @@ class BlenderBoneGroup(NamedTuple):
 class BlenderHelper:
     is_blender_40: ClassVar[bool] = cast(tuple[int, ...], bpy.app.version) >= (4, 0, 0)
 
+    __constant_interpolation: ClassVar[int] = 0
+    __linear_interpolation: ClassVar[int] = 1
+    __bezier_interpolation: ClassVar[int] = 2
+
     @staticmethod
     def select_object(bl_obj: bpy.types.Object) -> None:
         bpy.ops.object.select_all(action = "DESELECT")
@@ -210,6 +216,205 @@ class BlenderHelper:
                 bl_layer_collection = cast(bmesh.types.BMLayerCollection[float | None], getattr(bl_mesh.edges.layers, "bevel_weight"))
                 bl_mesh.edges[edge_idx][bl_layer_collection.active] = weight
 
+    @staticmethod
+    def get_mesh_content_hash(bl_obj: bpy.types.Object, scale_factor: float) -> str:
+        bl_mesh = cast(bpy.types.Mesh, bl_obj.data)
+        if hasattr(bl_mesh, "calc_normals_split"):
+            getattr(bl_mesh, "calc_normals_split")()
+
+        content_hash = hashlib.blake2b(digest_size = 16)
+        content_hash.update(f"scale/{scale_factor!r}".encode())
+        BlenderHelper.__hash_collection_values(content_hash, bl_mesh.vertices, "co", 3, numpy.float32)
+        BlenderHelper.__hash_collection_values(content_hash, bl_mesh.loops, "vertex_index", 1, numpy.int32)
+        BlenderHelper.__hash_collection_values(content_hash, bl_mesh.loops, "normal", 3, numpy.float32)
+        BlenderHelper.__hash_collection_values(content_hash, bl_mesh.polygons, "loop_start", 1, numpy.int32)
+        BlenderHelper.__hash_collection_values(content_hash, bl_mesh.polygons, "loop_total", 1, numpy.int32)
+        BlenderHelper.__hash_collection_values(content_hash, bl_mesh.polygons, "material_index", 1, numpy.int32)
+
+        for bl_uv_map in bl_mesh.uv_layers:
+            BlenderHelper.__hash_collection_values(content_hash, bl_uv_map.data, "uv", 2, numpy.float32)
+
+        for bl_color_map in bl_mesh.color_attributes:
+            content_hash.update(f"{bl_color_map.data_type}/{bl_color_map.domain}".encode())
+            BlenderHelper.__hash_collection_values(content_hash, bl_color_map.data, "color", 4, numpy.float32)
+
+        for bl_material in bl_mesh.materials:
+            content_hash.update(f"material/{bl_material and bl_material.name}".encode())
+
+        for bl_vertex_group in bl_obj.vertex_groups:
+            content_hash.update(f"group/{BlenderNaming.parse_bone_name(bl_vertex_group.name).local_id}".encode())
+
+        if cast(bpy.types.Key | None, bl_mesh.shape_keys) is not None:
+            for bl_shape_key in bl_mesh.shape_keys.key_blocks:
+                content_hash.update(f"shape/{bl_shape_key.name}/{bl_shape_key.relative_key.name}/{bl_shape_key.value!r}/{bl_shape_key.mute}/{bl_shape_key.vertex_group}".encode())
+                BlenderHelper.__hash_collection_values(content_hash, bl_shape_key.data, "co", 3, numpy.float32)
+
+        return content_hash.hexdigest()
+
+    @staticmethod
+    def get_mesh_vertex_weights_hash(bl_obj: bpy.types.Object) -> str:
+        bl_mesh = cast(bpy.types.Mesh, bl_obj.data)
+        vertex_weights = numpy.array(
+            [(bl_vertex.index, bl_weight.group, bl_weight.weight) for bl_vertex in bl_mesh.vertices for bl_weight in bl_vertex.groups],
+            numpy.float64
+        ).reshape(-1, 3)
+        return BlenderHelper.get_vertex_weights_hash(vertex_weights[:, 0], vertex_weights[:, 1], numpy.round(vertex_weights[:, 2] * 255))
+
+    @staticmethod
+    def get_vertex_weights_hash(vertex_idxs: numpy.ndarray[Any, Any], group_idxs: numpy.ndarray[Any, Any], byte_weights: numpy.ndarray[Any, Any]) -> str:
+        # Weights are compared at the 1/255 precision of the game files. Like in Blender, weights that are added
+        # to the same vertex and group more than once are summed up and clamped.
+        vertex_idxs = numpy.asarray(vertex_idxs, numpy.int64)
+        group_idxs = numpy.asarray(group_idxs, numpy.int64)
+        byte_weights = numpy.asarray(byte_weights, numpy.int64)
+
+        order = numpy.lexsort((group_idxs, vertex_idxs))
+        vertex_idxs = vertex_idxs[order]
+        group_idxs = group_idxs[order]
+        is_first = (numpy.diff(vertex_idxs, prepend = -1) != 0) | (numpy.diff(group_idxs, prepend = -1) != 0)
+        weight_idxs = numpy.cumsum(is_first) - 1
+        summed_weights = numpy.minimum(numpy.bincount(weight_idxs, byte_weights[order], numpy.count_nonzero(is_first)), 255).astype(numpy.int64)
+
+        used = summed_weights > 0
+        vertex_weights = numpy.stack([vertex_idxs[is_first][used], group_idxs[is_first][used], summed_weights[used]], axis = 1)
+        return hashlib.blake2b(vertex_weights.astype(numpy.int32).tobytes(), digest_size = 16).hexdigest()
+
+    @staticmethod
+    def __hash_collection_values(content_hash: "hashlib._Hash", bl_collection: Any, attr_name: str, num_components: int, dtype: type[numpy.generic]) -> None:
+        values = numpy.empty(len(bl_collection) * num_components, dtype)
+        bl_collection.foreach_get(attr_name, values)
+        content_hash.update(values.tobytes())
+
+    @staticmethod
+    def sample_fcurve(bl_fcurve: bpy.types.FCurve, frames: numpy.ndarray[Any, Any]) -> numpy.ndarray[Any, Any]:
+        bl_keyframes = bl_fcurve.keyframe_points
+        interpolations = numpy.empty(len(bl_keyframes), numpy.int32)
+        bl_keyframes.foreach_get("interpolation", interpolations)
+        if len(bl_keyframes) == 0 or len(bl_fcurve.modifiers) > 0 or numpy.any(interpolations > BlenderHelper.__bezier_interpolation):
+            return numpy.array([bl_fcurve.evaluate(frame) for frame in frames.tolist()], numpy.float64)
+
+        keyframe_data: list[numpy.ndarray[Any, Any]] = []
+        for attr_name in ["co", "handle_left", "handle_right"]:
+            values = numpy.empty(len(bl_keyframes) * 2, numpy.float32)
+            bl_keyframes.foreach_get(attr_name, values)
+            keyframe_data.append(values.reshape(-1, 2).astype(numpy.float64))
+
+        return BlenderHelper.evaluate_keyframes(*keyframe_data, interpolations, bl_fcurve.extrapolation == "LINEAR", frames)
+
+    @staticmethod
+    def evaluate_keyframes(
+        points: numpy.ndarray[Any, Any],
+        left_handles: numpy.ndarray[Any, Any],
+        right_handles: numpy.ndarray[Any, Any],
+        interpolations: numpy.ndarray[Any, Any],
+        linear_extrapolation: bool,
+        frames: numpy.ndarray[Any, Any]
+    ) -> numpy.ndarray[Any, Any]:
+        # Follows Blender's own keyframe evaluation (fcurve_eval_keyframes), for all frames at once
+        frames = numpy.asarray(frames, numpy.float64)
+        values = numpy.empty(len(frames))
+        last_idx = len(points) - 1
+
+        for endpoint_idx, neighbor_idx, handles, mask in [
+            (0,        1,            left_handles,  frames <= points[0, 0]),
+            (last_idx, last_idx - 1, right_handles, frames >= points[last_idx, 0])
+        ]:
+            endpoint_value = points[endpoint_idx, 1]
+            values[mask] = endpoint_value
+            if not linear_extrapolation or interpolations[endpoint_idx] == BlenderHelper.__constant_interpolation:
+                continue
+
+            if interpolations[endpoint_idx] == BlenderHelper.__linear_interpolation:
+                if last_idx == 0:
+                    continue
+
+                slope_delta = points[neighbor_idx] - points[endpoint_idx]
+            else:
+                slope_delta = points[endpoint_idx] - handles[endpoint_idx]
+
+            if slope_delta[0] != 0:
+                values[mask] = endpoint_value - slope_delta[1] / slope_delta[0] * (points[endpoint_idx, 0] - frames[mask])
+
+        inner_mask = (frames > points[0, 0]) & (frames < points[last_idx, 0])
+        inner_frames = frames[inner_mask]
+        next_idxs = numpy.searchsorted(points[:, 0], inner_frames, side = "right")
+        prev_idxs = next_idxs - 1
+        prev_points = points[prev_idxs]
+        next_points = points[next_idxs]
+        inner_values = prev_points[:, 1].copy()
+
+        linear_mask = interpolations[prev_idxs] == BlenderHelper.__linear_interpolation
+        durations = next_points[:, 0] - prev_points[:, 0]
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            linear_values = prev_points[:, 1] + (next_points[:, 1] - prev_points[:, 1]) * (inner_frames - prev_points[:, 0]) / durations
+
+        inner_values[linear_mask & (durations != 0)] = linear_values[linear_mask & (durations != 0)]
+
+        bezier_mask = (interpolations[prev_idxs] == BlenderHelper.__bezier_interpolation) & (durations != 0)
+        if numpy.any(bezier_mask):
+            inner_values[bezier_mask] = BlenderHelper.__evaluate_bezier_segments(
+                prev_points[bezier_mask],
+                right_handles[prev_idxs[bezier_mask]],
+                left_handles[next_idxs[bezier_mask]],
+                next_points[bezier_mask],
+                inner_frames[bezier_mask]
+            )
+
+        # Frames that (nearly) coincide with a keyframe take its value directly
+        nearest_idxs = numpy.where(inner_frames - prev_points[:, 0] < next_points[:, 0] - inner_frames, prev_idxs, next_idxs)
+        exact_mask = numpy.abs(points[nearest_idxs, 0] - inner_frames) < 0.0001
+        inner_values[exact_mask] = points[nearest_idxs[exact_mask], 1]
+
+        values[inner_mask] = inner_values
+        return values
+
+    @staticmethod
+    def __evaluate_bezier_segments(
+        v1: numpy.ndarray[Any, Any],
+        v2: numpy.ndarray[Any, Any],
+        v3: numpy.ndarray[Any, Any],
+        v4: numpy.ndarray[Any, Any],
+        frames: numpy.ndarray[Any, Any]
+    ) -> numpy.ndarray[Any, Any]:
+        # Shorten handles that reach past the other end of the segment so that the curve's X stays monotonic (BKE_fcurve_correct_bezpart)
+        h1 = v1 - v2
+        h2 = v4 - v3
+        handle_lengths = numpy.abs(h1[:, 0]) + numpy.abs(h2[:, 0])
+        segment_lengths = v4[:, 0] - v1[:, 0]
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            factors = numpy.where(handle_lengths > segment_lengths, segment_lengths / handle_lengths, 1)[:, None]
+
+        v2 = v1 - factors * h1
+        v3 = v4 - factors * h2
+
+        def evaluate_cubic(p1: numpy.ndarray[Any, Any], p2: numpy.ndarray[Any, Any], p3: numpy.ndarray[Any, Any], p4: numpy.ndarray[Any, Any], t: numpy.ndarray[Any, Any]) -> numpy.ndarray[Any, Any]:
+            u = 1 - t
+            return u*u*u*p1 + 3*u*u*t*p2 + 3*u*t*t*p3 + t*t*t*p4
+
+        # Solve X(t) = frame with Newton steps, falling back to bisection whenever a step leaves the bracket around the root
+        x1, x2, x3, x4 = v1[:, 0], v2[:, 0], v3[:, 0], v4[:, 0]
+        t = (frames - x1) / (x4 - x1)
+        t_min = numpy.zeros(len(frames))
+        t_max = numpy.ones(len(frames))
+        for _ in range(64):
+            errors = evaluate_cubic(x1, x2, x3, x4, t) - frames
+            if numpy.all(numpy.abs(errors) < 1e-9):
+                break
+
+            t_min = numpy.where(errors < 0, t, t_min)
+            t_max = numpy.where(errors < 0, t_max, t)
+            u = 1 - t
+            derivatives = 3*u*u*(x2 - x1) + 6*u*t*(x3 - x2) + 3*t*t*(x4 - x3)
+            with numpy.errstate(divide = "ignore", invalid = "ignore"):
+                t = t - errors / derivatives
+
+            t = numpy.where((t > t_min) & (t < t_max), t, (t_min + t_max) / 2)
+
+        values = evaluate_cubic(v1[:, 1], v2[:, 1], v3[:, 1], v4[:, 1], t)
+        flat_mask = (numpy.abs(v1[:, 1] - v4[:, 1]) < 1.1920929e-07) & (numpy.abs(v2[:, 1] - v3[:, 1]) < 1.1920929e-07) & (numpy.abs(v3[:, 1] - v4[:, 1]) < 1.1920929e-07)
+        values[flat_mask] = v1[flat_mask, 1]
+        return values
+
     @staticmethod
     def view_all() -> None:
         for bl_area in Enumerable(bpy.context.screen.areas).where(lambda a: a.type == "VIEW_3D"):
@@ -120,13 +120,11 @@ class ClothExporter:
 
     def write_cloth_definition_file(self, folder_path: str, bl_armature_obj: bpy.types.Object, definition_builder: ResourceBuilder) -> None:
         definition_file_path = os.path.join(folder_path, Collection.make_resource_file_name(definition_builder.resource, self.game))
-        with open(definition_file_path, "wb") as definition_file:
-            definition_file.write(definition_builder.build())
+        definition_builder.write_to_path(definition_file_path)
 
     def write_cloth_tune_file(self, folder_path: str, bl_armature_obj: bpy.types.Object, tune_builder: ResourceBuilder) -> None:
         tune_file_path = os.path.join(folder_path, Collection.make_resource_file_name(tune_builder.resource, self.game))
-        with open(tune_file_path, "wb") as component_file:
-            component_file.write(tune_builder.build())
+        tune_builder.write_to_path(tune_file_path)
 
     def add_cloth_strip(
             self,
@@ -1,7 +1,8 @@
 from array import array
 import random
-from typing import Iterable, NamedTuple, Sequence, cast
+from typing import Any, Iterable, NamedTuple, Sequence, cast
 import bpy
+import numpy
 import os
 import re
 from mathutils import Vector
@@ -42,6 +43,7 @@ class ModelExporter(SlotsBase):
     scale_factor: float
     game: CdcGame
     factory: IFactory
+    source_models: dict[str, IModel | None]
 
     bl_context: bpy.types.Context
 
@@ -49,6 +51,7 @@ class ModelExporter(SlotsBase):
         self.scale_factor = scale_factor
         self.game = game
         self.factory = Factories.get(game)
+        self.source_models = {}
         self.bl_context = bpy.context
 
     def export_model(self, folder_path: str, ids: BlenderModelIdSet, bl_mesh_objs: list[bpy.types.Object], bl_armature_obj: bpy.types.Object | None) -> None:
@@ -61,10 +64,9 @@ class ModelExporter(SlotsBase):
         tr_model = self.create_model(ids.model_id, ids.model_data_id, bl_mesh_objs, blend_shape_global_ids)
 
         model_data_file_path = os.path.join(folder_path, f"{ids.model_data_id}.tr{self.game}modeldata")
-        with open(model_data_file_path, "wb") as model_data_file:
-            resource_builder = ResourceBuilder(ResourceKey(ResourceType.MODEL, ids.model_data_id), self.game)
-            tr_model.write(resource_builder)
-            model_data_file.write(resource_builder.build())
+        resource_builder = ResourceBuilder(ResourceKey(ResourceType.MODEL, ids.model_data_id), self.game)
+        tr_model.write(resource_builder)
+        resource_builder.write_to_path(model_data_file_path)
 
         self.export_extra_files(folder_path, ids.object_id, tr_model)
 
@@ -103,12 +105,14 @@ class ModelExporter(SlotsBase):
 
         blend_shape_normals_source_file_path: str | None = None
         for bl_obj in bl_objs:
-            tr_model.meshes.append(self.create_mesh(tr_model, bl_obj, blend_shape_global_ids))
+            tr_model.meshes.append(
+                self.reuse_source_mesh(tr_model, bl_obj, blend_shape_global_ids) or
+                self.create_mesh(tr_model, bl_obj, blend_shape_global_ids)
+            )
             properties = ObjectProperties.get_instance(bl_obj)
             if properties.blend_shape_normals_source_file_path:
                 blend_shape_normals_source_file_path = properties.blend_shape_normals_source_file_path
 
-        self.unsign_normals(tr_model)
         self.calc_bounding_box(tr_model)
 
         if blend_shape_normals_source_file_path:
@@ -154,9 +158,95 @@ class ModelExporter(SlotsBase):
             self.create_mesh_parts(tr_model, tr_mesh, bl_obj, bl_mesh, bl_corner_to_tr_vertex, use_8_weights_per_vertex)
             self.create_blend_shapes(tr_model, tr_mesh, bl_obj, bl_mesh, bl_corner_to_tr_vertex, blend_shape_global_ids)
             self.shrink_uvs(tr_mesh, bl_mesh_maps)
+            self.unsign_normals(tr_mesh)
 
             return tr_mesh
 
+    def reuse_source_mesh(self, tr_model: IModel, bl_obj: bpy.types.Object, blend_shape_global_ids: dict[int, int] | None) -> IMesh | None:
+        props = ObjectProperties.get_instance(bl_obj).mesh
+        if Enumerable(bl_obj.modifiers).any(lambda m: not isinstance(m, (bpy.types.ArmatureModifier, bpy.types.TriangulateModifier))):
+            return None
+
+        if not props.source_content_hash or props.source_content_hash != BlenderHelper.get_mesh_content_hash(bl_obj, self.scale_factor):
+            return None
+
+        tr_source_model = self.source_models.get(props.source_file_path)
+        if props.source_file_path not in self.source_models:
+            tr_source_model = self.load_model(props.source_file_path)
+            self.source_models[props.source_file_path] = tr_source_model
+
+        if tr_source_model is None or tr_source_model.__class__ != tr_model.__class__ or props.source_mesh_idx >= len(tr_source_model.meshes):
+            return None
+
+        tr_source_mesh = tr_source_model.meshes[props.source_mesh_idx]
+        source_part_idxs = Enumerable(props.source_part_idxs.split(",")).select(int).to_list()
+        if Enumerable(source_part_idxs).any(lambda i: i >= len(tr_source_mesh.parts)):
+            return None
+
+        tr_mesh = tr_source_mesh.clone(True)
+        tr_mesh.parts = Enumerable(source_part_idxs).select(lambda i: tr_mesh.parts[i]).to_list()
+        if tr_mesh.get_content_hash() != props.source_data_hash:
+            return None
+
+        if list(self.collect_bl_vertex_groups(bl_obj).keys()) != list(tr_mesh.bone_indices):
+            return None
+
+        bl_mesh = cast(bpy.types.Mesh, bl_obj.data)
+        bl_shape_key_ids: set[int] = set()
+        if cast(bpy.types.Key | None, bl_mesh.shape_keys) is not None:
+            bl_shape_key_ids = Enumerable(bl_mesh.shape_keys.key_blocks).skip(1).select(lambda s: self.get_shape_key_local_id(s, blend_shape_global_ids)).to_set()
+
+        used_vertex_mask = tr_mesh.get_used_vertex_mask()
+        tr_blend_shape_ids = { i for i, tr_blend_shape in enumerate(tr_mesh.blend_shapes) if tr_blend_shape is not None and len(tr_blend_shape.get_position_offsets(used_vertex_mask)[0]) > 0 }
+        if bl_shape_key_ids != tr_blend_shape_ids:
+            return None
+
+        material_idxs: list[int] = []
+        for tr_mesh_part in tr_mesh.parts:
+            material_resource = tr_mesh_part.material_idx >= 0 and tr_source_model.refs.material_resources[tr_mesh_part.material_idx] or None
+            if material_resource is None:
+                return None
+
+            material_id = material_resource.id
+            material_idx = Enumerable(tr_model.refs.material_resources).index_of(lambda m: m is not None and m.id == material_id)
+            if material_idx < 0:
+                return None
+
+            material_idxs.append(material_idx)
+
+        # Reading the weights back from Blender is the slowest check, so it's done last
+        if props.source_weights_hash != BlenderHelper.get_mesh_vertex_weights_hash(bl_obj):
+            return None
+
+        for tr_mesh_part, material_idx in zip(tr_mesh.parts, material_idxs):
+            tr_mesh_part.material_idx = material_idx
+            tr_mesh_part.draw_group_id = props.draw_group_id
+            tr_mesh_part.flags = props.flags
+
+        self.remove_unused_vertices(tr_mesh, used_vertex_mask)
+        num_blend_shapes = tr_model.header.num_blend_shapes
+        tr_mesh.model_data_header = tr_model.header
+        tr_mesh.blend_shapes = (tr_mesh.blend_shapes + [None] * num_blend_shapes)[:num_blend_shapes]
+        return tr_mesh
+
+    def remove_unused_vertices(self, tr_mesh: IMesh, used_vertex_mask: numpy.ndarray[Any, Any]) -> None:
+        if used_vertex_mask.all():
+            return
+
+        used_vertex_idxs = numpy.flatnonzero(used_vertex_mask)
+        new_vertex_idxs = numpy.full(len(used_vertex_mask), -1, numpy.int64)
+        new_vertex_idxs[used_vertex_idxs] = numpy.arange(len(used_vertex_idxs))
+
+        tr_mesh.vertices = tr_mesh.vertices.take(used_vertex_idxs)
+        for tr_mesh_part in tr_mesh.parts:
+            tr_mesh_part.indices = array("H", new_vertex_idxs[numpy.asarray(tr_mesh_part.indices, numpy.int64)].astype(numpy.uint16).tobytes())
+
+        for tr_blend_shape in tr_mesh.blend_shapes:
+            if tr_blend_shape is None:
+                continue
+
+            tr_blend_shape.vertices = { int(new_vertex_idxs[vertex_idx]): offsets for vertex_idx, offsets in tr_blend_shape.vertices.items() if used_vertex_mask[vertex_idx] }
+
     def collect_bl_color_maps(self, bl_mesh: bpy.types.Mesh) -> dict[int, bpy.types.ByteColorAttribute]:
         attr_name_hashes = [Hashes.color1, Hashes.color2]
         if len(bl_mesh.color_attributes) > len(attr_name_hashes):
@@ -413,12 +503,11 @@ class ModelExporter(SlotsBase):
 
         return True
 
-    def unsign_normals(self, tr_model: IModel) -> None:
-        for tr_mesh in tr_model.meshes:
-            for tr_vertex in tr_mesh.vertices:
-                self.unsign_vector(tr_vertex, Hashes.normal)
-                self.unsign_vector(tr_vertex, Hashes.binormal)
-                self.unsign_vector(tr_vertex, Hashes.tangent)
+    def unsign_normals(self, tr_mesh: IMesh) -> None:
+        for tr_vertex in tr_mesh.vertices:
+            self.unsign_vector(tr_vertex, Hashes.normal)
+            self.unsign_vector(tr_vertex, Hashes.binormal)
+            self.unsign_vector(tr_vertex, Hashes.tangent)
 
     def unsign_vector(self, tr_vertex: Vertex, attr_name_hash: int) -> None:
         vector = tr_vertex.attributes.get(attr_name_hash)
@@ -439,34 +528,17 @@ class ModelExporter(SlotsBase):
                 tr_vertex.attributes[attr_name_hash] = (vector[0] / 16.0, (1 - vector[1]) / 16.0)
 
     def calc_bounding_box(self, tr_model: IModel) -> None:
-        x_min: float = 0.0
-        y_min: float = 0.0
-        z_min: float = 0.0
-
-        x_max: float = 0.0
-        y_max: float = 0.0
-        z_max: float = 0.0
-
-        first: bool = True
-
-        for tr_mesh in tr_model.meshes:
-            for tr_vertex in tr_mesh.vertices:
-                position = tr_vertex.attributes[Hashes.position]
-                if first:
-                    (x_min, y_min, z_min) = position
-                    (x_max, y_max, z_max) = position
-                    first = False
-                else:
-                    x_min = min(x_min, position[0])
-                    y_min = min(y_min, position[1])
-                    z_min = min(z_min, position[2])
-
-                    x_max = max(x_max, position[0])
-                    y_max = max(y_max, position[1])
-                    z_max = max(z_max, position[2])
-
-        tr_model.header.bound_box_min = Vector((x_min, y_min, z_min))
-        tr_model.header.bound_box_max = Vector((x_max, y_max, z_max))
+        positions = Enumerable(tr_model.meshes).select(lambda m: m.vertices.get_column(Hashes.position)) \
+                                               .where(lambda p: p is not None and len(p) > 0)           \
+                                               .to_list()
+        if len(positions) == 0:
+            tr_model.header.bound_box_min = Vector()
+            tr_model.header.bound_box_max = Vector()
+            return
+
+        all_positions = numpy.concatenate(cast(list[numpy.ndarray[Any, Any]], positions))[:, :3]
+        tr_model.header.bound_box_min = Vector(all_positions.min(axis = 0).tolist())
+        tr_model.header.bound_box_max = Vector(all_positions.max(axis = 0).tolist())
 
     def get_evaluated_bl_mesh(self, bl_obj: bpy.types.Object) -> bpy.types.Mesh:
         bl_obj_eval = bl_obj.evaluated_get(self.bl_context.evaluated_depsgraph_get())
@@ -509,9 +581,10 @@ class ModelExporter(SlotsBase):
                     int(round(target_vertex_pos[2] * 1000))
                 )] = target_vertex_idx
 
+            source_vertex_positions = cast(numpy.ndarray[Any, Any], tr_source_mesh.vertices.get_column(Hashes.position)).tolist()
+            source_vertex_normals = cast(numpy.ndarray[Any, Any], tr_source_mesh.vertices.get_column(Hashes.normal)).tolist()
             source_vertex_idx_by_target_vertex_idx: list[int | None] = [None] * len(tr_target_mesh.vertices)
-            for source_vertex_idx, source_vertex in enumerate(tr_source_mesh.vertices):
-                source_vertex_pos = source_vertex.attributes[Hashes.position]
+            for source_vertex_idx, source_vertex_pos in enumerate(source_vertex_positions):
                 target_vertex_idx = target_vertex_idx_by_position.get((
                     int(round(source_vertex_pos[0] * 1000)),
                     int(round(source_vertex_pos[1] * 1000)),
@@ -519,7 +592,7 @@ class ModelExporter(SlotsBase):
                 ))
                 if target_vertex_idx is not None:
                     source_vertex_idx_by_target_vertex_idx[target_vertex_idx] = source_vertex_idx
-                    tr_target_mesh.vertices[target_vertex_idx].attributes[Hashes.normal] = source_vertex.attributes[Hashes.normal]
+                    tr_target_mesh.vertices[target_vertex_idx].attributes[Hashes.normal] = tuple(source_vertex_normals[source_vertex_idx])
 
             for blend_shape_idx, tr_target_blend_shape in enumerate(tr_target_mesh.blend_shapes):
                 if blend_shape_idx >= len(tr_source_mesh.blend_shapes) or tr_target_blend_shape is None:
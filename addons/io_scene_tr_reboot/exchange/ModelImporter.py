@@ -1,25 +1,30 @@
 import bpy
-from typing import Callable, Iterable, TypeVar, cast
+from typing import Any, Callable, ClassVar, Iterable, TypeVar, cast
+import numpy
 from mathutils import Vector
 from io_scene_tr_reboot.BlenderHelper import BlenderHelper
 from io_scene_tr_reboot.BlenderNaming import BlenderNaming
 from io_scene_tr_reboot.exchange.MaterialImporter import MaterialImporter
 from io_scene_tr_reboot.properties.ObjectProperties import ObjectProperties
 from io_scene_tr_reboot.properties.SceneProperties import SceneProperties
+from io_scene_tr_reboot.tr.BlendShape import BlendShape
 from io_scene_tr_reboot.tr.Collection import Collection
 from io_scene_tr_reboot.tr.Enumerations import ResourceType
 from io_scene_tr_reboot.tr.Hashes import Hashes
 from io_scene_tr_reboot.tr.Mesh import IMesh
 from io_scene_tr_reboot.tr.MeshPart import IMeshPart
+from io_scene_tr_reboot.tr.MeshWelder import MeshWelder
 from io_scene_tr_reboot.tr.Model import IModel
+from io_scene_tr_reboot.tr.ResourceKey import ResourceKey
 from io_scene_tr_reboot.tr.Skeleton import ISkeleton
-from io_scene_tr_reboot.tr.Vertex import Vertex
 from io_scene_tr_reboot.util.Enumerable import Enumerable
 from io_scene_tr_reboot.util.SlotsBase import SlotsBase
 
 T = TypeVar("T")
 
 class ModelImporter(SlotsBase):
+    vertex_merge_distance: ClassVar[float] = 0.0001
+
     material_importer: MaterialImporter
     scale_factor: float
     split_into_parts: bool
@@ -52,8 +57,9 @@ class ModelImporter(SlotsBase):
         bl_objs_by_model: dict[int, list[bpy.types.Object]] = {}
         bl_meshes_by_model: dict[int, list[bpy.types.Mesh]] = {}
 
-        for tr_instance in tr_collection.get_model_instances():
-            tr_model = tr_collection.get_model(tr_instance.resource)
+        tr_instances = tr_collection.get_model_instances()
+        tr_models = tr_collection.get_models([tr_instance.resource for tr_instance in tr_instances])
+        for tr_instance, tr_model in zip(tr_instances, tr_models):
             if tr_model is None:
                 continue
 
@@ -82,6 +88,12 @@ class ModelImporter(SlotsBase):
 
         bl_mesh_objs: list[bpy.types.Object] = []
 
+        source_file_path = tr_collection.get_resource_file_path(tr_model.refs.model_data_resource or ResourceKey(ResourceType.MODEL, tr_model.id))
+        source_part_locations: dict[int, tuple[int, int]] = {}
+        for source_mesh_idx, tr_mesh in enumerate(tr_model.meshes):
+            for source_part_idx, tr_mesh_part in enumerate(tr_mesh.parts):
+                source_part_locations[id(tr_mesh_part)] = (source_mesh_idx, source_part_idx)
+
         if self.import_lods:
             self.separate_lods(tr_model)
         else:
@@ -94,40 +106,70 @@ class ModelImporter(SlotsBase):
 
         for i, tr_mesh in enumerate(tr_model.meshes):
             bl_mesh_name = BlenderNaming.make_mesh_name(tr_collection.name, tr_collection.id, tr_model.id, tr_model.refs.model_data_resource and tr_model.refs.model_data_resource.id or 0, i)
+            source_data_hash = tr_mesh.get_content_hash()
             bl_obj = self.import_mesh(tr_collection, tr_model, tr_mesh, tr_skeleton, bl_mesh_name)
+            if source_file_path is not None:
+                self.store_mesh_source(bl_obj, tr_mesh, source_file_path, source_part_locations, source_data_hash)
+
             bl_mesh_objs.append(bl_obj)
 
         return bl_mesh_objs
 
     def import_mesh(self, tr_collection: Collection, tr_model: IModel, tr_mesh: IMesh, tr_skeleton: ISkeleton | None, name: str) -> bpy.types.Object:
-        has_blend_shapes = Enumerable(tr_mesh.blend_shapes).any(lambda b: b is not None)
+        tr_blend_shape_offsets = self.get_blend_shape_offsets(tr_mesh)
 
-        (bl_obj, bl_mesh) = self.create_mesh(tr_model, tr_mesh, name)
-        self.create_color_maps(bl_mesh, tr_mesh)
-        self.create_uv_maps(bl_mesh, tr_mesh)
-        self.apply_materials(bl_mesh, tr_collection, tr_model, tr_mesh)
-        self.create_vertex_groups(bl_obj, tr_mesh, tr_skeleton)
-        self.create_shape_keys(bl_obj, tr_mesh, tr_skeleton)
-
-        bpy.ops.object.shade_smooth()
+        # Meshes with blend shapes get their split vertices merged so they shade smoothly, the others keep them for their custom normals
+        if len(tr_blend_shape_offsets) > 0:
+            weld = MeshWelder.weld(tr_mesh, self.vertex_merge_distance / self.scale_factor, tr_blend_shape_offsets.values())
+        else:
+            weld = MeshWelder.weld(tr_mesh, None)
+
+        (bl_obj, bl_mesh) = self.create_mesh(tr_model, tr_mesh, weld, name)
+        self.create_color_maps(bl_mesh, tr_mesh, weld)
+        self.create_uv_maps(bl_mesh, tr_mesh, weld)
+        self.apply_materials(bl_mesh, tr_collection, tr_model, tr_mesh, weld)
+        self.create_vertex_groups(bl_obj, tr_mesh, weld, tr_skeleton)
+        has_blend_shapes = self.create_shape_keys(bl_obj, tr_mesh, weld, tr_blend_shape_offsets, tr_skeleton)
         if has_blend_shapes:
-            self.clean_mesh(bl_mesh)
+            # Welding drops collapsed triangles but can still leave e.g. duplicate faces behind
+            bl_mesh.validate()
         else:
-            self.apply_vertex_normals(bl_mesh, tr_mesh)
-            self.remove_loose_vertices()
+            self.apply_vertex_normals(bl_mesh, tr_mesh, weld)
 
         return bl_obj
 
-    def create_mesh(self, tr_model: IModel, tr_mesh: IMesh, name: str) -> tuple[bpy.types.Object, bpy.types.Mesh]:
-        vertices: list[Vector] = [self.get_vertex_position(vertex) for vertex in tr_mesh.vertices]
-        faces: list[tuple[int, ...]] = []
-        for tr_mesh_part in tr_mesh.parts:
-            for i in range(0, len(tr_mesh_part.indices), 3):
-                faces.append((tr_mesh_part.indices[i], tr_mesh_part.indices[i + 1], tr_mesh_part.indices[i + 2]))
+    def store_mesh_source(self, bl_obj: bpy.types.Object, tr_mesh: IMesh, source_file_path: str, source_part_locations: dict[int, tuple[int, int]], source_data_hash: str) -> None:
+        part_locations = Enumerable(tr_mesh.parts).select(lambda p: source_part_locations[id(p)]).to_list()
+        if Enumerable(part_locations).select(lambda l: l[0]).distinct().count() != 1:
+            return
+
+        props = ObjectProperties.get_instance(bl_obj).mesh
+        props.source_file_path = source_file_path
+        props.source_mesh_idx = part_locations[0][0]
+        props.source_part_idxs = ",".join(Enumerable(part_locations).select(lambda l: str(l[1])))
+        props.source_data_hash = source_data_hash
+        props.source_content_hash = BlenderHelper.get_mesh_content_hash(bl_obj, self.scale_factor)
+
+    def create_mesh(self, tr_model: IModel, tr_mesh: IMesh, weld: MeshWelder.Result, name: str) -> tuple[bpy.types.Object, bpy.types.Mesh]:
+        positions = cast(numpy.ndarray[Any, Any], tr_mesh.vertices.get_column(Hashes.position))[weld.vertex_idxs, :3]
+        positions = (positions * self.scale_factor).astype(numpy.float32)
+        corner_vertex_idxs = weld.corner_vertex_idxs
+        num_faces = len(corner_vertex_idxs) // 3
 
         bl_mesh: bpy.types.Mesh = bpy.data.meshes.new(name)
-        bl_mesh.from_pydata(vertices, [], faces)
-        bl_mesh.update()
+        bl_mesh.vertices.add(len(positions))
+        bl_mesh.vertices.foreach_set("co", positions.reshape(-1))
+        bl_mesh.loops.add(len(corner_vertex_idxs))
+        bl_mesh.loops.foreach_set("vertex_index", corner_vertex_idxs)
+        bl_mesh.polygons.add(num_faces)
+        bl_mesh.polygons.foreach_set("loop_start", numpy.arange(0, len(corner_vertex_idxs), 3, dtype = numpy.int32))
+
+        # Newer Blender versions derive the polygon sizes from loop_start and no longer allow setting them
+        if not bpy.types.MeshPolygon.bl_rna.properties["loop_total"].is_readonly:
+            bl_mesh.polygons.foreach_set("loop_total", numpy.full(num_faces, 3, numpy.int32))
+
+        bl_mesh.polygons.foreach_set("use_smooth", numpy.ones(num_faces, bool))
+        bl_mesh.update(calc_edges = True)
 
         bl_obj = BlenderHelper.create_object(bl_mesh)
 
@@ -141,74 +183,42 @@ class ModelImporter(SlotsBase):
 
         return (bl_obj, bl_mesh)
 
-    def apply_vertex_normals(self, bl_mesh: bpy.types.Mesh, tr_mesh: IMesh) -> None:
+    def apply_vertex_normals(self, bl_mesh: bpy.types.Mesh, tr_mesh: IMesh, weld: MeshWelder.Result) -> None:
         if not tr_mesh.vertex_format.has_attribute(Hashes.normal):
             return
 
-        normals: list[Vector] = [self.get_vertex_normal(vertex) for vertex in tr_mesh.vertices]
-        bl_mesh.normals_split_custom_set_from_vertices(normals)     # type: ignore
+        normals = cast(numpy.ndarray[Any, Any], tr_mesh.vertices.get_column(Hashes.normal))[weld.vertex_idxs, :3] * 2 - 1
+        lengths = numpy.linalg.norm(normals, axis = 1, keepdims = True)
+        lengths[lengths == 0] = 1
+        bl_mesh.normals_split_custom_set_from_vertices(normals / lengths)     # type: ignore
 
         if hasattr(bl_mesh, "use_auto_smooth"):
             setattr(bl_mesh, "use_auto_smooth", True)
 
-    def clean_mesh(self, bl_mesh: bpy.types.Mesh) -> None:
-        bl_mesh.validate()
-
-        with BlenderHelper.enter_edit_mode():
-            bpy.ops.mesh.select_all(action = "SELECT")
-            bpy.ops.mesh.remove_doubles()
-            bpy.ops.mesh.normals_make_consistent()
-            bpy.ops.mesh.delete_loose()
-            bpy.ops.mesh.select_all(action = "DESELECT")
-
-    def remove_loose_vertices(self) -> None:
-        with BlenderHelper.enter_edit_mode():
-            bpy.ops.mesh.select_all(action = "SELECT")
-            bpy.ops.mesh.delete_loose()
-            bpy.ops.mesh.select_all(action = "DESELECT")
-
-    def create_color_maps(self, bl_mesh: bpy.types.Mesh, tr_mesh: IMesh) -> None:
+    def create_color_maps(self, bl_mesh: bpy.types.Mesh, tr_mesh: IMesh, weld: MeshWelder.Result) -> None:
         for color_map_idx, attr_name_hash in enumerate([Hashes.color1, Hashes.color2]):
             if not tr_mesh.vertex_format.has_attribute(attr_name_hash):
                 continue
 
             bl_color_map = cast(bpy.types.ByteColorAttribute, bl_mesh.color_attributes.new(BlenderNaming.make_color_map_name(color_map_idx), "BYTE_COLOR", "POINT"))
-            bl_color_map.data.foreach_set(
-                "color",
-                [component for vertex in tr_mesh.vertices for component in vertex.attributes[attr_name_hash]]
-            )
+            colors = cast(numpy.ndarray[Any, Any], tr_mesh.vertices.get_column(attr_name_hash))[weld.vertex_idxs]
+            bl_color_map.data.foreach_set("color", colors.astype(numpy.float32).reshape(-1))
 
-    def create_uv_maps(self, bl_mesh: bpy.types.Mesh, tr_mesh: IMesh) -> None:
+    def create_uv_maps(self, bl_mesh: bpy.types.Mesh, tr_mesh: IMesh, weld: MeshWelder.Result) -> None:
         for uv_map_idx, attr_name_hash in enumerate([Hashes.texcoord1, Hashes.texcoord2, Hashes.texcoord3, Hashes.texcoord4]):
             if not tr_mesh.vertex_format.has_attribute(attr_name_hash):
                 continue
 
+            # UVs are per corner, so merged vertices keep their seams
+            uvs = cast(numpy.ndarray[Any, Any], tr_mesh.vertices.get_column(attr_name_hash))[weld.corner_source_vertex_idxs, :2]
             uv_layer = bl_mesh.uv_layers.new(name = BlenderNaming.make_uv_map_name(uv_map_idx))
-            uv_layer.data.foreach_set(
-                "uv",
-                [coord for tr_mesh_part in tr_mesh.parts for index in tr_mesh_part.indices for coord in self.get_vertex_uv(tr_mesh.vertices[index], attr_name_hash)]
-            )
-
-    def get_vertex_position(self, vertex: Vertex) -> Vector:
-        attr = vertex.attributes[Hashes.position]
-        return Vector((attr[0], attr[1], attr[2])) * self.scale_factor
-
-    def get_vertex_normal(self, vertex: Vertex) -> Vector:
-        attr: tuple[float, ...] = vertex.attributes[Hashes.normal]
-        x, y, z = attr[0]*2 - 1, attr[1]*2 - 1, attr[2]*2 - 1
-        normal = Vector((x, y, z))
-        normal.normalize()
-        return normal
-
-    def get_vertex_uv(self, vertex: Vertex, attr_name_hash: int) -> tuple[float, float]:
-        uv: tuple[float, ...] = vertex.attributes[attr_name_hash]
-        return (16 * uv[0], 1 - 16 * uv[1])
-
-    def apply_materials(self, bl_mesh: bpy.types.Mesh, tr_collection: Collection, tr_model: IModel, tr_mesh: IMesh) -> None:
-        polygon_idx_base: int = 0
+            uv_layer.data.foreach_set("uv", (uvs * (16, -16) + (0, 1)).astype(numpy.float32).reshape(-1))
+
+    def apply_materials(self, bl_mesh: bpy.types.Mesh, tr_collection: Collection, tr_model: IModel, tr_mesh: IMesh, weld: MeshWelder.Result) -> None:
         material_slot_by_name: dict[str, int] = {}
+        part_material_slots = numpy.zeros(len(tr_mesh.parts), numpy.int32)
 
-        for tr_mesh_part in tr_mesh.parts:
+        for part_idx, tr_mesh_part in enumerate(tr_mesh.parts):
             material_resource = tr_mesh_part.material_idx >= 0 and tr_model.refs.material_resources[tr_mesh_part.material_idx] or None
             if material_resource is None:
                 continue
@@ -224,13 +234,15 @@ class ModelImporter(SlotsBase):
                 bl_mesh.materials.append(bl_material)
                 material_slot_by_name[bl_material.name] = material_slot
 
-            num_polygons = len(tr_mesh_part.indices) // 3
-            for i in range(polygon_idx_base, polygon_idx_base + num_polygons):
-                bl_mesh.polygons[i].material_index = material_slot
+            part_material_slots[part_idx] = material_slot
 
-            polygon_idx_base += num_polygons
+        bl_mesh.polygons.foreach_set("material_index", numpy.repeat(part_material_slots, weld.part_num_faces))
 
-    def create_vertex_groups(self, bl_obj: bpy.types.Object, tr_mesh: IMesh, tr_skeleton: ISkeleton | None) -> None:
+    def create_vertex_groups(self, bl_obj: bpy.types.Object, tr_mesh: IMesh, weld: MeshWelder.Result, tr_skeleton: ISkeleton | None) -> None:
+        # Hashed from the arrays so the exporter can detect edited weights without this costing a per-vertex loop at import
+        no_values = numpy.zeros(0, numpy.int64)
+        props = ObjectProperties.get_instance(bl_obj).mesh
+        props.source_weights_hash = BlenderHelper.get_vertex_weights_hash(no_values, no_values, no_values)
         if tr_skeleton is None or not tr_mesh.vertex_format.has_attribute(Hashes.skin_indices):
             return
 
@@ -251,32 +263,83 @@ class ModelImporter(SlotsBase):
             vertex_group_name = BlenderNaming.make_bone_name(None, tr_skeleton.bones[model_bone_index].global_id, model_bone_index)
             bl_vertex_groups.append(bl_obj.vertex_groups.new(name = vertex_group_name))
 
-        for vertex_idx, vertex in enumerate(tr_mesh.vertices):
-            bone_indices = vertex.attributes[Hashes.skin_indices]
-            weights      = vertex.attributes.get(Hashes.skin_weights)
-            for i in range(4):
-                for j in range(has_8_weights_per_vertex and 2 or 1):
-                    mesh_bone_index = (int(bone_indices[i]) >> (j * bone_index_shift)) & bone_index_mask
-                    weight = ((int(weights[i]) >> (j * 8)) & 0xFF) / 255.0 if weights is not None else 1.0
-                    if weight > 0:
-                        bl_vertex_groups[mesh_bone_index].add([vertex_idx], weight, "ADD")
-
-    def create_shape_keys(self, bl_obj: bpy.types.Object, tr_mesh: IMesh, tr_skeleton: ISkeleton | None) -> None:
+        num_vertices = len(weld.vertex_idxs)
+        bone_indices = cast(numpy.ndarray[Any, Any], tr_mesh.vertices.get_column(Hashes.skin_indices))[weld.vertex_idxs].astype(numpy.int64)
+        weights = tr_mesh.vertices.get_column(Hashes.skin_weights)
+        if weights is not None:
+            weights = weights[weld.vertex_idxs].astype(numpy.int64)
+
+        slot_bone_indices: list[numpy.ndarray[Any, Any]] = []
+        slot_weights: list[numpy.ndarray[Any, Any]] = []
+        for i in range(4):
+            for j in range(has_8_weights_per_vertex and 2 or 1):
+                slot_bone_indices.append((bone_indices[:, i] >> (j * bone_index_shift)) & bone_index_mask)
+                slot_weights.append((weights[:, i] >> (j * 8)) & 0xFF if weights is not None else numpy.full(num_vertices, 0xFF, numpy.int64))
+
+        # Weights are bytes, so grouping the (bone, weight) pairs leaves few enough buckets to add each one with a single call
+        vertex_idxs = numpy.tile(numpy.arange(num_vertices), len(slot_bone_indices))
+        bucket_keys = (numpy.concatenate(slot_bone_indices) << 8) | numpy.concatenate(slot_weights)
+        used = (bucket_keys & 0xFF) != 0
+        vertex_idxs = vertex_idxs[used]
+        bucket_keys = bucket_keys[used]
+
+        order = numpy.argsort(bucket_keys, kind = "stable")
+        vertex_idxs = vertex_idxs[order]
+        bucket_keys = bucket_keys[order]
+        bucket_starts = numpy.flatnonzero(numpy.diff(bucket_keys, prepend = -1))
+        bucket_ends = numpy.append(bucket_starts[1:], len(bucket_keys))
+        for bucket_key, start, end in zip(bucket_keys[bucket_starts].tolist(), bucket_starts.tolist(), bucket_ends.tolist()):
+            bl_vertex_groups[bucket_key >> 8].add(vertex_idxs[start:end].tolist(), (bucket_key & 0xFF) / 255.0, "ADD")
+
+        props.source_weights_hash = BlenderHelper.get_vertex_weights_hash(vertex_idxs, bucket_keys >> 8, bucket_keys & 0xFF)
+
+    def get_blend_shape_offsets(self, tr_mesh: IMesh) -> dict[int, tuple[numpy.ndarray[Any, Any], numpy.ndarray[Any, Any]]]:
         if not Enumerable(tr_mesh.blend_shapes).any(lambda b: b is not None):
-            return
-
-        bl_obj.shape_key_add(name = "Basis")
+            return {}
 
+        # Blend shapes that only move vertices of other parts would end up empty once the unused vertices are removed
+        used_vertex_mask = tr_mesh.get_used_vertex_mask()
+        offsets_by_blend_shape_id: dict[int, tuple[numpy.ndarray[Any, Any], numpy.ndarray[Any, Any]]] = {}
         for local_blend_shape_id, tr_blendshape in enumerate(tr_mesh.blend_shapes):
             if tr_blendshape is None:
                 continue
 
+            vertex_idxs, position_offsets = tr_blendshape.get_position_offsets(used_vertex_mask)
+            if len(vertex_idxs) > 0:
+                offsets_by_blend_shape_id[local_blend_shape_id] = (vertex_idxs, position_offsets)
+
+        return offsets_by_blend_shape_id
+
+    def create_shape_keys(
+        self,
+        bl_obj: bpy.types.Object,
+        tr_mesh: IMesh,
+        weld: MeshWelder.Result,
+        tr_blend_shape_offsets: dict[int, tuple[numpy.ndarray[Any, Any], numpy.ndarray[Any, Any]]],
+        tr_skeleton: ISkeleton | None
+    ) -> bool:
+        base_positions = cast(numpy.ndarray[Any, Any], tr_mesh.vertices.get_column(Hashes.position))[weld.vertex_idxs, :3].astype(numpy.float64)
+        bl_basis_shape_key: bpy.types.ShapeKey | None = None
+
+        for local_blend_shape_id, (vertex_idxs, position_offsets) in tr_blend_shape_offsets.items():
+            welded_vertex_idxs = weld.vertex_map[vertex_idxs]
+            kept = welded_vertex_idxs >= 0
+            if not kept.any():
+                continue
+
+            tr_blendshape = cast(BlendShape, tr_mesh.blend_shapes[local_blend_shape_id])
+
+            if bl_basis_shape_key is None:
+                bl_basis_shape_key = bl_obj.shape_key_add(name = "Basis")
+
             global_blend_shape_id = tr_skeleton.global_blend_shape_ids.get(local_blend_shape_id) if tr_skeleton is not None else None
             bl_shape_key = bl_obj.shape_key_add(name = BlenderNaming.make_shape_key_name(tr_blendshape.name, global_blend_shape_id, local_blend_shape_id), from_mix = False)
-            for vertex_idx, offsets in tr_blendshape.vertices.items():
-                shape_key_point = cast(bpy.types.ShapeKeyPoint, bl_shape_key.data[vertex_idx])
-                base_pos = Vector(tr_mesh.vertices[vertex_idx].attributes[Hashes.position])
-                shape_key_point.co = (base_pos + offsets.position_offset) * self.scale_factor
+
+            shape_positions = base_positions.copy()
+            shape_positions[welded_vertex_idxs[kept]] += position_offsets[kept]
+            bl_shape_key.data.foreach_set("co", (shape_positions * self.scale_factor).astype(numpy.float32).reshape(-1))
+
+        return bl_basis_shape_key is not None
 
     def parent_objects_to_armature(self, bl_objs: Iterable[bpy.types.Object], bl_armature_obj: bpy.types.Object) -> None:
         used_bone_names: set[str] = set()
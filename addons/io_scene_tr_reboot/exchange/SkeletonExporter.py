@@ -45,8 +45,7 @@ class SkeletonExporter(SlotsBase):
         tr_skeleton.write(writer)
 
         file_path = os.path.join(folder_path, Collection.make_resource_file_name(writer.resource, self.game))
-        with open(file_path, "wb") as file:
-            file.write(writer.build())
+        writer.write_to_path(file_path)
 
     def add_blend_shape_id_mappings(self, tr_skeleton: ISkeleton, bl_armature_obj: bpy.types.Object) -> None:
         tr_skeleton.global_blend_shape_ids = ObjectSkeletonProperties.get_global_blend_shape_ids(bl_armature_obj)
@@ -1,8 +1,8 @@
 from typing import NamedTuple, Sequence, cast
 import bpy
 import math
+import numpy
 import re
-from mathutils import Matrix, Quaternion
 from io_scene_tr_reboot.BlenderHelper import BlenderHelper
 from io_scene_tr_reboot.BlenderNaming import BlenderNaming
 from io_scene_tr_reboot.operator.OperatorContext import OperatorContext
@@ -10,7 +10,7 @@ from io_scene_tr_reboot.tr.Collection import Collection
 from io_scene_tr_reboot.tr.Enumerations import CdcGame, ResourceType
 from io_scene_tr_reboot.tr.ResourceBuilder import ResourceBuilder
 from io_scene_tr_reboot.tr.ResourceKey import ResourceKey
-from io_scene_tr_reboot.tr.shadow.ShadowAnimation import BlendShapeAnimationFrame, BoneAnimationFrame, ShadowAnimation
+from io_scene_tr_reboot.tr.shadow.ShadowAnimation import ShadowAnimation, ShadowAnimationTolerances
 from io_scene_tr_reboot.util.DictionaryExtensions import DictionaryExtensions
 from io_scene_tr_reboot.util.Enumerable import Enumerable
 from io_scene_tr_reboot.util.SlotsBase import SlotsBase
@@ -23,11 +23,13 @@ class _BoneConstraintParams(NamedTuple):
 class ShadowAnimationExporter(SlotsBase):
     scale_factor: float
     apply_lara_bone_fix_constraints: bool
+    tolerances: ShadowAnimationTolerances
     bl_context: bpy.types.Context
 
-    def __init__(self, scale_factor: float, apply_lara_bone_fix_constraints: bool) -> None:
+    def __init__(self, scale_factor: float, apply_lara_bone_fix_constraints: bool, tolerances: ShadowAnimationTolerances = ShadowAnimationTolerances()) -> None:
         self.scale_factor = scale_factor
         self.apply_lara_bone_fix_constraints = apply_lara_bone_fix_constraints
+        self.tolerances = tolerances
         self.bl_context = bpy.context
 
     def export_animation(self, file_path: str, bl_armature_obj: bpy.types.Object) -> None:
@@ -41,15 +43,14 @@ class ShadowAnimationExporter(SlotsBase):
         animation = ShadowAnimation(resource_key.id)
         animation.num_frames = self.bl_context.scene.frame_end
         animation.ms_per_frame = int(self.bl_context.scene.render.fps_base)
+        animation.tolerances = self.tolerances._replace(translation = self.tolerances.translation / self.scale_factor)
 
         self.export_armature_animation(animation, bl_armature_obj)
-        for bl_mesh_obj in Enumerable(bl_armature_obj.children).where(lambda o: isinstance(o.data, bpy.types.Mesh)):
-            self.export_mesh_animation(animation, bl_mesh_obj)
+        self.export_mesh_animation(animation, Enumerable(bl_armature_obj.children).where(lambda o: isinstance(o.data, bpy.types.Mesh)).to_list())
 
         resource_builder = ResourceBuilder(ResourceKey(ResourceType.ANIMATION, 0), CdcGame.SOTTR)
         animation.write(resource_builder)
-        with open(file_path, "wb") as file:
-            file.write(resource_builder.build())
+        resource_builder.write_to_path(file_path)
 
     def export_armature_animation(self, animation: ShadowAnimation, bl_armature_obj: bpy.types.Object) -> None:
         if self.apply_lara_bone_fix_constraints:
@@ -74,6 +75,7 @@ class ShadowAnimationExporter(SlotsBase):
         bone_distances_from_parent: dict[int, float] = {}
 
         with BlenderHelper.enter_edit_mode(bl_armature_obj):
+            animated_bl_bones: dict[int, bpy.types.EditBone] = {}
             for bl_bone in cast(bpy.types.Armature, bl_armature_obj.data).edit_bones:
                 global_bone_id = BlenderNaming.parse_bone_name(bl_bone.name).global_id
                 if global_bone_id is None:
@@ -84,40 +86,39 @@ class ShadowAnimationExporter(SlotsBase):
                 else:
                     bone_distances_from_parent[global_bone_id] = 1.0
 
-                bl_attr_fcurves = bl_bone_fcurves.get(global_bone_id)
-                if bl_attr_fcurves is not None:
-                    self.export_bone_animation(animation, bl_bone, global_bone_id, bl_attr_fcurves)
+                if global_bone_id in bl_bone_fcurves:
+                    animated_bl_bones[global_bone_id] = bl_bone
 
-        animation.bone_distances_from_parent = Enumerable(animation.bone_frames.keys()).select(lambda id: bone_distances_from_parent[id]).to_list()
+            animation.create_bone_tracks(list(animated_bl_bones.keys()))
+            for bone_idx, (global_bone_id, bl_bone) in enumerate(animated_bl_bones.items()):
+                self.export_bone_animation(animation, bone_idx, bl_bone, bl_bone_fcurves[global_bone_id])
 
-    def export_bone_animation(self, animation: ShadowAnimation, bl_bone: bpy.types.EditBone, global_bone_id: int, bl_attr_fcurves: dict[int, list[bpy.types.FCurve | None]]) -> None:
-        bone_frames: list[BoneAnimationFrame] = []
-        rest_matrix = bl_bone.matrix
-        rest_rotation = rest_matrix.to_quaternion()
+        animation.bone_distances_from_parent = Enumerable(animation.bone_ids).select(lambda id: bone_distances_from_parent[id]).to_list()
 
-        for frame_idx in range(animation.num_frames):
-            bone_frame = BoneAnimationFrame()
-            for attr_idx, bl_elem_fcurves in bl_attr_fcurves.items():
-                attr_value = attr_idx == 0 and [1.0, 0.0, 0.0, 0.0] or [0.0, 0.0, 0.0]
-                for elem_idx, bl_elem_fcurve in enumerate(bl_elem_fcurves):
-                    if bl_elem_fcurve is not None:
-                        attr_value[elem_idx] = bl_elem_fcurve.evaluate(frame_idx)
+    def export_bone_animation(self, animation: ShadowAnimation, bone_idx: int, bl_bone: bpy.types.EditBone, bl_attr_fcurves: dict[int, list[bpy.types.FCurve | None]]) -> None:
+        frames = numpy.arange(animation.num_frames, dtype = numpy.float64)
+        rest_rotation_matrix = numpy.array(bl_bone.matrix.to_3x3())
+        rest_rotation = numpy.array(bl_bone.matrix.to_quaternion())
+        inverted_rest_rotation = rest_rotation * [1, -1, -1, -1] / numpy.dot(rest_rotation, rest_rotation)
 
-                match attr_idx:
-                    case 0:
-                        attr_value = rest_rotation @ Quaternion(attr_value) @ rest_rotation.inverted()
-                    case 1:
-                        attr_value = (rest_matrix @ Matrix.Translation(attr_value) @ rest_matrix.inverted()).translation / self.scale_factor
-                    case 2:
-                        attr_value = [attr_value[1], attr_value[2], attr_value[0]]
-                    case _:
-                        pass
+        for attr_idx, bl_elem_fcurves in bl_attr_fcurves.items():
+            attr_values = numpy.tile(attr_idx == 0 and [1.0, 0.0, 0.0, 0.0] or [0.0, 0.0, 0.0], (animation.num_frames, 1))
+            for elem_idx, bl_elem_fcurve in enumerate(bl_elem_fcurves):
+                if bl_elem_fcurve is not None:
+                    attr_values[:, elem_idx] = BlenderHelper.sample_fcurve(bl_elem_fcurve, frames)
 
-                bone_frame.set_attr_value(attr_idx, cast(Sequence[float], attr_value))
+            match attr_idx:
+                case 0:
+                    attr_values = ShadowAnimation.multiply_quats(ShadowAnimation.multiply_quats(rest_rotation, attr_values), inverted_rest_rotation)
+                case 1:
+                    attr_values = attr_values @ rest_rotation_matrix.T / self.scale_factor
+                case 2:
+                    attr_values = attr_values[:, [1, 2, 0]]
+                case _:
+                    pass
 
-            bone_frames.append(bone_frame)
-
-        animation.bone_frames[global_bone_id] = bone_frames
+            animation.bone_tracks[:, bone_idx, ShadowAnimation.bone_attr_slices[attr_idx]] = attr_values
+            animation.bone_absence_mask[bone_idx, attr_idx] = False
 
     def collect_bone_fcurves(self, bl_armature_obj: bpy.types.Object) -> dict[int, dict[int, list[bpy.types.FCurve | None]]]:
         bl_bone_fcurves: dict[int, dict[int, list[bpy.types.FCurve | None]]] = {}
@@ -141,20 +142,18 @@ class ShadowAnimationExporter(SlotsBase):
 
         return bl_bone_fcurves
 
-    def export_mesh_animation(self, animation: ShadowAnimation, bl_mesh_obj: bpy.types.Object) -> None:
-        bl_mesh_fcurves = self.collect_mesh_fcurves(bl_mesh_obj)
-
-        for global_blend_shape_id, bl_fcurve in bl_mesh_fcurves.items():
-            if global_blend_shape_id in animation.blend_shape_frames:
-                continue
-
-            blend_shape_frames: list[BlendShapeAnimationFrame] = []
-            for frame_idx in range(animation.num_frames):
-                blend_shape_frame = BlendShapeAnimationFrame()
-                blend_shape_frame.value = bl_fcurve.evaluate(frame_idx)
-                blend_shape_frames.append(blend_shape_frame)
+    def export_mesh_animation(self, animation: ShadowAnimation, bl_mesh_objs: list[bpy.types.Object]) -> None:
+        bl_blend_shape_fcurves: dict[int, bpy.types.FCurve] = {}
+        for bl_mesh_obj in bl_mesh_objs:
+            for global_blend_shape_id, bl_fcurve in self.collect_mesh_fcurves(bl_mesh_obj).items():
+                if global_blend_shape_id not in bl_blend_shape_fcurves:
+                    bl_blend_shape_fcurves[global_blend_shape_id] = bl_fcurve
 
-            animation.blend_shape_frames[global_blend_shape_id] = blend_shape_frames
+        animation.create_blend_shape_tracks(list(bl_blend_shape_fcurves.keys()))
+        frames = numpy.arange(animation.num_frames, dtype = numpy.float64)
+        for blend_shape_idx, bl_fcurve in enumerate(bl_blend_shape_fcurves.values()):
+            animation.blend_shape_tracks[:, blend_shape_idx] = BlenderHelper.sample_fcurve(bl_fcurve, frames)
+            animation.blend_shape_absence_mask[blend_shape_idx] = False
 
     def collect_mesh_fcurves(self, bl_mesh_obj: bpy.types.Object) -> dict[int, bpy.types.FCurve]:
         bl_mesh_fcurves: dict[int, bpy.types.FCurve] = {}
@@ -234,6 +233,9 @@ class ShadowAnimationExporter(SlotsBase):
                 bl_transforms_constraint.owner_space = "POSE"
 
     def bake_bone_constraints(self, bl_armature_obj: bpy.types.Object) -> None:
+        if not Enumerable(bl_armature_obj.pose.bones).any(lambda b: len(b.constraints) > 0):
+            return
+
         BlenderHelper.select_object(bl_armature_obj)
         bpy.ops.object.mode_set(mode = "POSE")
 
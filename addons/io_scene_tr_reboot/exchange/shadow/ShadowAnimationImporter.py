@@ -1,5 +1,6 @@
-from typing import NamedTuple, cast
+from typing import Any, NamedTuple, cast
 import bpy
+import numpy
 from mathutils import Matrix, Quaternion
 from io_scene_tr_reboot.BlenderHelper import BlenderHelper
 from io_scene_tr_reboot.BlenderNaming import BlenderNaming
@@ -14,6 +15,9 @@ class _ItemAttrKey(NamedTuple):
     global_item_id: int
     attr_idx: int
 
+# Enum value of "LINEAR" in Keyframe.interpolation, as expected by foreach_set()
+_linear_interpolation_value = 1
+
 class ShadowAnimationImporter(SlotsBase):
     scale_factor: float
     bl_context: bpy.types.Context
@@ -53,30 +57,28 @@ class ShadowAnimationImporter(SlotsBase):
         rest_matrices: dict[int, Matrix] = self.get_armature_space_rest_matrices(bl_armature_obj)
         rest_rotations: dict[int, Quaternion] = Enumerable(rest_matrices.items()).to_dict(lambda p: p[0], lambda p: p[1].to_quaternion())
 
-        for global_bone_id, bone_frames in animation.bone_frames.items():
+        for bone_idx, global_bone_id in enumerate(animation.bone_ids):
             for attr_idx in range(3):
                 bl_attr_fcurves = bl_fcurves.get(_ItemAttrKey(global_bone_id, attr_idx))
-                if bl_attr_fcurves is None:
+                if bl_attr_fcurves is None or animation.bone_absence_mask[bone_idx, attr_idx]:
                     continue
 
-                for frame_idx, bone_frame in enumerate(bone_frames):
-                    attr_value = bone_frame.get_attr_value(attr_idx)
-                    if attr_value is None:
-                        continue
-
-                    match attr_idx:
-                        case 0:
-                            attr_value = rest_rotations[global_bone_id].inverted() @ cast(Quaternion, attr_value) @ rest_rotations[global_bone_id]
-                        case 1:
-                            attr_value = (rest_matrices[global_bone_id].inverted() @ Matrix.Translation(attr_value) @ rest_matrices[global_bone_id]).translation * self.scale_factor
-                        case 2:
-                            attr_value = [attr_value[2], attr_value[0], attr_value[1]]
-                        case _:
-                            pass
-
-                    for element_idx in range(len(attr_value)):
-                        bl_keyframe = bl_attr_fcurves[element_idx].keyframe_points.insert(frame_idx, attr_value[element_idx])
-                        bl_keyframe.interpolation = "LINEAR"
+                attr_values = animation.bone_tracks[:, bone_idx, ShadowAnimation.bone_attr_slices[attr_idx]].astype(numpy.float64)
+                match attr_idx:
+                    case 0:
+                        rest_rotation = numpy.array(rest_rotations[global_bone_id])
+                        inverted_rest_rotation = rest_rotation * [1, -1, -1, -1] / numpy.dot(rest_rotation, rest_rotation)
+                        attr_values = ShadowAnimation.multiply_quats(ShadowAnimation.multiply_quats(inverted_rest_rotation, attr_values), rest_rotation)
+                    case 1:
+                        inverted_rest_rotation_matrix = numpy.linalg.inv(numpy.array(rest_matrices[global_bone_id])[:3, :3])
+                        attr_values = attr_values @ inverted_rest_rotation_matrix.T * self.scale_factor
+                    case 2:
+                        attr_values = attr_values[:, [2, 0, 1]]
+                    case _:
+                        pass
+
+                for element_idx, bl_fcurve in enumerate(bl_attr_fcurves):
+                    self.insert_linear_keyframes(bl_fcurve, attr_values[:, element_idx])
 
     def create_bone_fcurves(self, bl_armature_obj: bpy.types.Object, animation: ShadowAnimation) -> dict[_ItemAttrKey, list[bpy.types.FCurve]]:
         if not bl_armature_obj.animation_data:
@@ -124,14 +126,12 @@ class ShadowAnimationImporter(SlotsBase):
 
         bl_fcurves: dict[int, bpy.types.FCurve] = self.create_blend_shape_fcurves(bl_mesh_obj, animation)
 
-        for blend_shape_id, blend_shape_frames in animation.blend_shape_frames.items():
+        for blend_shape_idx, blend_shape_id in enumerate(animation.blend_shape_ids):
             bl_fcurve = bl_fcurves.get(blend_shape_id)
-            if bl_fcurve is None:
+            if bl_fcurve is None or animation.blend_shape_absence_mask[blend_shape_idx]:
                 continue
 
-            for frame_idx, blend_shape_frame in enumerate(blend_shape_frames):
-                bl_keyframe = bl_fcurve.keyframe_points.insert(frame_idx, blend_shape_frame.value)
-                bl_keyframe.interpolation = "LINEAR"
+            self.insert_linear_keyframes(bl_fcurve, animation.blend_shape_tracks[:, blend_shape_idx])
 
     def create_blend_shape_fcurves(self, bl_mesh_obj: bpy.types.Object, animation: ShadowAnimation) -> dict[int, bpy.types.FCurve]:
         bl_mesh = cast(bpy.types.Mesh, bl_mesh_obj.data)
@@ -151,7 +151,13 @@ class ShadowAnimationImporter(SlotsBase):
 
         for bl_shape_key in Enumerable(bl_mesh.shape_keys.key_blocks).skip(1):
             global_shape_key_id = BlenderNaming.parse_shape_key_name(bl_shape_key.name).global_id
-            if global_shape_key_id is not None and global_shape_key_id in animation.blend_shape_frames:
+            if global_shape_key_id is not None and global_shape_key_id in animation.blend_shape_ids:
                 bl_fcurves[global_shape_key_id] = bl_action.fcurves.new(f'key_blocks["{bl_shape_key.name}"].value')
 
         return bl_fcurves
+
+    def insert_linear_keyframes(self, bl_fcurve: bpy.types.FCurve, values: numpy.ndarray[Any, Any]) -> None:
+        bl_fcurve.keyframe_points.add(len(values))
+        bl_fcurve.keyframe_points.foreach_set("co", numpy.stack([numpy.arange(len(values)), values], axis = 1).astype(numpy.float32).reshape(-1))
+        bl_fcurve.keyframe_points.foreach_set("interpolation", numpy.full(len(values), _linear_interpolation_value, numpy.int32))
+        bl_fcurve.update()
@@ -11,7 +11,6 @@ class ShadowModelExporter(ModelExporter):
 
     def export_extra_files(self, folder_path: str, object_id: int, tr_model: IModel) -> None:
         model_file_path = os.path.join(folder_path, f"{tr_model.id}.tr11model")
-        with open(model_file_path, "wb") as model_file:
-            resource_builder = ResourceBuilder(ResourceKey(ResourceType.MODEL, tr_model.id), self.game)
-            tr_model.refs.write(resource_builder)
-            model_file.write(resource_builder.build())
+        resource_builder = ResourceBuilder(ResourceKey(ResourceType.MODEL, tr_model.id), self.game)
+        tr_model.refs.write(resource_builder)
+        resource_builder.write_to_path(model_file_path)
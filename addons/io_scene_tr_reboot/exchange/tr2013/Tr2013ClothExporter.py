@@ -40,8 +40,7 @@ class Tr2013ClothExporter(ClothExporter):
             model_data_builder.position = 0
             model_refs.write(model_data_builder)
 
-            with open(model_data_file_path, "wb") as model_data_file:
-                model_data_file.write(model_data_builder.build())
+            model_data_builder.write_to_path(model_data_file_path)
 
             break
 
@@ -71,5 +70,4 @@ class Tr2013ClothExporter(ClothExporter):
         object_builder.write_struct(header)
 
         object_file_path = os.path.join(folder_path, Collection.make_resource_file_name(object_resource, CdcGame.TR2013))
-        with open(object_file_path, "wb") as object_file:
-            object_file.write(object_builder.build())
+        object_builder.write_to_path(object_file_path)
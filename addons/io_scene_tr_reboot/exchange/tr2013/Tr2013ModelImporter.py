@@ -11,11 +11,11 @@ class Tr2013ModelImporter(ModelImporter):
 
         object_reader = tr_collection.get_resource_reader(tr_collection.object_ref, True)
         if object_reader is not None:
-            files[tr_collection.object_ref.id] = object_reader.data
+            files[tr_collection.object_ref.id] = bytes(object_reader.data)
 
         for model in tr_collection.get_model_instances():
             model_reader = tr_collection.get_resource_reader(model.resource, True)
             if model_reader is not None:
-                files[model.resource.id] = model_reader.data
+                files[model.resource.id] = bytes(model_reader.data)
 
         return files
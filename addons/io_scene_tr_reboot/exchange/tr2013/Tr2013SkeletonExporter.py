@@ -52,7 +52,6 @@ class Tr2013SkeletonExporter(SkeletonExporter):
             with open(model_path, "wb") as model_file:
                 model_file.write(model.to_bytes())
 
-            with open(model_data_path, "wb") as model_data_file:
-                model_data_file.write(model_data_builder.build())
+            model_data_builder.write_to_path(model_data_path)
 
             break
@@ -1,3 +1,4 @@
+import math
 import os
 from typing import TYPE_CHECKING, Annotated, Protocol
 import bpy
@@ -7,6 +8,7 @@ from io_scene_tr_reboot.operator.BlenderOperatorBase import ExportOperatorBase,
 from io_scene_tr_reboot.operator.OperatorCommon import OperatorCommon
 from io_scene_tr_reboot.operator.OperatorContext import OperatorContext
 from io_scene_tr_reboot.properties.BlenderPropertyGroup import Prop
+from io_scene_tr_reboot.tr.shadow.ShadowAnimation import ShadowAnimationTolerances
 from io_scene_tr_reboot.util.Enumerable import Enumerable
 
 if TYPE_CHECKING:
@@ -16,6 +18,10 @@ else:
 
 class _Properties(ExportOperatorProperties, Protocol):
     apply_lara_bone_fix_constraints: Annotated[bool, Prop("Apply Lara bone fix constraints", default = True)]
+    rotation_tolerance:              Annotated[float, Prop("Rotation tolerance (degrees)", default = math.degrees(ShadowAnimationTolerances().rotation), min = 0, precision = 4)]
+    translation_tolerance:           Annotated[float, Prop("Translation tolerance", default = ShadowAnimationTolerances().translation, min = 0, precision = 5)]
+    scale_tolerance:                 Annotated[float, Prop("Scale tolerance", default = ShadowAnimationTolerances().scale, min = 0, precision = 5)]
+    blend_shape_tolerance:           Annotated[float, Prop("Shape key tolerance", default = ShadowAnimationTolerances().blend_shape, min = 0, precision = 5)]
 
 class ExportShadowAnimationOperator(ExportOperatorBase[_Properties]):
     bl_idname = "export_scene.tr11anim"
@@ -55,7 +61,13 @@ class ExportShadowAnimationOperator(ExportOperatorBase[_Properties]):
             if bl_armature_obj is None:
                 return { "CANCELLED" }
 
-            exporter = ShadowAnimationExporter(OperatorCommon.scale_factor, self.properties.apply_lara_bone_fix_constraints)
+            tolerances = ShadowAnimationTolerances(
+                math.radians(self.properties.rotation_tolerance),
+                self.properties.translation_tolerance,
+                self.properties.scale_tolerance,
+                self.properties.blend_shape_tolerance
+            )
+            exporter = ShadowAnimationExporter(OperatorCommon.scale_factor, self.properties.apply_lara_bone_fix_constraints, tolerances)
             exporter.export_animation(self.properties.filepath, bl_armature_obj)
 
             if not OperatorContext.warnings_logged and not OperatorContext.errors_logged:
@@ -55,9 +55,7 @@ class ImportObjectOperator(ImportOperatorBase[_Properties]):
 
         SceneProperties.set_game(game)
 
-        with OperatorContext.begin(self):
-            tr_collection = Factories.get(game).open_collection(self.properties.filepath)
-
+        with OperatorContext.begin(self), Factories.get(game).open_collection(self.properties.filepath) as tr_collection:
             skeleton_importer = self.create_skeleton_importer(OperatorCommon.scale_factor, game)
             bl_armature_obj = skeleton_importer.import_from_collection(tr_collection)
 
@@ -14,6 +14,7 @@ class Prop(NamedTuple):
     default: Any = None
     min: float | None = None
     max: float | None = None
+    precision: int | None = None
     search: Callable[["BlenderPropertyGroup", bpy.types.Context, str], list[str]] | None = None
     options: set[PropertyFlagItems] | None = None
     subtype: PropertySubtypeNumberItems | None = None
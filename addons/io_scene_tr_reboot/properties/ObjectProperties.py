@@ -35,6 +35,12 @@ class ObjectCollisionProperties(BlenderPropertyGroup):
 class ObjectMeshProperties(BlenderPropertyGroup):
     draw_group_id: Annotated[int, Prop("Draw Group ID")]
     flags: Annotated[int, Prop("Flags")]
+    source_file_path: Annotated[str, Prop("Source file")]
+    source_mesh_idx: Annotated[int, Prop("Source mesh index")]
+    source_part_idxs: Annotated[str, Prop("Source mesh part indices")]
+    source_data_hash: Annotated[str, Prop("Source mesh data hash")]
+    source_content_hash: Annotated[str, Prop("Blender mesh content hash at import")]
+    source_weights_hash: Annotated[str, Prop("Blender vertex weights hash at import")]
 
 class ObjectSkeletonProperties(BlenderPropertyGroup):
     global_blend_shape_ids: Annotated[str, Prop("Local -> global blend shape ID mappings")]
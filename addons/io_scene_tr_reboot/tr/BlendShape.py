@@ -1,6 +1,7 @@
 from array import array
-from typing import Optional, Sequence, cast
+from typing import Any, Optional, Sequence, cast
 from mathutils import Vector
+import numpy
 from io_scene_tr_reboot.tr.VertexOffsets import VertexOffsets
 from io_scene_tr_reboot.util.BinaryReader import BinaryReader
 from io_scene_tr_reboot.util.BinaryWriter import BinaryWriter
@@ -32,6 +33,22 @@ class BlendShape(SlotsBase):
         self.name = None
         self.vertices = {}
 
+    def clone(self) -> "BlendShape":
+        # The offsets themselves are only ever replaced, not modified
+        new_blend_shape = BlendShape()
+        new_blend_shape.name = self.name
+        new_blend_shape.vertices = dict(self.vertices)
+        return new_blend_shape
+
+    def get_position_offsets(self, used_vertex_mask: numpy.ndarray[Any, Any] | None = None) -> tuple[numpy.ndarray[Any, Any], numpy.ndarray[Any, Any]]:
+        vertex_idxs = numpy.fromiter(self.vertices.keys(), numpy.int64, len(self.vertices))
+        position_offsets = numpy.array([tuple(offsets.position_offset) for offsets in self.vertices.values()], numpy.float64).reshape(-1, 3)
+        affected = position_offsets.any(axis = 1)
+        if used_vertex_mask is not None:
+            affected &= used_vertex_mask[vertex_idxs]
+
+        return (vertex_idxs[affected], position_offsets[affected])
+
     @staticmethod
     def read(reader: BinaryReader, model_data_header_pos: int, num_blend_shapes: int, blend_shape_names: list[str] | None, num_vertices: int) -> list[Optional["BlendShape"]]:
         header = reader.read_struct(_BlendShapesHeader)
@@ -93,11 +110,10 @@ class BlendShape(SlotsBase):
 
     @staticmethod
     def write(writer: BinaryWriter, model_data_header_pos: int, blend_shapes: list[Optional["BlendShape"]], num_vertices: int) -> None:
-        header_pos = writer.position
         header = _BlendShapesHeader()
         header.num_blend_shapes = Enumerable(blend_shapes).count(lambda b: b is not None)
         header.num_vertex_offsets = Enumerable(blend_shapes).sum(lambda b: b is not None and len(b.vertices) or 0)
-        writer.write_struct(header)
+        header_pos = writer.reserve(sizeof(header))
         writer.align(0x20)
 
         supported_blendshape_bitmasks: list[int] = [0] * ((len(blend_shapes) + 0x1F) >> 5)
@@ -161,10 +177,7 @@ class BlendShape(SlotsBase):
         writer.write_bytes(memoryview(vertex_indices))
         writer.align(0x20)
 
-        end_pos = writer.position
-        writer.position = header_pos
-        writer.write_struct(header)
-        writer.position = end_pos
+        writer.write_struct_at(header_pos, header)
 
     @staticmethod
     def unpack_vertex_offset(value: int, scale: float) -> Vector:
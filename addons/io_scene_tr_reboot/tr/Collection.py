@@ -1,20 +1,30 @@
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+from mmap import ACCESS_READ, mmap
 import os
 import re
-from typing import ClassVar, Iterable, NamedTuple
+import tempfile
+import threading
+import time
+from types import TracebackType
+from typing import Callable, ClassVar, Iterable, NamedTuple, Sequence, TypeVar
 from mathutils import Matrix
 from io_scene_tr_reboot.tr.Collision import Collision
 from io_scene_tr_reboot.tr.Material import Material
-from io_scene_tr_reboot.tr.Model import IModel
+from io_scene_tr_reboot.tr.Model import IModel, ModelSummary
 from io_scene_tr_reboot.tr.ResourceReference import ResourceReference
 from io_scene_tr_reboot.tr.Skeleton import ISkeleton
 from io_scene_tr_reboot.tr.Cloth import Cloth
 from io_scene_tr_reboot.tr.Enumerations import CdcGame, ResourceType
+from io_scene_tr_reboot.tr.ResourceCache import ResourceCache
 from io_scene_tr_reboot.tr.ResourceReader import ResourceReader
 from io_scene_tr_reboot.tr.ResourceKey import ResourceKey
-from io_scene_tr_reboot.util.Enumerable import Enumerable
 from io_scene_tr_reboot.util.SlotsBase import SlotsBase
 
+T = TypeVar("T")
+
 class Collection(SlotsBase):
     class ResourceTypeInfo(NamedTuple):
         folder_name: str
@@ -24,6 +34,11 @@ class Collection(SlotsBase):
         resource: ResourceKey
         transform: Matrix
 
+    class IndexedFolder(NamedTuple):
+        mtime: int
+        sub_folder_names: list[str]
+        resources: list[tuple[int, int, str]]
+
     __resource_type_infos: ClassVar[dict[ResourceType, ResourceTypeInfo]] = {
         ResourceType.ANIMATION:     ResourceTypeInfo("Animation",   [".trXanim"]),
         ResourceType.DTP:           ResourceTypeInfo("Dtp",         [".trXdtp"]),
@@ -38,12 +53,23 @@ class Collection(SlotsBase):
 
     game: ClassVar[CdcGame]
 
+    memory_map_resources: ClassVar[bool] = True
+    memory_map_min_file_size: ClassVar[int] = 0x10000
+    max_model_decoding_threads: ClassVar[int] = min(8, (os.cpu_count() or 1) + 4)
+
+    resource_index_folder_path: ClassVar[str] = os.path.join(tempfile.gettempdir(), "io_scene_tr_reboot")
+    __resource_index_version: ClassVar[int] = 1
+
     folder_path: str
     name: str
     object_ref: ResourceReference
+    bytes_mapped: int
+    bytes_copied: int
 
-    __resource_paths: dict[ResourceKey, str]
+    __resource_paths: dict[ResourceType, dict[ResourceKey, str]]
     __resource_readers: dict[ResourceKey, ResourceReader]
+    __resource_mappings: list[mmap]
+    __lock: threading.Lock
 
     def __init__(self, object_ref_file_path: str) -> None:
         self.folder_path = os.path.split(object_ref_file_path)[0]
@@ -59,10 +85,31 @@ class Collection(SlotsBase):
             raise Exception("No reference to object .dtp file")
 
         self.object_ref = object_ref
+        self.bytes_mapped = 0
+        self.bytes_copied = 0
         self.__resource_paths = {}
         self.__resource_readers = {}
+        self.__resource_mappings = []
+        self.__lock = threading.Lock()
         self.__scan_resources()
 
+    def __enter__(self) -> "Collection":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.__resource_readers.clear()
+        for mapping in self.__resource_mappings:
+            try:
+                mapping.close()
+            except BufferError:
+                # Parsed resources still hold memoryviews into the mapping - it'll be released along with the last of them
+                pass
+
+        self.__resource_mappings.clear()
+
     @property
     def id(self):
         return self.object_ref.id
@@ -73,6 +120,30 @@ class Collection(SlotsBase):
     @abstractmethod
     def get_model(self, resource: ResourceKey) -> IModel | None: ...
 
+    def get_models(self, resources: Sequence[ResourceKey]) -> list[IModel | None]:
+        # Models don't depend on each other or on Blender, so they're decoded concurrently to overlap the file reads.
+        # Worker processes aren't an option: the addon and mathutils can only be imported inside Blender.
+        resource_idxs: dict[ResourceKey, int] = {}
+        unique_resources: list[ResourceKey] = []
+        for resource in resources:
+            resource_key = ResourceKey(resource.type, resource.id)
+            if resource_key not in resource_idxs:
+                resource_idxs[resource_key] = len(unique_resources)
+                unique_resources.append(resource)
+
+        models: list[IModel | None]
+        num_threads = min(len(unique_resources), Collection.max_model_decoding_threads)
+        if num_threads <= 1:
+            models = [self.get_model(resource) for resource in unique_resources]
+        else:
+            with ThreadPoolExecutor(num_threads) as executor:
+                models = list(executor.map(self.get_model, unique_resources))
+
+        return [models[resource_idxs[ResourceKey(resource.type, resource.id)]] for resource in resources]
+
+    @abstractmethod
+    def probe_model(self, resource: ResourceKey) -> ModelSummary | None: ...
+
     def get_material(self, resource: ResourceKey) -> Material | None:
         reader = self.get_resource_reader(resource, True)
         if reader is None:
@@ -103,13 +174,17 @@ class Collection(SlotsBase):
     def get_cloth(self) -> Cloth | None: ...
 
     def get_resources(self, resource_type: ResourceType) -> Iterable[ResourceKey]:
-        return Enumerable(self.__resource_paths.keys()).where(lambda r: r.type == resource_type)
+        return self.__resource_paths.get(resource_type, {}).keys()
 
     def get_resource_file_path(self, resource: ResourceKey) -> str | None:
         if resource.__class__ != ResourceKey:
             resource = ResourceKey(resource.type, resource.id)
 
-        return self.__resource_paths.get(resource)
+        resource_paths = self.__resource_paths.get(resource.type)
+        if resource_paths is None:
+            return None
+
+        return resource_paths.get(resource)
 
     def get_resource_name(self, resource: ResourceKey) -> str | None:
         file_path = self.get_resource_file_path(resource)
@@ -148,11 +223,7 @@ class Collection(SlotsBase):
             if file_path is None:
                 return None
 
-            file_data: bytes
-            with open(file_path, "rb") as file:
-                file_data = file.read()
-
-            reader = ResourceReader(resource_key, file_data, has_references, self.game)
+            reader = self.__open_resource_reader(resource_key, file_path, has_references)
             self.__resource_readers[resource_key] = reader
         else:
             reader = ResourceReader(reader)
@@ -162,9 +233,145 @@ class Collection(SlotsBase):
 
         return reader
 
+    def __open_resource_reader(self, resource_key: ResourceKey, file_path: str, has_references: bool) -> ResourceReader:
+        # Readers for small files are shared between collections. Memory-mapped ones are not, since they'd keep the file open
+        # after this collection is closed.
+        file_key = ResourceCache.get_file_key(file_path)
+        if file_key is None or (Collection.memory_map_resources and file_key.size >= Collection.memory_map_min_file_size):
+            return ResourceReader(resource_key, self.__read_resource_file(file_path), has_references, self.game)
+
+        reader = ResourceCache.get_or_add(
+            ("reader", self.game, file_key, has_references),
+            lambda: ResourceReader(resource_key, self.__read_resource_file(file_path), has_references, self.game),
+            lambda reader: file_key.size
+        )
+        return ResourceReader(reader)
+
+    def _get_cached_resource(self, kind: str, resources: Sequence[ResourceKey], create: Callable[[], T | None], get_size: Callable[[T], int] | None = None) -> T | None:
+        # Parsed resources are shared between collections as long as the files they were read from are unchanged.
+        # Unless the caller can measure it, the memory a resource takes up is estimated from its file sizes.
+        file_keys: list[ResourceCache.FileKey] = []
+        for resource in resources:
+            file_path = self.get_resource_file_path(resource)
+            file_key = file_path is not None and ResourceCache.get_file_key(file_path) or None
+            if file_key is None:
+                return create()
+
+            file_keys.append(file_key)
+
+        file_size = sum(file_key.size for file_key in file_keys)
+        return ResourceCache.get_or_add((kind, self.game, *file_keys), create, get_size or (lambda value: file_size))
+
+    def __read_resource_file(self, file_path: str) -> bytes | mmap:
+        with open(file_path, "rb") as file:
+            file_size = os.fstat(file.fileno()).st_size
+            if not Collection.memory_map_resources or file_size < Collection.memory_map_min_file_size:
+                data = file.read()
+                with self.__lock:
+                    self.bytes_copied += file_size
+
+                return data
+
+            mapping = mmap(file.fileno(), 0, access = ACCESS_READ)
+
+        with self.__lock:
+            self.__resource_mappings.append(mapping)
+            self.bytes_mapped += file_size
+
+        return mapping
+
     def __scan_resources(self) -> None:
-        for sub_folder_path, _, file_names in os.walk(self.folder_path):
-            for file_name in file_names:
-                resource_key = self.try_parse_resource_file_path(file_name, self.game)
-                if resource_key is not None:
-                    self.__resource_paths[resource_key] = os.path.join(sub_folder_path, file_name)
+        # The folder structure is cached on disk per folder. On later scans, only folders whose modification time
+        # changed (i.e. that had entries added, removed or renamed) get listed again.
+        index_file_path = os.path.join(
+            Collection.resource_index_folder_path,
+            hashlib.sha1(f"{os.path.abspath(self.folder_path)}|{self.game}".encode()).hexdigest() + ".json"
+        )
+        cached_folders = self.__load_resource_index(index_file_path)
+        folders: dict[str, Collection.IndexedFolder] = {}
+        if self.__scan_resource_folder("", cached_folders, folders) or len(folders) != len(cached_folders):
+            self.__save_resource_index(index_file_path, folders)
+
+    def __scan_resource_folder(self, relative_folder_path: str, cached_folders: dict[str, IndexedFolder], folders: dict[str, IndexedFolder]) -> bool:
+        folder_path = os.path.join(self.folder_path, relative_folder_path)
+        try:
+            mtime = os.stat(folder_path).st_mtime_ns
+        except OSError:
+            return True
+
+        changed = False
+        folder = cached_folders.get(relative_folder_path)
+        if folder is None or folder.mtime != mtime:
+            sub_folder_names: list[str] = []
+            resources: list[tuple[int, int, str]] = []
+            try:
+                with os.scandir(folder_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                sub_folder_names.append(entry.name)
+
+                            continue
+
+                        resource_key = self.try_parse_resource_file_path(entry.name, self.game)
+                        if resource_key is not None:
+                            resources.append((int(resource_key.type), resource_key.id, entry.name))
+            except OSError:
+                # The listing may be incomplete, so use it for now but don't keep it for next time
+                mtime = -1
+
+            # A folder that was modified just now may get modified again without its timestamp changing, so don't trust it next time
+            if time.time_ns() - mtime < 2_000_000_000:
+                mtime = -1
+
+            folder = Collection.IndexedFolder(mtime, sub_folder_names, resources)
+            changed = True
+
+        folders[relative_folder_path] = folder
+        folder_path_prefix = os.path.join(folder_path, "")
+        for resource_type, resource_id, file_name in folder.resources:
+            resource_key = ResourceKey(ResourceType(resource_type), resource_id)
+            resource_paths = self.__resource_paths.get(resource_key.type)
+            if resource_paths is None:
+                resource_paths = self.__resource_paths[resource_key.type] = {}
+
+            resource_paths[resource_key] = folder_path_prefix + file_name
+
+        for sub_folder_name in folder.sub_folder_names:
+            changed = self.__scan_resource_folder(os.path.join(relative_folder_path, sub_folder_name), cached_folders, folders) or changed
+
+        return changed
+
+    def __load_resource_index(self, index_file_path: str) -> dict[str, IndexedFolder]:
+        try:
+            with open(index_file_path, "r", encoding = "utf-8") as index_file:
+                index = json.load(index_file)
+
+            if index["version"] != Collection.__resource_index_version:
+                return {}
+
+            return {
+                relative_folder_path: Collection.IndexedFolder(mtime, sub_folder_names, [(resource_type, resource_id, file_name) for resource_type, resource_id, file_name in resources])
+                for relative_folder_path, (mtime, sub_folder_names, resources) in index["folders"].items()
+            }
+        except (OSError, ValueError, TypeError, KeyError):
+            return {}
+
+    def __save_resource_index(self, index_file_path: str, folders: dict[str, IndexedFolder]) -> None:
+        temp_index_file_path = f"{index_file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        replaced = False
+        try:
+            os.makedirs(os.path.dirname(index_file_path), exist_ok = True)
+            with open(temp_index_file_path, "w", encoding = "utf-8") as index_file:
+                json.dump({ "version": Collection.__resource_index_version, "folders": folders }, index_file)
+
+            os.replace(temp_index_file_path, index_file_path)
+            replaced = True
+        except OSError:
+            pass
+        finally:
+            if not replaced:
+                try:
+                    os.remove(temp_index_file_path)
+                except OSError:
+                    pass
@@ -1,35 +1,45 @@
-from typing import Generic, Protocol, Sequence, TypeVar
+from array import array
+import copy
+import hashlib
+from typing import Any, ClassVar, Generic, Protocol, Sequence, TypeVar
+import numpy
 from io_scene_tr_reboot.tr.BlendShape import BlendShape
 from io_scene_tr_reboot.tr.IModelDataHeader import IModelDataHeader
 from io_scene_tr_reboot.tr.MeshPart import IMeshPart
-from io_scene_tr_reboot.tr.Vertex import Vertex
 from io_scene_tr_reboot.tr.VertexAttributeTypes import VertexAttributeTypes
 from io_scene_tr_reboot.tr.VertexFormat import VertexFormat
+from io_scene_tr_reboot.tr.VertexList import VertexList
 
 class IMesh(Protocol):
     model_data_header: IModelDataHeader
     vertex_format: VertexFormat
-    vertices: list[Vertex]
+    vertices: VertexList
     bone_indices: Sequence[int]
     parts: list[IMeshPart]
     blend_shapes: list[BlendShape | None]
 
-    def clone(self) -> "IMesh": ...
+    def clone(self, deep: bool = False) -> "IMesh": ...
+    def get_memory_size(self) -> int: ...
+    def get_content_hash(self) -> str: ...
+    def get_used_vertex_mask(self) -> numpy.ndarray[Any, Any]: ...
 
 TModelDataHeader = TypeVar("TModelDataHeader", bound = IModelDataHeader)
 TMeshPart = TypeVar("TMeshPart", bound = IMeshPart)
 class MeshBase(IMesh, Generic[TModelDataHeader, TMeshPart]):
     model_data_header: TModelDataHeader
     vertex_format: VertexFormat
-    vertices: list[Vertex]
+    vertices: VertexList
     bone_indices: Sequence[int]
     parts: list[TMeshPart]
     blend_shapes: list[BlendShape | None]
 
+    __estimated_part_size: ClassVar[int] = 0x100
+    __estimated_vertex_offsets_size: ClassVar[int] = 0x200
+
     def __init__(self, model_data_header: TModelDataHeader) -> None:
         self.model_data_header = model_data_header  # type: ignore
         self.vertex_format = VertexFormat(self.vertex_attribute_types)
-        self.vertices = []
+        self.vertices = VertexList()
         self.bone_indices = []
         self.parts = []
         self.blend_shapes = []
@@ -37,11 +47,43 @@ class MeshBase(IMesh, Generic[TModelDataHeader, TMeshPart]):
     @property
     def vertex_attribute_types(self) -> VertexAttributeTypes: ...
 
-    def clone(self) -> IMesh:
+    def clone(self, deep: bool = False) -> IMesh:
         new_mesh = self.__class__(self.model_data_header)
         new_mesh.assign(self)
+        if deep:
+            new_mesh.vertices = self.vertices.clone()
+            new_mesh.bone_indices = list(self.bone_indices)
+            new_mesh.parts = [copy.deepcopy(part) for part in self.parts]
+            new_mesh.blend_shapes = [blend_shape and blend_shape.clone() for blend_shape in self.blend_shapes]
+
         return new_mesh
 
+    def get_memory_size(self) -> int:
+        return self.vertices.get_memory_size() + \
+               len(self.bone_indices) * 8 + \
+               sum(MeshBase.__estimated_part_size + len(part.indices) * 2 for part in self.parts) + \
+               sum(len(blend_shape.vertices) for blend_shape in self.blend_shapes if blend_shape is not None) * MeshBase.__estimated_vertex_offsets_size
+
+    def get_content_hash(self) -> str:
+        content_hash = hashlib.blake2b(self.vertex_format.hash.to_bytes(8, "little"), digest_size = 16)
+        for format_attr in self.vertex_format.attributes:
+            content_hash.update(bytes(format_attr))
+            column = self.vertices.get_column(format_attr.name_hash)
+            if column is not None:
+                content_hash.update(numpy.ascontiguousarray(column, numpy.float64).tobytes())
+
+        for part in self.parts:
+            content_hash.update(array("H", part.indices).tobytes())
+
+        return content_hash.hexdigest()
+
+    def get_used_vertex_mask(self) -> numpy.ndarray[Any, Any]:
+        used_vertex_mask = numpy.zeros(len(self.vertices), bool)
+        for part in self.parts:
+            used_vertex_mask[numpy.asarray(part.indices, numpy.int64)] = True
+
+        return used_vertex_mask
+
     def assign(self, other: IMesh) -> None:
         self.vertex_format = other.vertex_format
         self.vertices = other.vertices
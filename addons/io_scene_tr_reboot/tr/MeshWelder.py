@@ -0,0 +1,78 @@
+from typing import Any, Iterable, NamedTuple, cast
+import numpy
+from io_scene_tr_reboot.tr.Hashes import Hashes
+from io_scene_tr_reboot.tr.Mesh import IMesh
+
+class MeshWelder:
+    class Result(NamedTuple):
+        vertex_idxs: numpy.ndarray[Any, Any]                    # Source vertex index of each welded vertex
+        vertex_map: numpy.ndarray[Any, Any]                     # Welded vertex index of each source vertex, or -1 if dropped
+        corner_vertex_idxs: numpy.ndarray[Any, Any]             # Welded vertex index of each remaining triangle corner
+        corner_source_vertex_idxs: numpy.ndarray[Any, Any]      # Source vertex index of each remaining triangle corner
+        part_num_faces: list[int]
+
+    @staticmethod
+    def weld(mesh: IMesh, merge_distance: float | None, blend_shape_offsets: Iterable[tuple[numpy.ndarray[Any, Any], numpy.ndarray[Any, Any]]] = ()) -> Result:
+        num_vertices = len(mesh.vertices)
+        source_faces = numpy.concatenate([numpy.asarray(part.indices, numpy.int64) for part in mesh.parts]).reshape(-1, 3)
+        used_vertex_idxs = numpy.unique(source_faces)
+
+        # Vertices are merged when their quantized positions match, both in the base mesh and in every blend shape
+        used_vertex_groups: numpy.ndarray[Any, Any]
+        if merge_distance is None:
+            used_vertex_groups = numpy.arange(len(used_vertex_idxs))
+        else:
+            positions = cast(numpy.ndarray[Any, Any], mesh.vertices.get_column(Hashes.position))[used_vertex_idxs, :3]
+            _, used_vertex_groups = numpy.unique(MeshWelder.quantize(positions, merge_distance), axis = 0, return_inverse = True)
+            used_vertex_groups = used_vertex_groups.reshape(-1)
+
+            used_idxs_by_vertex = numpy.full(num_vertices, -1, numpy.int64)
+            used_idxs_by_vertex[used_vertex_idxs] = numpy.arange(len(used_vertex_idxs))
+            for shape_vertex_idxs, shape_position_offsets in blend_shape_offsets:
+                shape_used_idxs = used_idxs_by_vertex[shape_vertex_idxs]
+                quantized_offsets = MeshWelder.quantize(shape_position_offsets, merge_distance)
+                moved = (shape_used_idxs >= 0) & quantized_offsets.any(axis = 1)
+                if not moved.any():
+                    continue
+
+                # Split up the existing groups by offset, with 0 standing for "not moved"
+                _, offset_ids = numpy.unique(quantized_offsets[moved], axis = 0, return_inverse = True)
+                used_offset_ids = numpy.zeros(len(used_vertex_idxs), numpy.int64)
+                used_offset_ids[shape_used_idxs[moved]] = offset_ids.reshape(-1) + 1
+                _, used_vertex_groups = numpy.unique(used_vertex_groups * (len(offset_ids) + 1) + used_offset_ids, return_inverse = True)
+                used_vertex_groups = used_vertex_groups.reshape(-1)
+
+        # The used vertices are sorted, so the first vertex of each group is the one with the lowest index
+        _, group_first_used_idxs, used_vertex_groups = numpy.unique(used_vertex_groups, return_index = True, return_inverse = True)
+        used_vertex_groups = used_vertex_groups.reshape(-1)
+        group_first_vertex_idxs = used_vertex_idxs[group_first_used_idxs]
+
+        vertex_groups = numpy.full(num_vertices, -1, numpy.int64)
+        vertex_groups[used_vertex_idxs] = used_vertex_groups
+
+        # Triangles that collapse after merging are dropped, and so are the vertices that only they used
+        face_groups = vertex_groups[source_faces]
+        valid_faces = (face_groups[:, 0] != face_groups[:, 1]) & \
+                      (face_groups[:, 1] != face_groups[:, 2]) & \
+                      (face_groups[:, 2] != face_groups[:, 0])
+
+        kept_groups = numpy.unique(face_groups[valid_faces])
+        kept_group_order = numpy.argsort(group_first_vertex_idxs[kept_groups], kind = "stable")
+        group_welded_idxs = numpy.full(len(group_first_vertex_idxs), -1, numpy.int64)
+        group_welded_idxs[kept_groups[kept_group_order]] = numpy.arange(len(kept_groups))
+
+        vertex_map = numpy.full(num_vertices, -1, numpy.int64)
+        vertex_map[used_vertex_idxs] = group_welded_idxs[used_vertex_groups]
+
+        part_idxs = numpy.repeat(numpy.arange(len(mesh.parts)), [len(part.indices) // 3 for part in mesh.parts])
+        return MeshWelder.Result(
+            group_first_vertex_idxs[kept_groups[kept_group_order]],
+            vertex_map,
+            group_welded_idxs[face_groups[valid_faces]].reshape(-1).astype(numpy.int32),
+            source_faces[valid_faces].reshape(-1).astype(numpy.int32),
+            numpy.bincount(part_idxs[valid_faces], minlength = len(mesh.parts)).tolist()
+        )
+
+    @staticmethod
+    def quantize(values: numpy.ndarray[Any, Any], step: float) -> numpy.ndarray[Any, Any]:
+        return numpy.round(values / step).astype(numpy.int64)
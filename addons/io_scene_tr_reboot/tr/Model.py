@@ -1,5 +1,7 @@
 from abc import abstractmethod
-from typing import Generic, Protocol, TypeVar
+import copy
+from typing import Generic, NamedTuple, Protocol, Sequence, TypeVar, cast
+from mathutils import Vector
 from io_scene_tr_reboot.tr.Mesh import IMesh
 from io_scene_tr_reboot.tr.MeshPart import IMeshPart
 from io_scene_tr_reboot.tr.IModelDataHeader import IModelDataHeader
@@ -7,6 +9,28 @@ from io_scene_tr_reboot.tr.ModelReferences import ModelReferences
 from io_scene_tr_reboot.tr.ResourceBuilder import ResourceBuilder
 from io_scene_tr_reboot.tr.ResourceReader import ResourceReader
 
+class MeshPartSummary(NamedTuple):
+    lod_level: int
+    draw_group_id: int
+    flags: int
+    material_idx: int
+    num_triangles: int
+
+class MeshSummary(NamedTuple):
+    num_vertices: int
+    bone_indices: list[int]
+    parts: list[MeshPartSummary]
+
+class ModelSummary(NamedTuple):
+    bound_box_min: Vector
+    bound_box_max: Vector
+    num_lod_levels: int
+    bone_usage_map: list[int]
+    has_vertex_weights: bool
+    has_blend_shapes: bool
+    num_blend_shapes: int
+    meshes: list[MeshSummary]
+
 class IModel(Protocol):
     id: int
     refs: ModelReferences
@@ -15,6 +39,9 @@ class IModel(Protocol):
 
     def read(self, reader: ResourceReader) -> None: ...
     def write(self, writer: ResourceBuilder) -> None: ...
+    def probe(self, reader: ResourceReader) -> ModelSummary | None: ...
+    def clone(self) -> "IModel": ...
+    def get_memory_size(self) -> int: ...
 
 TModelReferences = TypeVar("TModelReferences", bound = ModelReferences)
 TModelDataHeader = TypeVar("TModelDataHeader", bound = IModelDataHeader)
@@ -37,3 +64,44 @@ class Model(IModel, Generic[TModelReferences, TModelDataHeader, TMesh, TMeshPart
 
     @abstractmethod
     def write(self, writer: ResourceBuilder) -> None: ...
+
+    @abstractmethod
+    def probe(self, reader: ResourceReader) -> ModelSummary | None: ...
+
+    def create_summary(self, header: IModelDataHeader, meshes: Sequence[tuple[int, Sequence[int], int]], parts: Sequence[IMeshPart]) -> ModelSummary:
+        mesh_summaries: list[MeshSummary] = []
+        part_idx = 0
+        for num_vertices, bone_indices, num_parts in meshes:
+            part_summaries = [
+                MeshPartSummary(part.lod_level, part.draw_group_id, part.flags, part.material_idx, part.num_triangles)
+                for part in parts[part_idx:part_idx + num_parts]
+            ]
+            mesh_summaries.append(MeshSummary(num_vertices, list(bone_indices), part_summaries))
+            part_idx += num_parts
+
+        return ModelSummary(
+            header.bound_box_min,
+            header.bound_box_max,
+            header.num_lod_levels,
+            list(header.bone_usage_map),
+            header.has_vertex_weights,
+            header.has_blend_shapes,
+            header.num_blend_shapes,
+            mesh_summaries
+        )
+
+    def clone(self) -> IModel:
+        # Parsed models are shared through the resource cache, so the clone can't share anything its user might modify
+        new_model = copy.copy(self)
+        new_model.refs = copy.deepcopy(self.refs)
+        new_model.header = copy.deepcopy(self.header)
+        new_model.meshes = []
+        for mesh in self.meshes:
+            new_mesh = cast(TMesh, mesh.clone(True))
+            new_mesh.model_data_header = new_model.header
+            new_model.meshes.append(new_mesh)
+
+        return new_model
+
+    def get_memory_size(self) -> int:
+        return sum(mesh.get_memory_size() for mesh in self.meshes)
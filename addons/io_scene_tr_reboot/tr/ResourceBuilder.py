@@ -1,11 +1,17 @@
-from io import BytesIO
-from typing import cast
+import os
+import stat
+import tempfile
+from typing import BinaryIO
 from io_scene_tr_reboot.tr.Enumerations import CdcGame
 from io_scene_tr_reboot.tr.ResourceKey import ResourceKey
 from io_scene_tr_reboot.tr.ResourceReader import ResourceReader
 from io_scene_tr_reboot.tr.ResourceReference import ResourceReference
 from io_scene_tr_reboot.util.BinaryWriter import BinaryWriter
 
+# The umask can only be read by temporarily changing it, so this is done once at import time rather than while other threads may be creating files
+_umask = os.umask(0)
+os.umask(_umask)
+
 class ResourceBuilder(BinaryWriter):
     resource: ResourceKey
     references: dict[int, ResourceReference]
@@ -13,7 +19,7 @@ class ResourceBuilder(BinaryWriter):
     pointer_size: int
 
     def __init__(self, resource: ResourceKey, game: CdcGame) -> None:
-        super().__init__(BytesIO())
+        super().__init__()
         self.resource = resource
         self.references = {}
         self.game = game
@@ -36,7 +42,7 @@ class ResourceBuilder(BinaryWriter):
         )
 
     def write_builder(self, builder: "ResourceBuilder") -> None:
-        self.__write_resource(builder.resource, builder.references, cast(BytesIO, builder.stream).getbuffer())
+        self.__write_resource(builder.resource, builder.references, builder.buffer)
 
     def __write_resource(self, resource: ResourceKey, refs: dict[int, ResourceReference], body: memoryview) -> None:
         for offset, ref in refs.items():
@@ -73,8 +79,47 @@ class ResourceBuilder(BinaryWriter):
             self.write_uint64(ref.id)
 
     def build(self) -> memoryview:
+        header = self.build_header()
+        if header is None:
+            return self.buffer
+
+        result_writer = BinaryWriter(len(header) + self.size)
+        result_writer.write_bytes(header)
+        result_writer.write_bytes(self.buffer)
+        return result_writer.buffer
+
+    def build_to(self, file: BinaryIO) -> None:
+        header = self.build_header()
+        if header is not None:
+            file.write(header)
+
+        file.write(self.buffer)
+
+    def write_to_path(self, file_path: str) -> None:
+        temp_file_handle, temp_file_path = tempfile.mkstemp(".tmp", os.path.basename(file_path) + ".", os.path.dirname(file_path))
+        replaced = False
+        try:
+            with os.fdopen(temp_file_handle, "wb") as file:
+                self.build_to(file)
+
+            # mkstemp() creates the file as owner-only, so give it the permissions a regular open() would have
+            os.chmod(temp_file_path, ResourceBuilder.get_file_mode(file_path))
+            os.replace(temp_file_path, file_path)
+            replaced = True
+        finally:
+            if not replaced:
+                os.remove(temp_file_path)
+
+    @staticmethod
+    def get_file_mode(file_path: str) -> int:
+        try:
+            return stat.S_IMODE(os.stat(file_path).st_mode)
+        except FileNotFoundError:
+            return 0o666 & ~_umask
+
+    def build_header(self) -> memoryview | None:
         if len(self.references) == 0:
-            return cast(BytesIO, self.stream).getbuffer()
+            return None
 
         internal_refs: dict[int, ResourceReference] = {}
         wide_external_refs: dict[int, ResourceReference] = {}
@@ -87,28 +132,26 @@ class ResourceBuilder(BinaryWriter):
             else:
                 packed_external_refs[offset] = ref
 
-        result = BytesIO()
-        result_writer = BinaryWriter(result)
-        result_writer.write_int32(len(internal_refs))
-        result_writer.write_int32(len(wide_external_refs))
-        result_writer.write_int32(0)
-        result_writer.write_int32(0)
-        result_writer.write_int32(len(packed_external_refs))
+        header_writer = BinaryWriter(0x14 + len(self.references) * 0x10)
+        header_writer.write_int32(len(internal_refs))
+        header_writer.write_int32(len(wide_external_refs))
+        header_writer.write_int32(0)
+        header_writer.write_int32(0)
+        header_writer.write_int32(len(packed_external_refs))
 
         for offset, ref in internal_refs.items():
-            result_writer.write_int32(offset)
-            result_writer.write_int32(ref.offset)
+            header_writer.write_int32(offset)
+            header_writer.write_int32(ref.offset)
 
         for offset, ref in wide_external_refs.items():
             if self.game == CdcGame.TR2013:
-                result_writer.write_uint64((ref.offset << 39) | ((offset // 4) << 16))
+                header_writer.write_uint64((ref.offset << 39) | ((offset // 4) << 16))
             else:
-                result_writer.write_int32(ref.type)
-                result_writer.write_int32(ref.id)
-                result_writer.write_int32(ref.offset)
+                header_writer.write_int32(ref.type)
+                header_writer.write_int32(ref.id)
+                header_writer.write_int32(ref.offset)
 
         for offset, ref in packed_external_refs.items():
-            result_writer.write_uint32((ref.type << 25) | (offset // 4))
+            header_writer.write_uint32((ref.type << 25) | (offset // 4))
 
-        result_writer.write_bytes(cast(BytesIO, self.stream).getbuffer())
-        return result.getbuffer()
+        return header_writer.buffer
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+import os
+import threading
+from typing import Any, Callable, ClassVar, Hashable, NamedTuple, TypeVar
+
+T = TypeVar("T")
+
+class ResourceCache:
+    class FileKey(NamedTuple):
+        path: str
+        mtime: int
+        size: int
+
+    class Statistics(NamedTuple):
+        hits: int
+        misses: int
+        evictions: int
+        num_entries: int
+        size: int
+
+    max_size: ClassVar[int] = 512 * 1024 * 1024
+
+    __entries: ClassVar[OrderedDict[Hashable, tuple[Any, int]]] = OrderedDict()
+    __size: ClassVar[int] = 0
+    __hits: ClassVar[int] = 0
+    __misses: ClassVar[int] = 0
+    __evictions: ClassVar[int] = 0
+    __lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @staticmethod
+    def get_file_key(file_path: str) -> FileKey | None:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        return ResourceCache.FileKey(os.path.normcase(os.path.abspath(file_path)), stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def get_or_add(key: Hashable, create: Callable[[], T | None], get_size: Callable[[T], int]) -> T | None:
+        with ResourceCache.__lock:
+            entry = ResourceCache.__entries.get(key)
+            if entry is not None:
+                ResourceCache.__entries.move_to_end(key)
+                ResourceCache.__hits += 1
+                return entry[0]
+
+            ResourceCache.__misses += 1
+
+        # Created outside the lock so other threads can keep using the cache. If two threads miss on the same key,
+        # the first one to finish wins.
+        value = create()
+        if value is None:
+            return None
+
+        size = get_size(value)
+        if size > ResourceCache.max_size:
+            return value
+
+        with ResourceCache.__lock:
+            entry = ResourceCache.__entries.get(key)
+            if entry is not None:
+                return entry[0]
+
+            ResourceCache.__entries[key] = (value, size)
+            ResourceCache.__size += size
+            while ResourceCache.__size > ResourceCache.max_size:
+                _, (_, evicted_size) = ResourceCache.__entries.popitem(last = False)
+                ResourceCache.__size -= evicted_size
+                ResourceCache.__evictions += 1
+
+        return value
+
+    @staticmethod
+    def clear() -> None:
+        with ResourceCache.__lock:
+            ResourceCache.__entries.clear()
+            ResourceCache.__size = 0
+
+    @staticmethod
+    def get_statistics() -> Statistics:
+        with ResourceCache.__lock:
+            return ResourceCache.Statistics(
+                ResourceCache.__hits,
+                ResourceCache.__misses,
+                ResourceCache.__evictions,
+                len(ResourceCache.__entries),
+                ResourceCache.__size
+            )
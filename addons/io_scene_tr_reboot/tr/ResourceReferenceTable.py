@@ -0,0 +1,121 @@
+from array import array
+from bisect import bisect_right
+from mmap import mmap
+from struct import unpack_from
+from typing import ClassVar, Iterator
+import numpy
+from io_scene_tr_reboot.tr.Enumerations import CdcGame, ResourceType
+from io_scene_tr_reboot.tr.ResourceKey import ResourceKey
+from io_scene_tr_reboot.tr.ResourceReference import ResourceReference
+from io_scene_tr_reboot.util.SlotsBase import SlotsBase
+
+class ResourceReferenceTable(SlotsBase):
+    data: bytes | mmap
+    body_pos: int
+    pointer_positions: "array[int]"
+    target_types: "array[int]"
+    target_ids: "array[int]"
+    target_offsets: "array[int]"
+    target_sources: "array[int]"
+    file_order: "array[int]"
+
+    TARGET_STORED: ClassVar[int] = 0
+    TARGET_TYPE_AND_ID_IN_POINTER: ClassVar[int] = 1
+    TARGET_ID_IN_POINTER: ClassVar[int] = 2
+
+    def __init__(self, data: bytes | mmap = b"", body_pos: int = 0) -> None:
+        self.data = data
+        self.body_pos = body_pos
+        self.pointer_positions = array("q")
+        self.target_types = array("b")
+        self.target_ids = array("i")
+        self.target_offsets = array("i")
+        self.target_sources = array("b")
+        self.file_order = array("i")
+
+    @staticmethod
+    def read(resource: ResourceKey, data: bytes | mmap, game: CdcGame) -> "ResourceReferenceTable":
+        num_internal_refs, num_wide_external_refs, num_int_patches, num_short_patches, num_packed_external_refs = unpack_from("<5i", data, 0)
+
+        internal_refs_pos = 0x14
+        wide_external_refs_pos = internal_refs_pos + num_internal_refs*8
+        packed_external_refs_pos = wide_external_refs_pos + num_wide_external_refs*(8 if game == CdcGame.TR2013 else 16) + \
+                                                            num_int_patches*4 + \
+                                                            num_short_patches*8
+        body_pos = packed_external_refs_pos + num_packed_external_refs*4
+
+        # The target type and/or ID of TR2013 wide external references and packed external references are stored
+        # in the pointer itself. These are only read from the resource body when looked up.
+        internal_refs = numpy.frombuffer(data, numpy.int32, num_internal_refs * 2, internal_refs_pos).reshape(-1, 2)
+        pointer_positions = [internal_refs[:, 0]]
+        target_types      = [numpy.full(num_internal_refs, resource.type)]
+        target_ids        = [numpy.full(num_internal_refs, resource.id)]
+        target_offsets    = [internal_refs[:, 1]]
+        target_sources    = [numpy.full(num_internal_refs, ResourceReferenceTable.TARGET_STORED)]
+
+        if game == CdcGame.TR2013:
+            wide_external_refs = numpy.frombuffer(data, numpy.uint64, num_wide_external_refs, wide_external_refs_pos)
+            pointer_positions.append(((wide_external_refs >> 16) & 0x7FFFFF) * 4)
+            target_types.append(numpy.full(num_wide_external_refs, -1))
+            target_ids.append(numpy.full(num_wide_external_refs, -1))
+            target_offsets.append(wide_external_refs >> 39)
+            target_sources.append(numpy.full(num_wide_external_refs, ResourceReferenceTable.TARGET_TYPE_AND_ID_IN_POINTER))
+        else:
+            wide_external_refs = numpy.frombuffer(data, numpy.int32, num_wide_external_refs * 4, wide_external_refs_pos).reshape(-1, 4)
+            pointer_positions.append(wide_external_refs[:, 0])
+            target_types.append(wide_external_refs[:, 1])
+            target_ids.append(wide_external_refs[:, 2])
+            target_offsets.append(wide_external_refs[:, 3])
+            target_sources.append(numpy.full(num_wide_external_refs, ResourceReferenceTable.TARGET_STORED))
+
+        packed_external_refs = numpy.frombuffer(data, numpy.uint32, num_packed_external_refs, packed_external_refs_pos)
+        pointer_positions.append((packed_external_refs & 0x1FFFFFF) * 4)
+        target_types.append(packed_external_refs >> 25)
+        target_ids.append(numpy.full(num_packed_external_refs, -1))
+        target_offsets.append(numpy.zeros(num_packed_external_refs))
+        target_sources.append(numpy.full(num_packed_external_refs, ResourceReferenceTable.TARGET_ID_IN_POINTER))
+
+        all_pointer_positions = numpy.concatenate(pointer_positions).astype(numpy.int64)
+        order = numpy.argsort(all_pointer_positions, kind = "stable")
+
+        table = ResourceReferenceTable(data, body_pos)
+        table.pointer_positions.frombytes((all_pointer_positions[order] + body_pos).tobytes())
+        table.target_types.frombytes(numpy.concatenate(target_types).astype(numpy.int8)[order].tobytes())
+        table.target_ids.frombytes(numpy.concatenate(target_ids).astype(numpy.int32)[order].tobytes())
+        table.target_offsets.frombytes(numpy.concatenate(target_offsets).astype(numpy.int32)[order].tobytes())
+        table.target_sources.frombytes(numpy.concatenate(target_sources).astype(numpy.int8)[order].tobytes())
+        table.file_order.frombytes(numpy.argsort(order).astype(numpy.int32).tobytes())
+        return table
+
+    def __len__(self) -> int:
+        return len(self.pointer_positions)
+
+    def get(self, pointer_pos: int) -> ResourceReference | None:
+        idx = bisect_right(self.pointer_positions, pointer_pos) - 1
+        if idx < 0 or self.pointer_positions[idx] != pointer_pos:
+            return None
+
+        return self.__create_ref(idx)
+
+    def items(self) -> Iterator[tuple[int, ResourceReference]]:
+        # Same order and outcome as filling a dictionary from the file: the first reference at a position
+        # determines where it's listed, the last one determines what it points to
+        for idx in self.file_order:
+            pointer_pos = self.pointer_positions[idx]
+            if idx > 0 and self.pointer_positions[idx - 1] == pointer_pos:
+                continue
+
+            yield (pointer_pos, self.__create_ref(bisect_right(self.pointer_positions, pointer_pos) - 1))
+
+    def __create_ref(self, idx: int) -> ResourceReference:
+        target_type = self.target_types[idx]
+        target_id = self.target_ids[idx]
+        target_source = self.target_sources[idx]
+        if target_source == ResourceReferenceTable.TARGET_TYPE_AND_ID_IN_POINTER:
+            value: int = unpack_from("<I", self.data, self.pointer_positions[idx])[0]
+            target_type = value >> 24
+            target_id = value & 0xFFFFFF
+        elif target_source == ResourceReferenceTable.TARGET_ID_IN_POINTER:
+            target_id = unpack_from("<I", self.data, self.pointer_positions[idx])[0] & 0x7FFFFFFF
+
+        return ResourceReference(ResourceType(target_type), target_id, self.target_offsets[idx])
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+import copy
 from mathutils import Quaternion, Vector
 from typing import Generic, Protocol, TypeVar
 from io_scene_tr_reboot.tr.Bone import IBone
@@ -13,6 +14,7 @@ class ISkeleton(Protocol):
 
     def read(self, reader: ResourceReader) -> None: ...
     def write(self, writer: ResourceBuilder) -> None: ...
+    def clone(self) -> "ISkeleton": ...
 
 TBone = TypeVar("TBone", bound = IBone)
 class SkeletonBase(ISkeleton, Generic[TBone]):
@@ -31,6 +33,9 @@ class SkeletonBase(ISkeleton, Generic[TBone]):
     @abstractmethod
     def write(self, writer: ResourceBuilder) -> None: ...
 
+    def clone(self) -> ISkeleton:
+        return copy.deepcopy(self)
+
     def assign_auto_bone_orientations(self):
         bones_by_parent_id = Enumerable(self.bones).group_by(lambda b: b.parent_id)
         z_axis = Vector((0, 0, 1))
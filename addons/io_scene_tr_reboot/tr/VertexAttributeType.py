@@ -1,10 +1,14 @@
 from abc import abstractmethod
 import struct
-from typing import ClassVar
+from typing import Any, ClassVar
+import numpy
 
 class VertexAttributeType:
     id: int
     size: ClassVar[int]
+    component_dtype: ClassVar[str]
+    num_components: ClassVar[int]
+    normalization_divisor: ClassVar[float | None] = None
 
     def __init__(self, id: int) -> None:
         self.id = id
@@ -15,8 +19,35 @@ class VertexAttributeType:
     @abstractmethod
     def write(self, buffer: bytearray | memoryview, offset: int, value: tuple[float, ...]): ...
 
+    def decode_column(self, buffer: bytes | bytearray | memoryview, stride: int, offset: int, count: int) -> numpy.ndarray[Any, Any]:
+        values = self.get_component_view(buffer, stride, offset, count)
+        if self.normalization_divisor is not None:
+            return values / self.normalization_divisor
+
+        return values.copy()
+
+    def encode_column(self, values: numpy.ndarray[Any, Any], buffer: bytearray | memoryview, stride: int, offset: int) -> None:
+        target = self.get_component_view(buffer, stride, offset, len(values))
+        if self.normalization_divisor is not None:
+            values = values * self.normalization_divisor
+
+        if target.dtype.kind != "f":
+            component_range = numpy.iinfo(target.dtype)
+            values = numpy.clip(values, component_range.min, component_range.max).astype(numpy.int64)
+
+        target[...] = values
+
+    def get_component_view(self, buffer: bytes | bytearray | memoryview, stride: int, offset: int, count: int) -> numpy.ndarray[Any, Any]:
+        component_dtype = numpy.dtype(self.component_dtype)
+        if count == 0:
+            return numpy.empty((0, self.num_components), component_dtype)
+
+        return numpy.ndarray((count, self.num_components), component_dtype, buffer, offset, (stride, component_dtype.itemsize))
+
 class VertexAttributeType_FLOAT1(VertexAttributeType):
     size = 1 * 4
+    component_dtype = "<f4"
+    num_components = 1
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         return struct.unpack_from("<1f", buffer, offset)
@@ -26,6 +57,8 @@ class VertexAttributeType_FLOAT1(VertexAttributeType):
 
 class VertexAttributeType_FLOAT2(VertexAttributeType):
     size = 2 * 4
+    component_dtype = "<f4"
+    num_components = 2
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         return struct.unpack_from("<2f", buffer, offset)
@@ -35,6 +68,8 @@ class VertexAttributeType_FLOAT2(VertexAttributeType):
 
 class VertexAttributeType_FLOAT3(VertexAttributeType):
     size = 3 * 4
+    component_dtype = "<f4"
+    num_components = 3
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         return struct.unpack_from("<3f", buffer, offset)
@@ -44,6 +79,8 @@ class VertexAttributeType_FLOAT3(VertexAttributeType):
 
 class VertexAttributeType_FLOAT4(VertexAttributeType):
     size = 4 * 4
+    component_dtype = "<f4"
+    num_components = 4
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         return struct.unpack_from("<4f", buffer, offset)
@@ -53,6 +90,9 @@ class VertexAttributeType_FLOAT4(VertexAttributeType):
 
 class VertexAttributeType_R8G8B8A8_UNORM(VertexAttributeType):
     size = 4 * 1
+    component_dtype = "u1"
+    num_components = 4
+    normalization_divisor = 255.0
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         return (
@@ -70,6 +110,8 @@ class VertexAttributeType_R8G8B8A8_UNORM(VertexAttributeType):
 
 class VertexAttributeType_R8G8B8A8_UINT(VertexAttributeType):
     size = 4 * 1
+    component_dtype = "u1"
+    num_components = 4
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         return (
@@ -87,6 +129,8 @@ class VertexAttributeType_R8G8B8A8_UINT(VertexAttributeType):
 
 class VertexAttributeType_R16G16_SINT(VertexAttributeType):
     size = 2 * 2
+    component_dtype = "<i2"
+    num_components = 2
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         return struct.unpack_from("<2h", buffer, offset)
@@ -96,6 +140,8 @@ class VertexAttributeType_R16G16_SINT(VertexAttributeType):
 
 class VertexAttributeType_R16G16B16A16_SINT(VertexAttributeType):
     size = 4 * 2
+    component_dtype = "<i2"
+    num_components = 4
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         return struct.unpack_from("<4h", buffer, offset)
@@ -105,6 +151,8 @@ class VertexAttributeType_R16G16B16A16_SINT(VertexAttributeType):
 
 class VertexAttributeType_R16G16B16A16_UINT(VertexAttributeType):
     size = 4 * 2
+    component_dtype = "<u2"
+    num_components = 4
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         return struct.unpack_from("<4H", buffer, offset)
@@ -114,6 +162,8 @@ class VertexAttributeType_R16G16B16A16_UINT(VertexAttributeType):
 
 class VertexAttributeType_R32G32B32A32_UINT(VertexAttributeType):
     size = 4 * 4
+    component_dtype = "<u4"
+    num_components = 4
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         return struct.unpack_from("<4I", buffer, offset)
@@ -123,6 +173,9 @@ class VertexAttributeType_R32G32B32A32_UINT(VertexAttributeType):
 
 class VertexAttributeType_R16G16_SNORM(VertexAttributeType):
     size = 2 * 2
+    component_dtype = "<i2"
+    num_components = 2
+    normalization_divisor = 32768.0
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         value = struct.unpack_from("<2h", buffer, offset)
@@ -139,6 +192,9 @@ class VertexAttributeType_R16G16_SNORM(VertexAttributeType):
 
 class VertexAttributeType_R16G16B16A16_SNORM(VertexAttributeType):
     size = 4 * 2
+    component_dtype = "<i2"
+    num_components = 4
+    normalization_divisor = 32768.0
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         value = struct.unpack_from("<4h", buffer, offset)
@@ -162,6 +218,9 @@ class VertexAttributeType_R16G16B16A16_SNORM(VertexAttributeType):
 
 class VertexAttributeType_R16G16_UNORM(VertexAttributeType):
     size = 2 * 2
+    component_dtype = "<u2"
+    num_components = 2
+    normalization_divisor = 65535.0
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         value = struct.unpack_from("<2H", buffer, offset)
@@ -178,6 +237,9 @@ class VertexAttributeType_R16G16_UNORM(VertexAttributeType):
 
 class VertexAttributeType_R16G16B16A16_UNORM(VertexAttributeType):
     size = 4 * 2
+    component_dtype = "<u2"
+    num_components = 4
+    normalization_divisor = 65535.0
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         value = struct.unpack_from("<4H", buffer, offset)
@@ -201,6 +263,8 @@ class VertexAttributeType_R16G16B16A16_UNORM(VertexAttributeType):
 
 class VertexAttributeType_R10G10B10A2_UINT(VertexAttributeType):
     size = 4
+    component_dtype = "<u4"
+    num_components = 1
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         packed_value: int = struct.unpack_from("<I", buffer, offset)[0]
@@ -215,8 +279,27 @@ class VertexAttributeType_R10G10B10A2_UINT(VertexAttributeType):
         packed_value = int(value[0]) | (int(value[1]) << 10) | (int(value[2]) << 20) | (int(value[3]) << 30)
         struct.pack_into("<I", buffer, offset, packed_value)
 
+    def decode_column(self, buffer: bytes | bytearray | memoryview, stride: int, offset: int, count: int) -> numpy.ndarray[Any, Any]:
+        packed_values = self.get_component_view(buffer, stride, offset, count)[:, 0]
+        return numpy.stack(
+            (
+                packed_values & 0x3FF,
+                (packed_values >> 10) & 0x3FF,
+                (packed_values >> 20) & 0x3FF,
+                packed_values >> 30
+            ),
+            axis = 1
+        )
+
+    def encode_column(self, values: numpy.ndarray[Any, Any], buffer: bytearray | memoryview, stride: int, offset: int) -> None:
+        components = numpy.clip(values, 0, (0x3FF, 0x3FF, 0x3FF, 3)).astype(numpy.uint32)
+        packed_values = components[:, 0] | (components[:, 1] << 10) | (components[:, 2] << 20) | (components[:, 3] << 30)
+        self.get_component_view(buffer, stride, offset, len(values))[:, 0] = packed_values
+
 class VertexAttributeType_R10G10B10A2_UNORM(VertexAttributeType):
     size = 4
+    component_dtype = "<u4"
+    num_components = 1
 
     def read(self, buffer: bytes | memoryview, offset: int) -> tuple[float, ...]:
         packed_value: int = struct.unpack_from("<I", buffer, offset)[0]
@@ -233,3 +316,20 @@ class VertexAttributeType_R10G10B10A2_UNORM(VertexAttributeType):
                        (int(value[2] * 1023.0 + 0.5) << 20) | \
                        (int(value[3] * 3.0    + 0.5) << 30)
         struct.pack_into("<I", buffer, offset, packed_value)
+
+    def decode_column(self, buffer: bytes | bytearray | memoryview, stride: int, offset: int, count: int) -> numpy.ndarray[Any, Any]:
+        packed_values = self.get_component_view(buffer, stride, offset, count)[:, 0]
+        return numpy.stack(
+            (
+                (packed_values & 0x3FF) / 1023.0,
+                ((packed_values >> 10) & 0x3FF) / 1023.0,
+                ((packed_values >> 20) & 0x3FF) / 1023.0,
+                (packed_values >> 30) / 3.0
+            ),
+            axis = 1
+        )
+
+    def encode_column(self, values: numpy.ndarray[Any, Any], buffer: bytearray | memoryview, stride: int, offset: int) -> None:
+        components = numpy.clip(values * (1023.0, 1023.0, 1023.0, 3.0) + 0.5, 0, (0x3FF, 0x3FF, 0x3FF, 3)).astype(numpy.uint32)
+        packed_values = components[:, 0] | (components[:, 1] << 10) | (components[:, 2] << 20) | (components[:, 3] << 30)
+        self.get_component_view(buffer, stride, offset, len(values))[:, 0] = packed_values
@@ -0,0 +1,218 @@
+from mmap import mmap
+from typing import Any, ClassVar, Iterator, MutableMapping, Sequence, cast, overload
+import numpy
+from io_scene_tr_reboot.tr.Vertex import Vertex
+from io_scene_tr_reboot.tr.VertexAttributeType import VertexAttributeType
+from io_scene_tr_reboot.tr.VertexFormat import VertexFormat
+
+class VertexList(Sequence[Vertex]):
+    __columns: dict[int, numpy.ndarray[Any, Any]] | None
+    __undecoded_columns: dict[int, tuple[VertexAttributeType, bytes | memoryview, int, int]]
+    __rows: list[Vertex] | None
+    __count: int
+
+    __estimated_row_size: ClassVar[int] = 0x400
+
+    def __init__(self, columns: dict[int, numpy.ndarray[Any, Any]] | None = None, count: int = 0) -> None:
+        self.__undecoded_columns = {}
+        if columns is None:
+            self.__columns = None
+            self.__rows = []
+            self.__count = 0
+        else:
+            self.__columns = columns
+            self.__rows = None
+            self.__count = count
+
+    @staticmethod
+    def read(vertex_buffers: Sequence[bytes | memoryview], format: VertexFormat, count: int) -> "VertexList":
+        # Attributes are only decoded when first accessed, so callers that need e.g. just the positions don't pay for the rest.
+        # Buffers that point into a memory-mapped file get copied because the file may be closed before then.
+        vertex_buffers = [bytes(vertex_buffer) if isinstance(vertex_buffer, memoryview) and isinstance(vertex_buffer.obj, mmap) else vertex_buffer for vertex_buffer in vertex_buffers]
+        vertex_list = VertexList({}, count)
+        for format_attr in format.attributes:
+            vertex_list.__undecoded_columns[format_attr.name_hash] = (
+                format_attr.type,
+                vertex_buffers[format_attr.vertex_buffer_idx],
+                format.vertex_sizes[format_attr.vertex_buffer_idx],
+                format_attr.offset
+            )
+
+        return vertex_list
+
+    def clone(self) -> "VertexList":
+        # The undecoded buffers are never modified, so only the decoded data needs to be copied
+        new_list = VertexList()
+        new_list.__undecoded_columns = dict(self.__undecoded_columns)
+        if self.__columns is not None:
+            new_list.__columns = { attr_name_hash: column.copy() for attr_name_hash, column in self.__columns.items() }
+            new_list.__rows = None
+        else:
+            new_list.__rows = [vertex.clone() for vertex in self.__rows or []]
+
+        new_list.__count = self.__count
+        return new_list
+
+    def take(self, vertex_idxs: numpy.ndarray[Any, Any]) -> "VertexList":
+        new_list = VertexList({}, len(vertex_idxs))
+        taken_buffers: dict[int, bytes] = {}
+        for attr_name_hash, (type, buffer, stride, offset) in self.__undecoded_columns.items():
+            taken_buffer = taken_buffers.get(id(buffer))
+            if taken_buffer is None:
+                taken_buffer = numpy.frombuffer(buffer, numpy.uint8, self.__count * stride).reshape(-1, stride)[vertex_idxs].tobytes()
+                taken_buffers[id(buffer)] = taken_buffer
+
+            new_list.__undecoded_columns[attr_name_hash] = (type, taken_buffer, stride, offset)
+
+        if self.__columns is not None:
+            new_list.__columns = { attr_name_hash: column[vertex_idxs] for attr_name_hash, column in self.__columns.items() }
+        else:
+            rows = self.__rows or []
+            new_list.__columns = None
+            new_list.__rows = [rows[vertex_idx].clone() for vertex_idx in vertex_idxs.tolist()]
+
+        return new_list
+
+    def get_memory_size(self) -> int:
+        undecoded_buffers = { id(buffer): buffer for _, buffer, _, _ in self.__undecoded_columns.values() }
+        size = sum(len(buffer) for buffer in undecoded_buffers.values())
+        if self.__columns is not None:
+            size += sum(column.nbytes for column in self.__columns.values())
+        else:
+            size += len(self.__rows or []) * VertexList.__estimated_row_size
+
+        return size
+
+    def write(self, vertex_buffers: list[bytearray], format: VertexFormat) -> None:
+        if self.__count == 0:
+            return
+
+        for format_attr in format.attributes:
+            stride = format.vertex_sizes[format_attr.vertex_buffer_idx]
+            undecoded_column = self.__undecoded_columns.get(format_attr.name_hash)
+            if undecoded_column is not None and undecoded_column[0] is format_attr.type:
+                # Attributes that were never decoded (and so can't have been modified) are copied over as-is
+                _, source_buffer, source_stride, source_offset = undecoded_column
+                source = numpy.frombuffer(source_buffer, numpy.uint8, self.__count * source_stride).reshape(-1, source_stride)
+                target = numpy.frombuffer(vertex_buffers[format_attr.vertex_buffer_idx], numpy.uint8, self.__count * stride).reshape(-1, stride)
+                target[:, format_attr.offset:format_attr.offset + format_attr.type.size] = source[:, source_offset:source_offset + format_attr.type.size]
+                continue
+
+            format_attr.type.encode_column(
+                cast(numpy.ndarray[Any, Any], self.get_column(format_attr.name_hash)),
+                vertex_buffers[format_attr.vertex_buffer_idx],
+                stride,
+                format_attr.offset
+            )
+
+    @property
+    def columns(self) -> dict[int, numpy.ndarray[Any, Any]]:
+        if self.__columns is None:
+            self.__convert_rows_to_columns()
+
+        for attr_name_hash in list(self.__undecoded_columns.keys()):
+            self.__decode_column(attr_name_hash)
+
+        return cast(dict[int, numpy.ndarray[Any, Any]], self.__columns)
+
+    def get_column(self, attr_name_hash: int) -> numpy.ndarray[Any, Any] | None:
+        if self.__columns is None:
+            self.__convert_rows_to_columns()
+
+        if attr_name_hash in self.__undecoded_columns:
+            return self.__decode_column(attr_name_hash)
+
+        return cast(dict[int, numpy.ndarray[Any, Any]], self.__columns).get(attr_name_hash)
+
+    def get_attr_name_hashes(self) -> list[int]:
+        if self.__columns is None:
+            rows = self.__rows or []
+            return len(rows) > 0 and list(rows[0].attributes.keys()) or []
+
+        return list(self.__columns.keys()) + list(self.__undecoded_columns.keys())
+
+    def __decode_column(self, attr_name_hash: int) -> numpy.ndarray[Any, Any]:
+        type, buffer, stride, offset = self.__undecoded_columns.pop(attr_name_hash)
+        column = type.decode_column(buffer, stride, offset, self.__count)
+        cast(dict[int, numpy.ndarray[Any, Any]], self.__columns)[attr_name_hash] = column
+        return column
+
+    def __convert_rows_to_columns(self) -> None:
+        # The columns become the only copy of the data. Vertices that were handed out before keep working
+        # because their attributes get redirected to the columns.
+        rows = self.__rows or []
+        self.__columns = {}
+        if len(rows) > 0:
+            for attr_name_hash in rows[0].attributes.keys():
+                self.__columns[attr_name_hash] = numpy.array([vertex.attributes[attr_name_hash] for vertex in rows])
+
+        for vertex_idx, vertex in enumerate(rows):
+            vertex.attributes = _VertexAttributes(self, vertex_idx)
+
+    @property
+    def rows(self) -> list[Vertex]:
+        if self.__rows is None:
+            self.__rows = [Vertex() for _ in range(self.__count)]
+            for vertex_idx, vertex in enumerate(self.__rows):
+                vertex.attributes = _VertexAttributes(self, vertex_idx)
+
+        return self.__rows
+
+    def append(self, vertex: Vertex) -> None:
+        rows = self.rows
+        if self.__columns is not None:
+            columns = self.columns
+            for attr_name_hash, column in columns.items():
+                columns[attr_name_hash] = numpy.concatenate([column, numpy.array([vertex.attributes[attr_name_hash]], column.dtype)])
+
+            vertex.attributes = _VertexAttributes(self, self.__count)
+
+        rows.append(vertex)
+        self.__count += 1
+
+    def __len__(self) -> int:
+        return self.__count
+
+    @overload
+    def __getitem__(self, index: int) -> Vertex: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Vertex]: ...
+
+    def __getitem__(self, index: int | slice) -> Vertex | list[Vertex]:
+        return self.rows[index]
+
+    def __iter__(self) -> Iterator[Vertex]:
+        return iter(self.rows)
+
+class _VertexAttributes(MutableMapping[int, tuple[float, ...]]):
+    __vertex_list: VertexList
+    __vertex_idx: int
+
+    def __init__(self, vertex_list: VertexList, vertex_idx: int) -> None:
+        self.__vertex_list = vertex_list
+        self.__vertex_idx = vertex_idx
+
+    def __getitem__(self, attr_name_hash: int) -> tuple[float, ...]:
+        column = self.__vertex_list.get_column(attr_name_hash)
+        if column is None:
+            raise KeyError(attr_name_hash)
+
+        return tuple(column[self.__vertex_idx].tolist())
+
+    def __setitem__(self, attr_name_hash: int, value: tuple[float, ...]) -> None:
+        column = self.__vertex_list.get_column(attr_name_hash)
+        if column is None:
+            column = numpy.zeros((len(self.__vertex_list), len(value)))
+            self.__vertex_list.columns[attr_name_hash] = column
+
+        column[self.__vertex_idx] = value
+
+    def __delitem__(self, attr_name_hash: int) -> None:
+        raise TypeError("Attributes can't be removed from a single vertex")
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.__vertex_list.get_attr_name_hashes())
+
+    def __len__(self) -> int:
+        return len(self.__vertex_list.get_attr_name_hashes())
@@ -50,7 +50,7 @@ class _ClothDefMass(CStruct64, IClothDefMass if TYPE_CHECKING else object):
     def mass(self, value: int) -> None:             # type: ignore
         self.is_pinned = 0 if value == 255 else 1
 
-    bounce_back_factor: int
+    bounce_back_factor: int = 0
     _ignored_fields_ = ("bounce_back_factor",)
 
 assert(sizeof(_ClothDefMass) == 0x30)
@@ -69,7 +69,7 @@ class _ClothDefSpring(CStruct64, IClothDefSpring if TYPE_CHECKING else object):
     mass_1_idx: CShort
     mass_2_idx: CShort
 
-    stretchiness_interpolation_value: float
+    stretchiness_interpolation_value: float = 0
     _ignored_fields_ = ("stretchiness_interpolation_value",)
 
 assert(sizeof(_ClothDefSpring) == 8)
@@ -181,21 +181,13 @@ class RiseCloth(Tr2013Cloth):
         return dtp_strips
 
     def read_definition_masses(self, reader: ResourceReader, count: int) -> Sequence[IClothDefMass]:
-        dtp_masses = reader.read_struct_list(_ClothDefMass, count)
-        for dtp_mass in dtp_masses:
-            dtp_mass.bounce_back_factor = 0
-
-        return dtp_masses
+        return reader.read_struct_array(_ClothDefMass, count)
 
     def read_definition_anchor_bones(self, reader: ResourceReader, count: int) -> Sequence[IClothDefAnchorBone]:
         return reader.read_struct_list(_ClothDefAnchorBone, count)
 
     def read_definition_springs(self, reader: ResourceReader, count: int) -> Sequence[IClothDefSpring]:
-        dtp_springs = reader.read_struct_list(_ClothDefSpring, count)
-        for dtp_spring in dtp_springs:
-            dtp_spring.stretchiness_interpolation_value = 0
-
-        return dtp_springs
+        return reader.read_struct_array(_ClothDefSpring, count)
 
     def read_tune_header(self, reader: ResourceReader) -> IClothTune:
         return reader.read_struct(_ClothTune)
@@ -7,7 +7,7 @@ from io_scene_tr_reboot.tr.Collision import Collision
 from io_scene_tr_reboot.tr.Enumerations import CdcGame, ResourceType
 from io_scene_tr_reboot.tr.Hashes import Hashes
 from io_scene_tr_reboot.tr.Material import Material
-from io_scene_tr_reboot.tr.Model import IModel
+from io_scene_tr_reboot.tr.Model import IModel, ModelSummary
 from io_scene_tr_reboot.tr.ResourceKey import ResourceKey
 from io_scene_tr_reboot.tr.ResourceReader import ResourceReader
 from io_scene_tr_reboot.tr.ResourceReference import ResourceReference
@@ -120,8 +120,7 @@ class RiseCollection(Collection):
                 self._transformed_components[transformed_component_array.type_hash] = components_of_type
 
                 reader.seek(transformed_component_array.items_ref)
-                for _ in range(transformed_component_array.count):
-                    component = reader.read_struct(_ObjectTransformedComponent)
+                for component in reader.read_struct_array(_ObjectTransformedComponent, transformed_component_array.count):
                     if component.dtp_ref is not None:
                         components_of_type.append(CollectionTransformedComponent(component.hash, component.dtp_ref, component.transform))
 
@@ -145,13 +144,24 @@ class RiseCollection(Collection):
         return instances
 
     def get_model(self, resource: ResourceKey) -> IModel | None:
+        def read_model() -> IModel | None:
+            reader = self.get_resource_reader(resource, True)
+            if reader is None:
+                return None
+
+            model = RiseModel(resource.id)
+            model.read(reader)
+            return model
+
+        model = self._get_cached_resource("model", [resource], read_model, lambda model: model.get_memory_size())
+        return model and model.clone()
+
+    def probe_model(self, resource: ResourceKey) -> ModelSummary | None:
         reader = self.get_resource_reader(resource, True)
         if reader is None:
             return None
 
-        model = RiseModel(resource.id)
-        model.read(reader)
-        return model
+        return RiseModel(resource.id).probe(reader)
 
     def _create_material(self) -> Material:
         return RiseMaterial()
@@ -160,15 +170,21 @@ class RiseCollection(Collection):
         if self._skeleton is not None:
             return self._skeleton
 
-        if self._header.skeleton_ref is None:
+        skeleton_ref = self._header.skeleton_ref
+        if skeleton_ref is None:
             return None
 
-        reader = self.get_resource_reader(self._header.skeleton_ref, True)
-        if reader is None:
-            return None
+        def read_skeleton() -> ISkeleton | None:
+            reader = self.get_resource_reader(skeleton_ref, True)
+            if reader is None:
+                return None
+
+            skeleton = self._create_skeleton(skeleton_ref.id)
+            skeleton.read(reader)
+            return skeleton
 
-        self._skeleton = self._create_skeleton(self._header.skeleton_ref.id)
-        self._skeleton.read(reader)
+        skeleton = self._get_cached_resource("skeleton", [skeleton_ref], read_skeleton)
+        self._skeleton = skeleton and skeleton.clone()
         return self._skeleton
 
     def _create_skeleton(self, id: int) -> ISkeleton:
@@ -1,17 +1,16 @@
 from array import array
 from ctypes import sizeof
 import math
-from typing import Callable, ClassVar, NamedTuple, Protocol, Sequence, TypeVar, cast
-
+from types import MappingProxyType
+from typing import Any, ClassVar, Iterable, Mapping, NamedTuple, Sequence, cast
+import numpy
 from mathutils import Quaternion, Vector
 from io_scene_tr_reboot.tr.ResourceBuilder import ResourceBuilder
 from io_scene_tr_reboot.tr.ResourceReader import ResourceReader
 from io_scene_tr_reboot.tr.ResourceReference import ResourceReference
-from io_scene_tr_reboot.util.BitStreamWriter import BitStreamWriter
-from io_scene_tr_reboot.util.BitstreamReader import BitstreamReader
+from io_scene_tr_reboot.util.BinaryWriter import BinaryWriter
 from io_scene_tr_reboot.util.CStruct import CByte, CFlag, CInt, CLong, CShort, CStruct64, CUShort
 from io_scene_tr_reboot.util.CStructTypeMappings import CVec3
-from io_scene_tr_reboot.util.Enumerable import Enumerable
 from io_scene_tr_reboot.util.SlotsBase import SlotsBase
 
 class _AnimationDataRefs(CStruct64):
@@ -65,10 +64,6 @@ class _AnimationHeader(CStruct64):
 
 assert(sizeof(_AnimationHeader) == 0x130)
 
-class _ItemFrameKey(NamedTuple):
-    item_idx: int
-    frame_idx: int
-
 class _ItemAttributeKey(NamedTuple):
     item_idx: int
     attr_idx: int
@@ -79,12 +74,11 @@ class _AnimationDataHeader(NamedTuple):
     adjustment_floats: Sequence[float]
     frame_batch_sizes: Sequence[int]
 
-class _IItemAnimationFrame(Protocol):
-    def get_attr_value(self, attr_idx: int) -> Sequence[float] | None: ...
-    def set_attr_value(self, attr_idx: int, value: Sequence[float]) -> None: ...
-
-    def get_raw_attr_value(self, attr_idx: int) -> Sequence[float] | None: ...
-    def set_raw_attr_value(self, attr_idx: int, value: Sequence[float]) -> None: ...
+class ShadowAnimationTolerances(NamedTuple):
+    rotation: float = math.radians(0.01)
+    translation: float = 0.001
+    scale: float = 0.0001
+    blend_shape: float = 0.0005
 
 class BoneAnimationFrame(SlotsBase):
     rotation: Quaternion | None
@@ -133,120 +127,153 @@ class BoneAnimationFrame(SlotsBase):
             case _:
                 pass
 
-    def get_raw_attr_value(self, attr_idx: int) -> Sequence[float] | None:
-        match attr_idx:
-            case 0:
-                if self.rotation is None:
-                    return None
-
-                return cast(Sequence[float], self.quat_to_axis_angle(self.rotation))
-
-            case 1:
-                if self.position is None:
-                    return None
-
-                return cast(Sequence[float], self.position / 100)
-
-            case 2:
-                if self.scale is None:
-                    return None
-
-                return cast(Sequence[float], self.scale)
-
-            case _:
-                pass
-
-    def set_raw_attr_value(self, attr_idx: int, value: Sequence[float]) -> None:
-        match attr_idx:
-            case 0:
-                self.rotation = self.axis_angle_to_quat(Vector(value))
-
-            case 1:
-                self.position = Vector(value) * 100
-
-            case 2:
-                self.scale = Vector(value)
-
-            case _:
-                pass
-
-    def axis_angle_to_quat(self, vector: Vector) -> Quaternion:
-        angle = vector.length * math.pi
-        if angle < 0.00000001:
-            return Quaternion()
-
-        w = math.cos(angle / 2)
-        vector.normalize()
-        xyz = vector * math.sin(angle / 2)
-        return Quaternion((w, xyz.x, xyz.y, xyz.z))
-
-    def quat_to_axis_angle(self, quat: Quaternion) -> Vector:
-        if 1 - quat.w < 0.00000001:
-            return Vector((0, 0, 0))
-
-        angle = math.acos(quat.w) * 2
-        return Vector((quat.x, quat.y, quat.z)) * (angle / math.pi / math.sin(angle / 2))
-
 class BlendShapeAnimationFrame(SlotsBase):
     value: float
 
     def __init__(self) -> None:
         self.value = 0
 
-    def get_attr_value(self, attr_idx: int) -> Sequence[float] | None:
-        return [self.value]
-
-    def set_attr_value(self, attr_idx: int, value: Sequence[float]) -> None:
-        self.value = value[0]
-
-    def get_raw_attr_value(self, attr_idx: int) -> Sequence[float] | None:
-        return [self.value]
-
-    def set_raw_attr_value(self, attr_idx: int, value: Sequence[float]) -> None:
-        self.value = value[0]
-
 class ShadowAnimation(SlotsBase):
     bone_attr_element_size_mapping:        ClassVar[list[int]] = [0, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 23]
     blend_shape_attr_element_size_mapping: ClassVar[list[int]] = [0, 1, 2, 3, 4, 5, 6, 7, 8,  9,  10, 11, 12, 14, 16, 23]
 
+    bone_attr_slices: ClassVar[list[slice]] = [slice(0, 4), slice(4, 7), slice(7, 10)]
+    bone_identity_track_values: ClassVar[list[float]] = [1, 0, 0, 0, 0, 0, 0, 1, 1, 1]
+
     id: int
     bone_distances_from_parent: Sequence[float]
     ms_per_frame: int
     num_frames: int
-    bone_frames: dict[int, list[BoneAnimationFrame]]
-    blend_shape_frames: dict[int, list[BlendShapeAnimationFrame]]
+    bone_held_frame_numbers: list[int]
+    tolerances: ShadowAnimationTolerances
+
+    # (frames, bones, 10): rotation quaternion (wxyz), position, scale
+    bone_ids: list[int]
+    bone_tracks: numpy.ndarray[Any, Any]
+    bone_absence_mask: numpy.ndarray[Any, Any]
+    bone_fixation_mask: numpy.ndarray[Any, Any]
+
+    # (frames, blend shapes)
+    blend_shape_ids: list[int]
+    blend_shape_tracks: numpy.ndarray[Any, Any]
+    blend_shape_absence_mask: numpy.ndarray[Any, Any]
+    blend_shape_fixation_mask: numpy.ndarray[Any, Any]
 
     def __init__(self, id: int) -> None:
         self.id = id
         self.bone_distances_from_parent = []
         self.ms_per_frame = 100
         self.num_frames = 0
-        self.bone_frames = {}
-        self.blend_shape_frames = {}
-
-    def read(self, reader: ResourceReader) -> None:
+        self.bone_held_frame_numbers = []
+        self.tolerances = ShadowAnimationTolerances()
+        self.create_bone_tracks([])
+        self.create_blend_shape_tracks([])
+
+    def create_bone_tracks(self, global_bone_ids: list[int], num_frames: int | None = None) -> None:
+        if num_frames is None:
+            num_frames = self.num_frames
+
+        self.bone_ids = global_bone_ids
+        self.bone_tracks = numpy.tile(numpy.array(ShadowAnimation.bone_identity_track_values, numpy.float32), (num_frames, len(global_bone_ids), 1))
+        self.bone_absence_mask = numpy.ones((len(global_bone_ids), 3), bool)
+        self.bone_fixation_mask = numpy.zeros((len(global_bone_ids), 3), bool)
+
+    def create_blend_shape_tracks(self, global_blend_shape_ids: list[int], num_frames: int | None = None) -> None:
+        if num_frames is None:
+            num_frames = self.num_frames
+
+        self.blend_shape_ids = global_blend_shape_ids
+        self.blend_shape_tracks = numpy.zeros((num_frames, len(global_blend_shape_ids)), numpy.float32)
+        self.blend_shape_absence_mask = numpy.ones(len(global_blend_shape_ids), bool)
+        self.blend_shape_fixation_mask = numpy.zeros(len(global_blend_shape_ids), bool)
+
+    # The frame properties return read-only snapshots of the tracks; assign the whole property to change them
+    @property
+    def bone_frames(self) -> Mapping[int, Sequence[BoneAnimationFrame]]:
+        bone_frames: dict[int, Sequence[BoneAnimationFrame]] = {}
+        for bone_idx, global_bone_id in enumerate(self.bone_ids):
+            present_attr_idxs = [attr_idx for attr_idx in range(3) if not self.bone_absence_mask[bone_idx, attr_idx]]
+            frames: list[BoneAnimationFrame] = []
+            for track_values in self.bone_tracks[:, bone_idx].tolist():
+                frame = BoneAnimationFrame()
+                for attr_idx in present_attr_idxs:
+                    frame.set_attr_value(attr_idx, track_values[ShadowAnimation.bone_attr_slices[attr_idx]])
+
+                frames.append(frame)
+
+            bone_frames[global_bone_id] = tuple(frames)
+
+        return MappingProxyType(bone_frames)
+
+    @bone_frames.setter
+    def bone_frames(self, bone_frames: Mapping[int, Sequence[BoneAnimationFrame]]) -> None:
+        self.create_bone_tracks(list(bone_frames.keys()), max((len(frames) for frames in bone_frames.values()), default = 0))
+        for bone_idx, frames in enumerate(bone_frames.values()):
+            for frame_idx, frame in enumerate(frames):
+                for attr_idx in range(3):
+                    attr_value = frame.get_attr_value(attr_idx)
+                    if attr_value is not None:
+                        self.bone_tracks[frame_idx, bone_idx, ShadowAnimation.bone_attr_slices[attr_idx]] = attr_value
+                        self.bone_absence_mask[bone_idx, attr_idx] = False
+
+    @property
+    def blend_shape_frames(self) -> Mapping[int, Sequence[BlendShapeAnimationFrame]]:
+        blend_shape_frames: dict[int, Sequence[BlendShapeAnimationFrame]] = {}
+        for blend_shape_idx, global_blend_shape_id in enumerate(self.blend_shape_ids):
+            frames: list[BlendShapeAnimationFrame] = []
+            if not self.blend_shape_absence_mask[blend_shape_idx]:
+                for value in self.blend_shape_tracks[:, blend_shape_idx].tolist():
+                    frame = BlendShapeAnimationFrame()
+                    frame.value = value
+                    frames.append(frame)
+
+            blend_shape_frames[global_blend_shape_id] = tuple(frames)
+
+        return MappingProxyType(blend_shape_frames)
+
+    @blend_shape_frames.setter
+    def blend_shape_frames(self, blend_shape_frames: Mapping[int, Sequence[BlendShapeAnimationFrame]]) -> None:
+        self.create_blend_shape_tracks(list(blend_shape_frames.keys()), max((len(frames) for frames in blend_shape_frames.values()), default = 0))
+        for blend_shape_idx, frames in enumerate(blend_shape_frames.values()):
+            if len(frames) > 0:
+                self.blend_shape_tracks[:len(frames), blend_shape_idx] = [frame.value for frame in frames]
+                self.blend_shape_absence_mask[blend_shape_idx] = False
+
+    def read(
+        self,
+        reader: ResourceReader,
+        frame_range: range | None = None,
+        bone_ids: Iterable[int] | None = None,
+        blend_shape_ids: Iterable[int] | None = None
+    ) -> None:
         header = reader.read_struct(_AnimationHeader)
         self.ms_per_frame = header.ms_per_frame
         self.num_frames = header.num_frames
 
-        global_bone_ids: Sequence[int] = []
+        frame_idxs = numpy.arange(header.num_frames)
+        if frame_range is not None:
+            frame_idxs = numpy.sort(numpy.arange(frame_range.start, frame_range.stop, frame_range.step))
+            frame_idxs = frame_idxs[(frame_idxs >= 0) & (frame_idxs < header.num_frames)]
+
+        global_bone_ids: list[int] = []
         if header.global_bone_ids_ref is not None:
             reader.seek(header.global_bone_ids_ref)
-            global_bone_ids = reader.read_uint16_list(header.num_bones)
-            for global_bone_id in global_bone_ids:
-                self.bone_frames[global_bone_id] = []
+            global_bone_ids = list(reader.read_uint16_list(header.num_bones))
 
+        bone_idxs = self.get_requested_item_idxs(global_bone_ids, bone_ids)
         if header.bone_distances_from_parents_ref is not None:
             reader.seek(header.bone_distances_from_parents_ref)
-            self.bone_distances_from_parent = reader.read_float_list(header.num_bones)
+            bone_distances_from_parent = reader.read_float_list(header.num_bones)
+            self.bone_distances_from_parent = [bone_distances_from_parent[bone_idx] for bone_idx in bone_idxs.tolist()]
 
-        global_blend_shape_ids: Sequence[int] = []
+        global_blend_shape_ids: list[int] = []
         if header.global_blend_shape_ids_ref is not None:
             reader.seek(header.global_blend_shape_ids_ref)
-            global_blend_shape_ids = reader.read_uint16_list(header.num_blend_shapes)
-            for global_blend_shape_id in global_blend_shape_ids:
-                self.blend_shape_frames[global_blend_shape_id] = []
+            global_blend_shape_ids = list(reader.read_uint16_list(header.num_blend_shapes))
 
+        blend_shape_idxs = self.get_requested_item_idxs(global_blend_shape_ids, blend_shape_ids)
+
+        self.bone_held_frame_numbers = []
         if header.bone_held_frame_numbers_ref is not None:
             reader.seek(header.bone_held_frame_numbers_ref)
             while True:
@@ -254,115 +281,204 @@ class ShadowAnimation(SlotsBase):
                 if held_frame_num == 0:
                     break
 
-        self.read_bone_frames(header, global_bone_ids, reader)
-        self.read_blend_shape_frames(header, global_blend_shape_ids, reader)
+                self.bone_held_frame_numbers.append(held_frame_num)
+
+        self.read_bone_tracks(header, global_bone_ids, bone_idxs, frame_idxs, reader)
+        self.read_blend_shape_tracks(header, global_blend_shape_ids, blend_shape_idxs, frame_idxs, reader)
+        self.num_frames = len(frame_idxs)
 
-    def read_bone_frames(self, header: _AnimationHeader, global_bone_ids: Sequence[int], reader: ResourceReader) -> None:
-        def fetch_bone_frame(bone_frame_key: _ItemFrameKey) -> BoneAnimationFrame:
-            bone_frames = self.bone_frames[global_bone_ids[bone_frame_key.item_idx]]
-            if len(bone_frames) <= bone_frame_key.frame_idx:
-                bone_frames.append(BoneAnimationFrame())
+    def get_requested_item_idxs(self, global_item_ids: list[int], requested_global_item_ids: Iterable[int] | None) -> numpy.ndarray[Any, Any]:
+        if requested_global_item_ids is None:
+            return numpy.arange(len(global_item_ids))
 
-            return bone_frames[bone_frame_key.frame_idx]
+        requested_global_item_ids = set(requested_global_item_ids)
+        return numpy.array([item_idx for item_idx, global_item_id in enumerate(global_item_ids) if global_item_id in requested_global_item_ids], numpy.int64)
 
-        self.read_animation_data(
+    def read_bone_tracks(
+        self,
+        header: _AnimationHeader,
+        global_bone_ids: list[int],
+        bone_idxs: numpy.ndarray[Any, Any],
+        frame_idxs: numpy.ndarray[Any, Any],
+        reader: ResourceReader
+    ) -> None:
+        num_attrs_per_bone = header.has_bone_scale and 3 or 2
+        raw_values, absence_mask, fixation_mask = self.read_animation_data(
             header.bone_data_refs,
             header.num_bone_frame_batches,
             header.num_bones,
-            header.has_bone_scale and 3 or 2,
+            bone_idxs,
+            frame_idxs,
+            num_attrs_per_bone,
             3,
             ShadowAnimation.bone_attr_element_size_mapping,
-            fetch_bone_frame,
             reader
         )
 
-    def read_blend_shape_frames(self, header: _AnimationHeader, global_blend_shape_ids: Sequence[int], reader: ResourceReader) -> None:
-        def fetch_frame_blend_shape(blend_shape_frame_key: _ItemFrameKey) -> BlendShapeAnimationFrame:
-            blend_shape_frames = self.blend_shape_frames[global_blend_shape_ids[blend_shape_frame_key.item_idx]]
-            if len(blend_shape_frames) <= blend_shape_frame_key.frame_idx:
-                blend_shape_frames.append(BlendShapeAnimationFrame())
+        self.create_bone_tracks([global_bone_ids[bone_idx] for bone_idx in bone_idxs.tolist()], len(raw_values))
+        self.bone_tracks[:, :, 0:4] = self.axis_angles_to_quats(raw_values[:, :, 0])
+        self.bone_tracks[:, :, 4:7] = raw_values[:, :, 1] * 100
+        self.bone_absence_mask[:, :num_attrs_per_bone] = absence_mask
+        self.bone_fixation_mask[:, :num_attrs_per_bone] = fixation_mask
+        if num_attrs_per_bone > 2:
+            self.bone_tracks[:, :, 7:10] = numpy.where(absence_mask[:, 2, None], 1, raw_values[:, :, 2])
 
-            return blend_shape_frames[blend_shape_frame_key.frame_idx]
-
-        self.read_animation_data(
+    def read_blend_shape_tracks(
+        self,
+        header: _AnimationHeader,
+        global_blend_shape_ids: list[int],
+        blend_shape_idxs: numpy.ndarray[Any, Any],
+        frame_idxs: numpy.ndarray[Any, Any],
+        reader: ResourceReader
+    ) -> None:
+        raw_values, absence_mask, fixation_mask = self.read_animation_data(
             header.blend_shape_data_refs,
             header.num_blend_shape_frame_batches,
             header.num_blend_shapes,
+            blend_shape_idxs,
+            frame_idxs,
             1,
             1,
             ShadowAnimation.blend_shape_attr_element_size_mapping,
-            fetch_frame_blend_shape,
             reader
         )
 
+        self.create_blend_shape_tracks([global_blend_shape_ids[blend_shape_idx] for blend_shape_idx in blend_shape_idxs.tolist()], len(raw_values))
+        self.blend_shape_tracks[:] = raw_values[:, :, 0, 0]
+        self.blend_shape_absence_mask[:] = absence_mask[:, 0]
+        self.blend_shape_fixation_mask[:] = fixation_mask[:, 0]
+
     def read_animation_data(
         self,
         data_refs: _AnimationDataRefs,
         num_frame_batches: int,
         num_items: int,
+        item_idxs: numpy.ndarray[Any, Any],
+        frame_idxs: numpy.ndarray[Any, Any],
         num_attrs_per_item: int,
         num_elements_per_attr: int,
         element_size_mapping: list[int],
-        fetch_item_frame: Callable[[_ItemFrameKey], _IItemAnimationFrame],
         reader: ResourceReader
-    ) -> None:
+    ) -> tuple[numpy.ndarray[Any, Any], numpy.ndarray[Any, Any], numpy.ndarray[Any, Any]]:
+        absence_mask = numpy.ones((len(item_idxs), num_attrs_per_item), bool)
+        fixation_mask = numpy.zeros((len(item_idxs), num_attrs_per_item), bool)
+
         data_header = self.read_animation_data_header(data_refs, num_frame_batches, num_items, num_attrs_per_item, num_elements_per_attr, reader)
         if data_header is None or data_refs.frame_batches_ref is None:
-            return
+            return (numpy.zeros((0, len(item_idxs), num_attrs_per_item, num_elements_per_attr)), absence_mask, fixation_mask)
+
+        # Position of each file item in the returned arrays, or -1 if it wasn't requested
+        item_positions = numpy.full(num_items, -1, numpy.int64)
+        item_positions[item_idxs] = numpy.arange(len(item_idxs))
+
+        animated_item_idxs, animated_attr_idxs = numpy.array(data_header.animated_attr_keys, numpy.int64).reshape(-1, 2).T
+        requested_animated_attr_idxs = numpy.nonzero(item_positions[animated_item_idxs] >= 0)[0]
+        animated_attr_values = self.read_frame_batches(
+            data_refs.frame_batches_ref,
+            data_header,
+            requested_animated_attr_idxs,
+            frame_idxs,
+            num_elements_per_attr,
+            element_size_mapping,
+            reader
+        )
+        values = numpy.zeros((len(animated_attr_values), len(item_idxs), num_attrs_per_item, num_elements_per_attr))
 
-        num_animated_attrs = len(data_header.animated_attr_keys)
+        for item_attr_key, fixed_attr_value in data_header.fixed_attrs.items():
+            item_position = int(item_positions[item_attr_key.item_idx])
+            if item_position < 0:
+                continue
+
+            values[:, item_position, item_attr_key.attr_idx] = fixed_attr_value
+            absence_mask[item_position, item_attr_key.attr_idx] = False
+            fixation_mask[item_position, item_attr_key.attr_idx] = True
 
-        reader.seek(data_refs.frame_batches_ref)
-        next_frame_batch_start_pos = reader.position
-
-        element_sizes_per_attr = [0] * num_animated_attrs
-        adjustment_bytes: Sequence[int]
-        bitstream_reader = BitstreamReader(reader.data)
-
-        for frame_batch_idx, frame_batch_size in enumerate(data_header.frame_batch_sizes):
-            reader.position = next_frame_batch_start_pos
-            next_frame_batch_start_pos += frame_batch_size * 4
-
-            packed_encoded_attr_element_sizes = reader.read_uint32_list((num_animated_attrs * 4 + 31) // 32)
-            for item_attr_idx in range(num_animated_attrs):
-                encoded_attr_element_size = (packed_encoded_attr_element_sizes[item_attr_idx // 8] >> (28 - (item_attr_idx % 8) * 4)) & 0xF
-                element_sizes_per_attr[item_attr_idx] = element_size_mapping[encoded_attr_element_size]
-
-            adjustment_bytes = reader.read_bytes(num_animated_attrs * num_elements_per_attr * 2)
-            adjustment_bytes_as_float = Enumerable(adjustment_bytes).select(lambda b: b / 255.0).to_list()
-            reader.align(4)
-
-            bitstream_reader.seek(reader.position)
-
-            for frame_idx in range(frame_batch_idx * 16, min((frame_batch_idx + 1) * 16, self.num_frames)):
-                for item_attr_key, fixed_attr_value in data_header.fixed_attrs.items():
-                    item_frame = fetch_item_frame(_ItemFrameKey(item_attr_key.item_idx, frame_idx))
-                    item_frame.set_raw_attr_value(item_attr_key.attr_idx, fixed_attr_value)
-
-                adjustment_floats_idx = 0
-                adjustment_bytes_idx = 0
-                for item_attr_idx, item_attr_key in enumerate(data_header.animated_attr_keys):
-                    element_size = element_sizes_per_attr[item_attr_idx]
-                    attr_value: list[float] = []
-                    for _ in range(num_elements_per_attr):
-                        element_value: float
-                        if element_size == 0:
-                            element_value = (adjustment_bytes[adjustment_bytes_idx + 1] << 8) | adjustment_bytes[adjustment_bytes_idx]
-                            element_value /= 0xFFFF
-                        else:
-                            element_value = bitstream_reader.read(element_size)
-                            element_value /= (1 << element_size) - 1
-                            element_value = element_value * adjustment_bytes_as_float[adjustment_bytes_idx + 1] + adjustment_bytes_as_float[adjustment_bytes_idx]
-
-                        element_value = element_value * data_header.adjustment_floats[adjustment_floats_idx + num_elements_per_attr] + data_header.adjustment_floats[adjustment_floats_idx]
-                        attr_value.append(element_value)
-                        adjustment_floats_idx += 1
-                        adjustment_bytes_idx += 2
-
-                    adjustment_floats_idx += num_elements_per_attr
-
-                    item_frame = fetch_item_frame(_ItemFrameKey(item_attr_key.item_idx, frame_idx))
-                    item_frame.set_raw_attr_value(item_attr_key.attr_idx, attr_value)
+        animated_item_positions = item_positions[animated_item_idxs[requested_animated_attr_idxs]]
+        animated_attr_idxs = animated_attr_idxs[requested_animated_attr_idxs]
+        values[:, animated_item_positions, animated_attr_idxs] = animated_attr_values
+        absence_mask[animated_item_positions, animated_attr_idxs] = False
+
+        return (values, absence_mask, fixation_mask)
+
+    def read_frame_batches(
+        self,
+        frame_batches_ref: ResourceReference,
+        data_header: _AnimationDataHeader,
+        requested_animated_attr_idxs: numpy.ndarray[Any, Any],
+        frame_idxs: numpy.ndarray[Any, Any],
+        num_elements_per_attr: int,
+        element_size_mapping: list[int],
+        reader: ResourceReader
+    ) -> numpy.ndarray[Any, Any]:
+        num_animated_attrs = len(data_header.animated_attr_keys)
+        num_frames = min(len(data_header.frame_batch_sizes) * 16, self.num_frames)
+        frame_idxs = frame_idxs[frame_idxs < num_frames]
+        adjustment_floats = numpy.array(data_header.adjustment_floats, numpy.float64).reshape(num_animated_attrs, 2, num_elements_per_attr)[requested_animated_attr_idxs]
+
+        # Batches are independent, so only the ones containing requested frames need to be decoded, and only up to the last requested frame
+        reader.seek(frame_batches_ref)
+        frame_batch_positions = reader.position + numpy.concatenate([[0], numpy.cumsum(numpy.array(data_header.frame_batch_sizes, numpy.int64) * 4)])
+        attr_values = numpy.empty((len(frame_idxs), len(requested_animated_attr_idxs), num_elements_per_attr))
+
+        for frame_batch_idx in numpy.unique(frame_idxs // 16).tolist():
+            first_frame_idx = frame_batch_idx * 16
+            first_value_idx, end_value_idx = numpy.searchsorted(frame_idxs, [first_frame_idx, first_frame_idx + 16]).tolist()
+            batch_frame_idxs = frame_idxs[first_value_idx:end_value_idx] - first_frame_idx
+            num_batch_frames = int(batch_frame_idxs[-1]) + 1
+            reader.position = int(frame_batch_positions[frame_batch_idx])
+
+            normalized_values = self.read_frame_batch(
+                num_batch_frames,
+                num_animated_attrs,
+                requested_animated_attr_idxs,
+                num_elements_per_attr,
+                element_size_mapping,
+                reader
+            )
+            attr_values[first_value_idx:end_value_idx] = \
+                normalized_values.reshape(num_batch_frames, len(requested_animated_attr_idxs), num_elements_per_attr)[batch_frame_idxs] * adjustment_floats[:, 1] + adjustment_floats[:, 0]
+
+        return attr_values
+
+    def read_frame_batch(
+        self,
+        num_frames: int,
+        num_animated_attrs: int,
+        requested_animated_attr_idxs: numpy.ndarray[Any, Any],
+        num_elements_per_attr: int,
+        element_size_mapping: list[int],
+        reader: ResourceReader
+    ) -> numpy.ndarray[Any, Any]:
+        attr_idxs = numpy.arange(num_animated_attrs)
+        packed_encoded_attr_element_sizes = numpy.array(reader.read_uint32_list((num_animated_attrs * 4 + 31) // 32), numpy.int64)
+        encoded_attr_element_sizes = (packed_encoded_attr_element_sizes[attr_idxs // 8] >> (28 - (attr_idxs % 8) * 4)) & 0xF
+        element_sizes = numpy.repeat(numpy.array(element_size_mapping, numpy.int64)[encoded_attr_element_sizes], num_elements_per_attr)
+
+        adjustment_bytes = numpy.frombuffer(reader.read_bytes(num_animated_attrs * num_elements_per_attr * 2), numpy.uint8).reshape(-1, 2).astype(numpy.int64)
+        reader.align(4)
+
+        # The elements of all frames in the batch are packed back to back, most significant bit first. Each element
+        # (at most 23 bits) is extracted from the 32-bit big endian window starting at the byte that contains its first bit.
+        # Elements of tracks that weren't requested are simply never extracted.
+        frame_size_in_bits = int(element_sizes.sum())
+        requested_element_idxs = (requested_animated_attr_idxs[:, None] * num_elements_per_attr + numpy.arange(num_elements_per_attr)).reshape(-1)
+        element_bit_offsets = (numpy.cumsum(element_sizes) - element_sizes)[requested_element_idxs]
+        element_sizes = element_sizes[requested_element_idxs]
+        adjustment_bytes = adjustment_bytes[requested_element_idxs]
+        adjustment_bytes_as_float = adjustment_bytes / 255.0
+
+        bit_positions = numpy.arange(num_frames)[:, None] * frame_size_in_bits + element_bit_offsets
+        bitstream_size = (num_frames * frame_size_in_bits + 7) // 8
+        bitstream = numpy.zeros(bitstream_size + 4, numpy.int64)
+        bitstream[:bitstream_size] = numpy.frombuffer(reader.data, numpy.uint8, bitstream_size, reader.position)
+
+        byte_positions = bit_positions >> 3
+        windows = (bitstream[byte_positions] << 24) | (bitstream[byte_positions + 1] << 16) | (bitstream[byte_positions + 2] << 8) | bitstream[byte_positions + 3]
+        quantized_values = (windows >> (32 - (bit_positions & 7) - element_sizes)) & ((1 << element_sizes) - 1)
+
+        dequantized_values = quantized_values / numpy.maximum((1 << element_sizes) - 1, 1) * adjustment_bytes_as_float[:, 1] + adjustment_bytes_as_float[:, 0]
+        unquantized_values = ((adjustment_bytes[:, 1] << 8) | adjustment_bytes[:, 0]) / 0xFFFF
+        return numpy.where(element_sizes == 0, unquantized_values, dequantized_values)
 
     def read_animation_data_header(
         self,
@@ -423,18 +539,18 @@ class ShadowAnimation(SlotsBase):
         header = _AnimationHeader()
         header.ms_per_frame = self.ms_per_frame
         header.num_frames = self.num_frames
-        header.bone_held_frame_numbers_ref = None
-        header.num_bone_frame_batches        = len(self.bone_frames) > 0        and (self.num_frames + 15) // 16 or 0
-        header.num_blend_shape_frame_batches = len(self.blend_shape_frames) > 0 and (self.num_frames + 15) // 16 or 0
+        header.bone_held_frame_numbers_ref = len(self.bone_held_frame_numbers) > 0 and writer.make_internal_ref() or None
+        header.num_bone_frame_batches        = len(self.bone_ids) > 0        and (self.num_frames + 15) // 16 or 0
+        header.num_blend_shape_frame_batches = len(self.blend_shape_ids) > 0 and (self.num_frames + 15) // 16 or 0
         header.base_position = CVec3()
         header.base_rotation = CVec3()
 
-        header.num_bones = len(self.bone_frames)
+        header.num_bones = len(self.bone_ids)
         header.global_bone_ids_ref = writer.make_internal_ref()
         header.bone_distances_from_parents_ref = writer.make_internal_ref()
         header.bone_data_refs = self.create_animation_data_refs(writer)
 
-        header.num_blend_shapes = len(self.blend_shape_frames)
+        header.num_blend_shapes = len(self.blend_shape_ids)
         header.global_blend_shape_ids_ref = writer.make_internal_ref()
         header.blend_shape_data_refs = self.create_animation_data_refs(writer)
 
@@ -447,29 +563,38 @@ class ShadowAnimation(SlotsBase):
         writer.write_float_list(self.bone_distances_from_parent)
 
         header.global_bone_ids_ref.offset = writer.position
-        writer.write_uint16_list(list(self.bone_frames.keys()))
+        writer.write_uint16_list(self.bone_ids)
         writer.align(4)
 
+        if header.bone_held_frame_numbers_ref is not None:
+            header.bone_held_frame_numbers_ref.offset = writer.position
+            writer.write_int32_list(self.bone_held_frame_numbers)
+            writer.write_int32(0)
+
         header.global_blend_shape_ids_ref.offset = writer.position
-        writer.write_uint16_list(list(self.blend_shape_frames.keys()))
+        writer.write_uint16_list(self.blend_shape_ids)
         writer.align(4)
 
-        encoded_element_size = 14
+        raw_bone_values = numpy.empty((len(self.bone_tracks), len(self.bone_ids), 3, 3))
+        bone_tracks = self.bone_tracks.astype(numpy.float64)
+        raw_bone_values[:, :, 0] = self.quats_to_axis_angles(bone_tracks[:, :, 0:4])
+        raw_bone_values[:, :, 1] = bone_tracks[:, :, 4:7] / 100
+        raw_bone_values[:, :, 2] = bone_tracks[:, :, 7:10]
+
         self.write_animation_data(
-            self.bone_frames,
-            3,
-            3,
-            encoded_element_size,
-            ShadowAnimation.bone_attr_element_size_mapping[encoded_element_size],
+            raw_bone_values,
+            self.bone_absence_mask,
+            ShadowAnimation.bone_attr_element_size_mapping,
+            # The tolerances are distances, so each of the three components gets a share that keeps the combined error within them
+            [self.tolerances.rotation / math.pi / math.sqrt(3), self.tolerances.translation / 100 / math.sqrt(3), self.tolerances.scale / math.sqrt(3)],
             header.bone_data_refs,
             writer
         )
         self.write_animation_data(
-            self.blend_shape_frames,
-            1,
-            1,
-            encoded_element_size,
-            ShadowAnimation.blend_shape_attr_element_size_mapping[encoded_element_size],
+            self.blend_shape_tracks.astype(numpy.float64)[:, :, None, None],
+            self.blend_shape_absence_mask[:, None],
+            ShadowAnimation.blend_shape_attr_element_size_mapping,
+            [self.tolerances.blend_shape],
             header.blend_shape_data_refs,
             writer
         )
@@ -487,62 +612,113 @@ class ShadowAnimation(SlotsBase):
         refs.frame_batches_ref      = writer.make_internal_ref()
         return refs
 
-    TAnimationFrame = TypeVar("TAnimationFrame", bound = _IItemAnimationFrame)
-
     def write_animation_data(
         self,
-        item_frames: dict[int, list[TAnimationFrame]],
-        num_attrs_per_item: int,
-        num_elements_per_attr: int,
-        encoded_element_size: int,
-        element_size: int,
+        values: numpy.ndarray[Any, Any],
+        absence_mask: numpy.ndarray[Any, Any],
+        element_size_mapping: list[int],
+        attr_tolerances: list[float],
         data_refs: _AnimationDataRefs,
         writer: ResourceBuilder
     ) -> None:
         if data_refs.frame_batches_ref is None:
             return
 
-        data_header = self.collect_animation_data_header(item_frames, num_attrs_per_item, num_elements_per_attr, element_size)
-        self.write_animation_data_header(data_header, data_refs, len(item_frames), num_attrs_per_item, writer)
+        _, num_items, num_attrs_per_item, num_elements_per_attr = values.shape
+        data_header = self.collect_animation_data_header(values, absence_mask, attr_tolerances)
+
+        # Normalize against the adjustment floats as they'll be stored, so the error bounds hold for what the reader reconstructs
+        num_animated_attrs = len(data_header.animated_attr_keys)
+        animated_item_idxs, animated_attr_idxs = numpy.array(data_header.animated_attr_keys, numpy.int64).reshape(-1, 2).T
+        adjustment_floats = numpy.array(data_header.adjustment_floats, numpy.float32).astype(numpy.float64).reshape(num_animated_attrs, 2, num_elements_per_attr)
+        normalized_values = (values[:self.num_frames, animated_item_idxs, animated_attr_idxs] - adjustment_floats[:, 0]) / adjustment_floats[:, 1]
+        normalized_tolerances = numpy.array(attr_tolerances, numpy.float64)[animated_attr_idxs, None] / adjustment_floats[:, 1]
+
+        frame_batches = self.encode_frame_batches(normalized_values, normalized_tolerances, element_size_mapping)
+        data_header = data_header._replace(frame_batch_sizes = [len(frame_batch) // 4 for frame_batch in frame_batches])
+        self.write_animation_data_header(data_header, data_refs, num_items, num_attrs_per_item, writer)
 
         data_refs.frame_batches_ref.offset = writer.position
+        for frame_batch in frame_batches:
+            writer.write_bytes(frame_batch)
 
-        num_animated_attrs = len(data_header.animated_attr_keys)
-        packed_encoded_element_sizes = array("I", [0]) * ((num_animated_attrs * 4 + 31) // 32)
-        adjustment_bytes = bytearray([0]) * (num_animated_attrs * num_elements_per_attr * 2)
-        for item_attr_idx in range(num_animated_attrs):
-            packed_encoded_element_sizes[item_attr_idx // 8] |= encoded_element_size << (28 - (item_attr_idx % 8) * 4)
-            for elem_idx in range(num_elements_per_attr):
-                adjustment_bytes[(item_attr_idx * num_elements_per_attr + elem_idx) * 2 + 1] = 0xFF
-
-        item_ids = list(item_frames.keys())
-        for frame_batch_idx in range((self.num_frames + 15) // 16):
-            writer.write_uint32_list(packed_encoded_element_sizes)
-            writer.write_bytes(adjustment_bytes)
-            writer.align(4)
+        writer.write_uint64(0)
 
-            bitstream_writer = BitStreamWriter(writer.stream)
-            for frame_idx in range(frame_batch_idx * 16, min((frame_batch_idx + 1) * 16, self.num_frames)):
-                adjustment_floats_idx = 0
-                for attr_key in data_header.animated_attr_keys:
-                    attr_value = item_frames[item_ids[attr_key.item_idx]][frame_idx].get_raw_attr_value(attr_key.attr_idx)
-                    if attr_value is None:
-                        raise Exception()
-
-                    for elem_idx in range(num_elements_per_attr):
-                        offset_adjustment_float = data_header.adjustment_floats[adjustment_floats_idx]
-                        scale_adjustment_float  = data_header.adjustment_floats[adjustment_floats_idx + num_elements_per_attr]
-                        element_value = (attr_value[elem_idx] - offset_adjustment_float) / scale_adjustment_float
-                        element_value = int(element_value * ((1 << element_size) - 1))
-                        bitstream_writer.write(element_value, element_size)
-                        adjustment_floats_idx += 1
-
-                    adjustment_floats_idx += num_elements_per_attr
-
-            bitstream_writer.flush()
+    def encode_frame_batches(
+        self,
+        normalized_values: numpy.ndarray[Any, Any],
+        normalized_tolerances: numpy.ndarray[Any, Any],
+        element_size_mapping: list[int]
+    ) -> list[bytes]:
+        num_frames, num_animated_attrs, num_elements_per_attr = normalized_values.shape
+        num_frame_batches = (num_frames + 15) // 16
+        if num_frame_batches == 0:
+            return []
+
+        # (batches, attrs, 16 frames, elements), with the last batch padded by repeating the final frame
+        batch_values = normalized_values[numpy.minimum(numpy.arange(num_frame_batches * 16), num_frames - 1)] \
+                            .reshape(num_frame_batches, 16, num_animated_attrs, num_elements_per_attr)                 \
+                            .transpose(0, 2, 1, 3)
+        batch_min_values = batch_values.min(axis = 2)
+        batch_max_values = batch_values.max(axis = 2)
+
+        offset_bytes = numpy.clip(numpy.floor(batch_min_values * 255), 0, 255)
+        range_bytes  = numpy.clip(numpy.ceil(batch_max_values * 255) - offset_bytes, 0, 255)
+        batch_offsets = (offset_bytes / 255)[:, :, None, :]
+        batch_ranges  = (range_bytes  / 255)[:, :, None, :]
+        unquantized_values = numpy.clip(numpy.rint((batch_min_values + batch_max_values) / 2 * 0xFFFF), 0, 0xFFFF)
+
+        # Per batch and attribute, pick the smallest element size that reconstructs every value within tolerance.
+        # Element size 0 stores a single 16-bit value in the adjustment bytes; for the others, rounding keeps the error within half a step.
+        element_size_table = numpy.array(element_size_mapping)
+        unquantized_within_tolerance = numpy.all(numpy.abs(batch_values - (unquantized_values / 0xFFFF)[:, :, None, :]) <= normalized_tolerances[:, None, :], axis = (2, 3))
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            required_num_steps = numpy.nan_to_num((range_bytes / 255 / (2 * normalized_tolerances)).max(axis = 2, initial = 0), nan = numpy.inf)
+            required_element_sizes = numpy.ceil(numpy.log2(required_num_steps + 1))
+
+        quantized_encoded_element_sizes = numpy.clip(numpy.searchsorted(element_size_table, required_element_sizes), 1, len(element_size_mapping) - 1)
+        encoded_element_sizes = numpy.where(unquantized_within_tolerance, element_size_mapping.index(0), quantized_encoded_element_sizes)
+
+        max_quantized_values = ((1 << element_size_table[encoded_element_sizes]) - 1)[:, :, None, None]
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            quantized_values = numpy.rint((batch_values - batch_offsets) / batch_ranges * max_quantized_values)
+
+        quantized_values = numpy.clip(numpy.nan_to_num(quantized_values), 0, max_quantized_values).astype(numpy.int64)
+
+        unquantized_mask = element_size_table[encoded_element_sizes] == 0
+        adjustment_bytes = numpy.stack(
+            [
+                numpy.where(unquantized_mask[:, :, None], unquantized_values.astype(numpy.int64) & 0xFF, offset_bytes),
+                numpy.where(unquantized_mask[:, :, None], unquantized_values.astype(numpy.int64) >> 8,   range_bytes)
+            ],
+            axis = -1
+        ).astype(numpy.uint8)
+
+        max_element_size = max(element_size_mapping)
+        bit_idxs = numpy.arange(max_element_size)
+        frame_batches: list[bytes] = []
+        for frame_batch_idx in range(num_frame_batches):
+            writer = BinaryWriter()
+
+            packed_encoded_element_sizes = numpy.zeros(((num_animated_attrs * 4 + 31) // 32) * 8, numpy.int64)
+            packed_encoded_element_sizes[:num_animated_attrs] = encoded_element_sizes[frame_batch_idx]
+            packed_encoded_element_sizes = (packed_encoded_element_sizes.reshape(-1, 8) << numpy.arange(28, -1, -4)).sum(axis = 1)
+            writer.write_bytes(packed_encoded_element_sizes.astype("<u4").tobytes())
+            writer.write_bytes(adjustment_bytes[frame_batch_idx].tobytes())
             writer.align(4)
 
-        writer.write_uint64(0)
+            # Frame by frame, attribute by attribute, element by element; most significant bit first, padded to whole 64-bit words
+            num_batch_frames = min(16, num_frames - frame_batch_idx * 16)
+            element_sizes = numpy.repeat(element_size_table[encoded_element_sizes[frame_batch_idx]], num_elements_per_attr)
+            element_values = quantized_values[frame_batch_idx, :, :num_batch_frames].transpose(1, 0, 2).reshape(num_batch_frames, num_animated_attrs * num_elements_per_attr, 1)
+            element_bits = (element_values >> numpy.maximum(element_sizes[:, None] - 1 - bit_idxs, 0)) & 1
+            bitstream = numpy.packbits(element_bits[:, bit_idxs < element_sizes[:, None]].astype(numpy.uint8))
+            writer.write_bytes(bitstream.tobytes())
+            writer.write_padding(-len(bitstream) % 8)
+
+            frame_batches.append(bytes(writer.buffer))
+
+        return frame_batches
 
     def write_animation_data_header(
         self,
@@ -606,62 +782,61 @@ class ShadowAnimation(SlotsBase):
 
     def collect_animation_data_header(
         self,
-        item_frames: dict[int, list[TAnimationFrame]],
-        num_attrs_per_item: int,
-        num_elements_per_attr: int,
-        element_size_in_bits: int
+        values: numpy.ndarray[Any, Any],
+        absence_mask: numpy.ndarray[Any, Any],
+        attr_tolerances: list[float]
     ) -> _AnimationDataHeader:
-        fixed_attrs: dict[_ItemAttributeKey, list[float]] = {}
-        animated_attr_min_values: dict[_ItemAttributeKey, list[float]] = {}
-        animated_attr_max_values: dict[_ItemAttributeKey, list[float]] = {}
+        if len(values) == 0:
+            return _AnimationDataHeader({}, [], [], [])
 
-        for item_idx, global_item_id in enumerate(item_frames.keys()):
-            for attr_idx in range(num_attrs_per_item):
-                for item_frame in item_frames[global_item_id]:
-                    attr_value = item_frame.get_raw_attr_value(attr_idx)
-                    if attr_value is None:
-                        continue
-
-                    attr_key = _ItemAttributeKey(item_idx, attr_idx)
-                    if attr_key not in animated_attr_min_values:
-                        existing_fixed_attr_value = fixed_attrs.get(attr_key)
-                        if existing_fixed_attr_value is None:
-                            fixed_attrs[attr_key] = list(attr_value)
-                        elif (tuple(existing_fixed_attr_value) != tuple(attr_value)):
-                            animated_attr_min_values[attr_key] = list(fixed_attrs[attr_key])
-                            animated_attr_max_values[attr_key] = list(fixed_attrs[attr_key])
-                            del fixed_attrs[attr_key]
-
-                    if attr_key in animated_attr_min_values:
-                        min_attr_value = animated_attr_min_values[attr_key]
-                        max_attr_value = animated_attr_max_values[attr_key]
-                        for elem_idx in range(num_elements_per_attr):
-                            min_attr_value[elem_idx] = min(min_attr_value[elem_idx], attr_value[elem_idx])
-                            max_attr_value[elem_idx] = max(max_attr_value[elem_idx], attr_value[elem_idx])
-
-        adjustment_floats: list[float] = []
-        for attr_key, min_attr_value in animated_attr_min_values.items():
-            adjustment_floats.extend(cast(Sequence[float], min_attr_value))
-
-            max_attr_value = animated_attr_max_values[attr_key]
-            for elem_idx in range(num_elements_per_attr):
-                elem_scale = max_attr_value[elem_idx] - min_attr_value[elem_idx]
-                if elem_scale > 0.0001:
-                    adjustment_floats.append(elem_scale)
-                else:
-                    adjustment_floats.append(1.0)
-
-        num_animated_attrs = len(animated_attr_min_values)
-        elem_sizes_size_in_ints = (num_animated_attrs * 4 + 31) // 32
-        adjustment_bytes_size_in_ints = (num_animated_attrs * num_elements_per_attr * 8 * 2 + 31) // 32
-        animated_vectors_size_in_ints = (16 * num_animated_attrs * num_elements_per_attr * element_size_in_bits + 31) // 32
-        frame_batch_size_in_ints = elem_sizes_size_in_ints + adjustment_bytes_size_in_ints + animated_vectors_size_in_ints
-        num_frame_batches = ((self.num_frames + 15) // 16)
-        frame_batch_sizes = [frame_batch_size_in_ints] * num_frame_batches
-
-        return _AnimationDataHeader(
-            cast(dict[_ItemAttributeKey, Sequence[float]], fixed_attrs),
-            list(animated_attr_min_values.keys()),
-            adjustment_floats,
-            frame_batch_sizes
+        # A track whose values all lie within tolerance of their midpoint gets stored once as a fixed value
+        min_values = values.min(axis = 0)
+        max_values = values.max(axis = 0)
+        mid_values = (min_values + max_values) / 2
+        constant_mask = numpy.all(max_values - min_values <= 2 * numpy.array(attr_tolerances, numpy.float64)[:, None], axis = 2)
+        fixed_mask = ~absence_mask & constant_mask
+        animated_mask = ~absence_mask & ~constant_mask
+
+        fixed_attrs: dict[_ItemAttributeKey, Sequence[float]] = {}
+        for item_idx, attr_idx in numpy.argwhere(fixed_mask).tolist():
+            fixed_attrs[_ItemAttributeKey(item_idx, attr_idx)] = mid_values[item_idx, attr_idx].tolist()
+
+        animated_attr_keys = [_ItemAttributeKey(item_idx, attr_idx) for item_idx, attr_idx in numpy.argwhere(animated_mask).tolist()]
+        scales = max_values[animated_mask] - min_values[animated_mask]
+        scales = numpy.where(scales > 0.0001, scales, 1.0)
+        adjustment_floats: list[float] = numpy.stack([min_values[animated_mask], scales], axis = 1).reshape(-1).tolist()
+
+        return _AnimationDataHeader(fixed_attrs, animated_attr_keys, adjustment_floats, [])
+
+    @staticmethod
+    def axis_angles_to_quats(vectors: numpy.ndarray[Any, Any]) -> numpy.ndarray[Any, Any]:
+        lengths = numpy.linalg.norm(vectors, axis = -1, keepdims = True)
+        half_angles = lengths * (math.pi / 2)
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            quats = numpy.concatenate([numpy.cos(half_angles), vectors / lengths * numpy.sin(half_angles)], axis = -1)
+
+        quats[lengths[..., 0] * math.pi < 0.00000001] = (1, 0, 0, 0)
+        return quats
+
+    @staticmethod
+    def quats_to_axis_angles(quats: numpy.ndarray[Any, Any]) -> numpy.ndarray[Any, Any]:
+        angles = numpy.arccos(numpy.clip(quats[..., 0:1], -1, 1)) * 2
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            vectors = quats[..., 1:4] * (angles / math.pi / numpy.sin(angles / 2))
+
+        vectors[1 - quats[..., 0] < 0.00000001] = 0
+        return vectors
+
+    @staticmethod
+    def multiply_quats(quats1: numpy.ndarray[Any, Any], quats2: numpy.ndarray[Any, Any]) -> numpy.ndarray[Any, Any]:
+        w1, x1, y1, z1 = numpy.moveaxis(quats1, -1, 0)
+        w2, x2, y2, z2 = numpy.moveaxis(quats2, -1, 0)
+        return numpy.stack(
+            [
+                w1*w2 - x1*x2 - y1*y2 - z1*z2,
+                w1*x2 + x1*w2 + y1*z2 - z1*y2,
+                w1*y2 - x1*z2 + y1*w2 + z1*x2,
+                w1*z2 + x1*y2 - y1*x2 + z1*w2
+            ],
+            axis = -1
         )
@@ -160,13 +160,13 @@ class ShadowCloth(RiseCloth):
         return reader.read_struct_list(_ClothDefStrip, count)
 
     def read_definition_masses(self, reader: ResourceReader, count: int) -> Sequence[IClothDefMass]:
-        return reader.read_struct_list(_ClothDefMass, count)
+        return reader.read_struct_array(_ClothDefMass, count)
 
     def read_definition_anchor_bones(self, reader: ResourceReader, count: int) -> Sequence[IClothDefAnchorBone]:
         return reader.read_struct_list(_ClothDefAnchorBone, count)
 
     def read_definition_springs(self, reader: ResourceReader, count: int) -> Sequence[IClothDefSpring]:
-        return reader.read_struct_list(_ClothDefSpring, count)
+        return reader.read_struct_array(_ClothDefSpring, count)
 
     def read_tune_header(self, reader: ResourceReader) -> IClothTune:
         return reader.read_struct(_ClothTune)
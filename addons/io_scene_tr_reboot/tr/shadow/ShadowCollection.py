@@ -2,7 +2,7 @@ from mathutils import Matrix
 from io_scene_tr_reboot.tr.Cloth import Cloth
 from io_scene_tr_reboot.tr.Enumerations import CdcGame
 from io_scene_tr_reboot.tr.Material import Material
-from io_scene_tr_reboot.tr.Model import IModel
+from io_scene_tr_reboot.tr.Model import IModel, ModelSummary
 from io_scene_tr_reboot.tr.ResourceKey import ResourceKey
 from io_scene_tr_reboot.tr.ResourceReader import ResourceReader
 from io_scene_tr_reboot.tr.Skeleton import ISkeleton
@@ -23,6 +23,29 @@ class ShadowCollection(RiseCollection):
         if refs_reader is None:
             return None
 
+        refs = ShadowModelReferences()
+        refs.read(refs_reader)
+        model_data_resource = refs.model_data_resource
+        if model_data_resource is None:
+            return None
+
+        def read_model() -> IModel | None:
+            data_reader = self.get_resource_reader(model_data_resource, False)
+            if data_reader is None:
+                return None
+
+            model = ShadowModel(resource.id, refs)
+            model.read(data_reader)
+            return model
+
+        model = self._get_cached_resource("model", [resource, model_data_resource], read_model, lambda model: model.get_memory_size())
+        return model and model.clone()
+
+    def probe_model(self, resource: ResourceKey) -> ModelSummary | None:
+        refs_reader = self.get_resource_reader(resource, True)
+        if refs_reader is None:
+            return None
+
         refs = ShadowModelReferences()
         refs.read(refs_reader)
         if refs.model_data_resource is None:
@@ -32,9 +55,7 @@ class ShadowCollection(RiseCollection):
         if data_reader is None:
             return None
 
-        model = ShadowModel(resource.id, refs)
-        model.read(data_reader)
-        return model
+        return ShadowModel(resource.id, refs).probe(data_reader)
 
     def _create_material(self) -> Material:
         return ShadowMaterial()
@@ -1,9 +1,10 @@
+import copy
 from ctypes import sizeof
 from typing import Literal, cast
 from io_scene_tr_reboot.tr.BlendShape import BlendShape
 from io_scene_tr_reboot.tr.Mesh import IMesh, MeshBase
-from io_scene_tr_reboot.tr.Vertex import Vertex
 from io_scene_tr_reboot.tr.VertexAttributeTypes import VertexAttributeTypes
+from io_scene_tr_reboot.tr.VertexList import VertexList
 from io_scene_tr_reboot.tr.shadow.ShadowMeshPart import ShadowMeshPart
 from io_scene_tr_reboot.tr.shadow.ShadowModelDataHeader import ShadowModelDataHeader
 from io_scene_tr_reboot.tr.shadow.ShadowVertexAttributeTypes import ShadowVertexAttributeTypes
@@ -45,6 +46,13 @@ class ShadowMesh(MeshBase[ShadowModelDataHeader, ShadowMeshPart]):
     def vertex_attribute_types(self) -> VertexAttributeTypes:
         return ShadowVertexAttributeTypes.instance
 
+    def clone(self, deep: bool = False) -> IMesh:
+        new_mesh = cast(ShadowMesh, super().clone(deep))
+        if deep:
+            new_mesh.mesh_header = copy.deepcopy(self.mesh_header)
+
+        return new_mesh
+
     def assign(self, other: IMesh) -> None:
         super().assign(other)
 
@@ -56,7 +64,7 @@ class ShadowMesh(MeshBase[ShadowModelDataHeader, ShadowMeshPart]):
         self.mesh_header = reader.read_struct(_MeshHeader)
 
     def read_bone_indices(self, reader: BinaryReader) -> None:
-        self.bone_indices = reader.read_int32_list(self.mesh_header.num_bones)
+        self.bone_indices = list(reader.read_int32_list(self.mesh_header.num_bones))
         reader.align(0x20)
 
     def read_content(self, reader: BinaryReader) -> None:
@@ -72,10 +80,7 @@ class ShadowMesh(MeshBase[ShadowModelDataHeader, ShadowMeshPart]):
             vertex_buffers.append(reader.read_bytes(self.mesh_header.num_vertices * vertex_size))
             reader.align(0x20)
 
-        for i in range(self.mesh_header.num_vertices):
-            vertex: Vertex = Vertex()
-            vertex.read(vertex_buffers, i, self.vertex_format)
-            self.vertices.append(vertex)
+        self.vertices = VertexList.read(vertex_buffers, self.vertex_format, self.mesh_header.num_vertices)
 
         if self.model_data_header.has_blend_shapes:
             self.blend_shapes = BlendShape.read(reader, 0, self.model_data_header.num_blend_shapes, None, self.mesh_header.num_vertices)
@@ -96,8 +101,7 @@ class ShadowMesh(MeshBase[ShadowModelDataHeader, ShadowMeshPart]):
         writer.align(0x20)
 
         vertex_buffers: list[bytearray] = [bytearray(vertex_size * len(self.vertices)) for vertex_size in self.vertex_format.vertex_sizes]
-        for i in range(len(self.vertices)):
-            self.vertices[i].write(vertex_buffers, i, self.vertex_format)
+        self.vertices.write(vertex_buffers, self.vertex_format)
 
         for vertex_buffer in vertex_buffers:
             writer.write_bytes(vertex_buffer)
@@ -1,5 +1,7 @@
+from array import array
+from ctypes import sizeof
 from mathutils import Vector
-from io_scene_tr_reboot.tr.Model import Model
+from io_scene_tr_reboot.tr.Model import Model, ModelSummary
 from io_scene_tr_reboot.tr.ResourceBuilder import ResourceBuilder
 from io_scene_tr_reboot.tr.ResourceReader import ResourceReader
 from io_scene_tr_reboot.tr.shadow.ShadowMesh import ShadowMesh
@@ -45,13 +47,13 @@ class ShadowModel(Model[ShadowModelReferences, ShadowModelDataHeader, ShadowMesh
         if self.header.blend_shape_names_offset != 0:
             reader.skip(self.header.num_blend_shapes * 0x40)
 
-        indices = reader.read_uint16_list(self.header.num_indexes)
+        # Copied so the parts don't keep the (possibly memory-mapped) file data alive
+        indices = array("H", reader.read_bytes(self.header.num_indexes * 2).tobytes())
         reader.align(0x20)
 
         mesh_idx: int = 0
-        for _ in range(self.header.num_mesh_parts):
+        for mesh_part in reader.read_struct_array(ShadowMeshPart, self.header.num_mesh_parts):
             mesh: ShadowMesh = self.meshes[mesh_idx]
-            mesh_part: ShadowMeshPart = reader.read_struct(ShadowMeshPart)
             mesh_part.indices = indices[mesh_part.first_index_idx:mesh_part.first_index_idx + mesh_part.num_triangles * 3]
 
             mesh.parts.append(mesh_part)
@@ -61,6 +63,37 @@ class ShadowModel(Model[ShadowModelReferences, ShadowModelDataHeader, ShadowMesh
         if reader.position != len(reader.data):
             raise Exception("Unread data remaining at end of file")
 
+    def probe(self, reader: ResourceReader) -> ModelSummary | None:
+        header = reader.read_struct(ShadowModelDataHeader)
+        reader.skip(header.name_length)
+        reader.align(0x20)
+
+        if header.pre_tesselation_info_offset != 0xFFFFFFFF:
+            raise NotImplementedError()
+
+        reader.skip(header.num_lod_levels * 0x40)
+        reader.skip(header.num_bone_mappings * 4)
+        reader.align(0x20)
+
+        meshes: list[ShadowMesh] = []
+        for _ in range(header.num_meshes):
+            mesh = ShadowMesh(header)
+            mesh.read_header(reader)
+            meshes.append(mesh)
+
+        for mesh in meshes:
+            mesh.read_bone_indices(reader)
+
+        # The mesh part table is always at the very end of the file
+        reader.position = len(reader.data) - header.num_mesh_parts * sizeof(ShadowMeshPart)
+        parts = reader.read_struct_list(ShadowMeshPart, header.num_mesh_parts)
+
+        return self.create_summary(
+            header,
+            [(mesh.mesh_header.num_vertices, mesh.bone_indices, mesh.mesh_header.num_parts) for mesh in meshes],
+            parts
+        )
+
     def write(self, writer: ResourceBuilder) -> None:
         self.header.signature = int.from_bytes(b"Mesh", "little")
         self.header.num_bone_mappings = Enumerable(self.meshes).select_many(lambda m: m.bone_indices).max(default_value = -1) + 1
@@ -52,7 +52,7 @@ class _ClothDefMass(CStruct32, IClothDefMass if TYPE_CHECKING else object):
     def mass(self, value: int) -> None:             # type: ignore
         self.is_pinned = 0 if value == 255 else 1
 
-    bounce_back_factor: int
+    bounce_back_factor: int = 0
     _ignored_fields_ = ("bounce_back_factor",)
 
 assert(sizeof(_ClothDefMass) == 0x30)
@@ -71,7 +71,7 @@ class _ClothDefSpring(CStruct32, IClothDefSpring if TYPE_CHECKING else object):
     mass_1_idx: CShort
     mass_2_idx: CShort
 
-    stretchiness_interpolation_value: float
+    stretchiness_interpolation_value: float = 0
     _ignored_fields_ = ("stretchiness_interpolation_value",)
 
 assert(sizeof(_ClothDefSpring) == 8)
@@ -431,21 +431,13 @@ class Tr2013Cloth(Cloth):
         return def_strips
 
     def read_definition_masses(self, reader: ResourceReader, count: int) -> Sequence[IClothDefMass]:
-        def_masses = reader.read_struct_list(_ClothDefMass, count)
-        for def_mass in def_masses:
-            def_mass.bounce_back_factor = 0
-
-        return def_masses
+        return reader.read_struct_array(_ClothDefMass, count)
 
     def read_definition_anchor_bones(self, reader: ResourceReader, count: int) -> Sequence[IClothDefAnchorBone]:
         return reader.read_struct_list(_ClothDefAnchorBone, count)
 
     def read_definition_springs(self, reader: ResourceReader, count: int) -> Sequence[IClothDefSpring]:
-        def_springs = reader.read_struct_list(_ClothDefSpring, count)
-        for def_spring in def_springs:
-            def_spring.stretchiness_interpolation_value = 0
-
-        return def_springs
+        return reader.read_struct_array(_ClothDefSpring, count)
 
     def read_tune_header(self, reader: ResourceReader) -> IClothTune:
         dtp_tune = reader.read_struct(_ClothTune)
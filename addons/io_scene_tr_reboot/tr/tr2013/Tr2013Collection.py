@@ -5,7 +5,7 @@ from io_scene_tr_reboot.tr.Collection import Collection
 from io_scene_tr_reboot.tr.Collision import Collision
 from io_scene_tr_reboot.tr.Enumerations import CdcGame
 from io_scene_tr_reboot.tr.Material import Material
-from io_scene_tr_reboot.tr.Model import IModel
+from io_scene_tr_reboot.tr.Model import IModel, ModelSummary
 from io_scene_tr_reboot.tr.ResourceKey import ResourceKey
 from io_scene_tr_reboot.tr.ResourceReference import ResourceReference
 from io_scene_tr_reboot.tr.Skeleton import ISkeleton
@@ -67,15 +67,36 @@ class Tr2013Collection(Collection):
         if legacy_model is None or legacy_model.new_model_ref is None:
             return None
 
-        reader = self.get_resource_reader(legacy_model.new_model_ref, True)
-        if reader is None:
+        new_model_ref = legacy_model.new_model_ref
+
+        def read_model() -> IModel | None:
+            reader = self.get_resource_reader(new_model_ref, True)
+            if reader is None:
+                return None
+
+            model = Tr2013Model(resource.id, new_model_ref.id)
+            model.read(reader)
+            return model
+
+        model = self._get_cached_resource("model", [resource, new_model_ref], read_model, lambda model: model.get_memory_size())
+        if model is None:
             return None
 
-        model = Tr2013Model(resource.id, legacy_model.new_model_ref.id)
-        model.read(reader)
+        model = model.clone()
         self.__models[resource] = model
         return model
 
+    def probe_model(self, resource: ResourceKey) -> ModelSummary | None:
+        legacy_model = self.get_legacy_model(resource)
+        if legacy_model is None or legacy_model.new_model_ref is None:
+            return None
+
+        reader = self.get_resource_reader(legacy_model.new_model_ref, True)
+        if reader is None:
+            return None
+
+        return Tr2013Model(resource.id, legacy_model.new_model_ref.id).probe(reader)
+
     def _create_material(self) -> Material:
         return Tr2013Material()
 
@@ -85,15 +106,23 @@ class Tr2013Collection(Collection):
             if legacy_model is None or legacy_model.bones_ref is None or legacy_model.bone_id_map_ref is None:
                 continue
 
-            bones_reader = self.get_resource_reader(legacy_model.bones_ref, True)
-            id_mappings_reader = self.get_resource_reader(legacy_model.bone_id_map_ref, True)
-            if bones_reader is None or id_mappings_reader is None:
-                continue
+            bones_ref = legacy_model.bones_ref
+            bone_id_map_ref = legacy_model.bone_id_map_ref
+
+            def read_skeleton() -> ISkeleton | None:
+                bones_reader = self.get_resource_reader(bones_ref, True)
+                id_mappings_reader = self.get_resource_reader(bone_id_map_ref, True)
+                if bones_reader is None or id_mappings_reader is None:
+                    return None
+
+                skeleton = Tr2013Skeleton(bones_ref.id)
+                skeleton.read_bones(bones_reader)
+                skeleton.read_id_mappings(id_mappings_reader)
+                return skeleton
 
-            skeleton = Tr2013Skeleton(legacy_model.bones_ref.id)
-            skeleton.read_bones(bones_reader)
-            skeleton.read_id_mappings(id_mappings_reader)
-            return skeleton
+            skeleton = self._get_cached_resource("skeleton", [bones_ref, bone_id_map_ref], read_skeleton)
+            if skeleton is not None:
+                return skeleton.clone()
 
         return None
 
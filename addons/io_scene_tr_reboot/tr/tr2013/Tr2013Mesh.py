@@ -1,3 +1,4 @@
+import copy
 from ctypes import sizeof
 from typing import TYPE_CHECKING, Literal, Protocol, Sequence, TypeVar, cast
 from io_scene_tr_reboot.tr.BlendShape import BlendShape
@@ -6,8 +7,8 @@ from io_scene_tr_reboot.tr.MeshPart import IMeshPart
 from io_scene_tr_reboot.tr.IModelDataHeader import IModelDataHeader
 from io_scene_tr_reboot.tr.ResourceBuilder import ResourceBuilder
 from io_scene_tr_reboot.tr.ResourceReader import ResourceReader
-from io_scene_tr_reboot.tr.Vertex import Vertex
 from io_scene_tr_reboot.tr.VertexAttributeTypes import VertexAttributeTypes
+from io_scene_tr_reboot.tr.VertexList import VertexList
 from io_scene_tr_reboot.tr.tr2013.Tr2013MeshPart import Tr2013MeshPart
 from io_scene_tr_reboot.tr.tr2013.Tr2013ModelDataHeader import Tr2013ModelDataHeader
 from io_scene_tr_reboot.tr.tr2013.Tr2013VertexAttributeTypes import Tr2013VertexAttributeTypes
@@ -30,6 +31,7 @@ class ITr2013Mesh(IMesh, Protocol):
     mesh_header: ITr2013MeshHeader
 
     def read(self, reader: ResourceReader, model_data_header_pos: int, blend_shape_names: list[str] | None) -> None: ...
+    def read_mesh_header(self, reader: ResourceReader) -> ITr2013MeshHeader: ...
 
     def write_header(self, writer: ResourceBuilder) -> None: ...
     def write_bone_indices(self, writer: ResourceBuilder, model_data_header_pos: int) -> None: ...
@@ -66,6 +68,13 @@ class Tr2013MeshBase(ITr2013Mesh, MeshBase[TModelDataHeader, TMeshPart]):
         self.model_data_header = model_data_header
         self.mesh_header = self.create_mesh_header()
 
+    def clone(self, deep: bool = False) -> IMesh:
+        new_mesh = cast(Tr2013MeshBase[TModelDataHeader, TMeshPart], super().clone(deep))
+        if deep:
+            new_mesh.mesh_header = copy.deepcopy(self.mesh_header)
+
+        return new_mesh
+
     def assign(self, other: IMesh) -> None:
         super().assign(other)
 
@@ -79,7 +88,7 @@ class Tr2013MeshBase(ITr2013Mesh, MeshBase[TModelDataHeader, TMeshPart]):
         return_pos = reader.position
 
         reader.position = model_data_header_pos + self.mesh_header.bone_indices_offset
-        self.bone_indices = reader.read_int32_list(self.mesh_header.num_bones)
+        self.bone_indices = list(reader.read_int32_list(self.mesh_header.num_bones))
 
         reader.position = model_data_header_pos + self.mesh_header.vertex_format_offset
         self.vertex_format.read(reader)
@@ -89,10 +98,7 @@ class Tr2013MeshBase(ITr2013Mesh, MeshBase[TModelDataHeader, TMeshPart]):
             reader.position = model_data_header_pos + vertex_buffer.offset
             vertex_buffers.append(reader.read_bytes(self.mesh_header.num_vertices * self.vertex_format.vertex_sizes[i]))
 
-        for i in range(self.mesh_header.num_vertices):
-            vertex = Vertex()
-            vertex.read(vertex_buffers, i, self.vertex_format)
-            self.vertices.append(vertex)
+        self.vertices = VertexList.read(vertex_buffers, self.vertex_format, self.mesh_header.num_vertices)
 
         if self.model_data_header.has_blend_shapes:
             reader.position = model_data_header_pos + self.mesh_header.blend_shapes_header_offset
@@ -117,8 +123,7 @@ class Tr2013MeshBase(ITr2013Mesh, MeshBase[TModelDataHeader, TMeshPart]):
         writer.align(0x20)
 
         vertex_buffers: list[bytearray] = [bytearray(vertex_size * len(self.vertices)) for vertex_size in self.vertex_format.vertex_sizes]
-        for i in range(len(self.vertices)):
-            self.vertices[i].write(vertex_buffers, i, self.vertex_format)
+        self.vertices.write(vertex_buffers, self.vertex_format)
 
         for i, vertex_buffer in enumerate(vertex_buffers):
             self.mesh_header.vertex_buffers[i].offset = writer.position - model_data_header_pos
@@ -1,8 +1,10 @@
-from typing import TypeVar, cast
+from array import array
+from ctypes import sizeof
+from typing import Sequence, TypeVar, cast
 from mathutils import Vector
 from io_scene_tr_reboot.tr.Enumerations import ResourceType
 from io_scene_tr_reboot.tr.MeshPart import IMeshPart
-from io_scene_tr_reboot.tr.Model import Model
+from io_scene_tr_reboot.tr.Model import Model, ModelSummary
 from io_scene_tr_reboot.tr.IModelDataHeader import IModelDataHeader
 from io_scene_tr_reboot.tr.ModelReferences import ModelReferences
 from io_scene_tr_reboot.tr.ResourceBuilder import ResourceBuilder
@@ -41,7 +43,7 @@ class Tr2013ModelBase(Model[TModelReferences, TModelDataHeader, TMesh, TMeshPart
             self.meshes.append(mesh)
 
         reader.position = model_data_header_pos + self.header.index_data_offset
-        indices = reader.read_uint16_list(self.header.num_indexes)
+        indices = array("H", reader.read_bytes(self.header.num_indexes * 2).tobytes())
 
         reader.position = model_data_header_pos + self.header.mesh_parts_offet
         mesh_idx: int = 0
@@ -54,6 +56,32 @@ class Tr2013ModelBase(Model[TModelReferences, TModelDataHeader, TMesh, TMeshPart
             if len(mesh.parts) == mesh.mesh_header.num_parts:
                 mesh_idx = mesh_idx + 1
 
+    def probe(self, reader: ResourceReader) -> ModelSummary | None:
+        self.refs.read(reader)
+        if self.refs.model_data_resource is None:
+            return None
+
+        reader.seek(self.refs.model_data_resource)
+        model_data_header_pos = reader.position
+        header = self.read_header(reader)
+
+        reader.position = model_data_header_pos + header.mesh_headers_offset
+        mesh_headers = [self.create_mesh().read_mesh_header(reader) for _ in range(header.num_meshes)]
+
+        bone_indices: list[Sequence[int]] = []
+        for mesh_header in mesh_headers:
+            reader.position = model_data_header_pos + mesh_header.bone_indices_offset
+            bone_indices.append(reader.read_int32_list(mesh_header.num_bones))
+
+        reader.position = model_data_header_pos + header.mesh_parts_offet
+        parts = [self.read_mesh_part(reader) for _ in range(header.num_mesh_parts)]
+
+        return self.create_summary(
+            header,
+            [(mesh_header.num_vertices, bone_indices[i], mesh_header.num_parts) for i, mesh_header in enumerate(mesh_headers)],
+            parts
+        )
+
     def create_mesh(self) -> TMesh: ...
 
     def read_header(self, reader: ResourceReader) -> TModelDataHeader: ...
@@ -97,7 +125,7 @@ class Tr2013ModelBase(Model[TModelReferences, TModelDataHeader, TMesh, TMeshPart
            self.header.pre_tesselation_info_offset != 0xFFFFFFFF:
             raise NotImplementedError()
 
-        writer.write_struct(cast(CStruct, self.header))
+        writer.reserve(sizeof(cast(CStruct, self.header)))
 
         self.header.bone_mappings_offset = writer.position - model_data_header_pos
         writer.write_int32_list(range(self.header.num_bone_mappings))
@@ -114,12 +142,9 @@ class Tr2013ModelBase(Model[TModelReferences, TModelDataHeader, TMesh, TMeshPart
             mesh.write_content(writer, model_data_header_pos)
 
         # Rewrite mesh headers now that they have the content offsets
-        meshes_end_pos = writer.position
-        writer.position = model_data_header_pos + self.header.mesh_headers_offset
-        for mesh in self.meshes:
-            mesh.write_header(writer)
-
-        writer.position = meshes_end_pos
+        with writer.at(model_data_header_pos + self.header.mesh_headers_offset):
+            for mesh in self.meshes:
+                mesh.write_header(writer)
 
         self.header.index_data_offset = writer.position - model_data_header_pos
         cumulative_index_count = 0
@@ -137,11 +162,11 @@ class Tr2013ModelBase(Model[TModelReferences, TModelDataHeader, TMesh, TMeshPart
             for mesh_part in mesh.parts:
                 writer.write_struct(cast(CStruct, mesh_part))
 
-        # Rewrite model header
-        writer.position = 0
-        self.refs.write(writer)
-        writer.align(0x20)
-        writer.write_struct(cast(CStruct, self.header))
+        # Rewrite model references and header now that they have the final offsets
+        with writer.at(0):
+            self.refs.write(writer)
+
+        writer.write_struct_at(model_data_header_pos, cast(CStruct, self.header))
 
 class Tr2013Model(Tr2013ModelBase[Tr2013ModelReferences, Tr2013ModelDataHeader, Tr2013Mesh, Tr2013MeshPart]):
     def __init__(self, model_id: int, model_data_id: int) -> None:
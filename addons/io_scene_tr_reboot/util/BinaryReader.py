@@ -1,8 +1,9 @@
-import ctypes
+from mmap import mmap
 from struct import unpack_from
 from typing import Sequence, TypeVar
 from mathutils import Matrix, Vector
 from io_scene_tr_reboot.util.CStruct import CStruct
+from io_scene_tr_reboot.util.CStructArray import CStructArray
 from io_scene_tr_reboot.util.CStructTypeMappings import CVec3, CVec4
 from io_scene_tr_reboot.util.Enumerable import Enumerable
 from io_scene_tr_reboot.util.SlotsBase import SlotsBase
@@ -10,10 +11,10 @@ from io_scene_tr_reboot.util.SlotsBase import SlotsBase
 TStruct = TypeVar("TStruct", bound = CStruct)
 
 class BinaryReader(SlotsBase):
-    data: bytes
+    data: bytes | mmap
     position: int
 
-    def __init__(self, data: bytes) -> None:
+    def __init__(self, data: bytes | mmap) -> None:
         self.data = data
         self.position = 0
 
@@ -153,9 +154,13 @@ class BinaryReader(SlotsBase):
         return matrix
 
     def read_struct(self, t: type[TStruct]) -> TStruct:
-        result = t.from_buffer_copy(self.data, self.position)
-        result.map_fields_from_c(self)
-        self.position += ctypes.sizeof(t)
+        result: TStruct = t._decode_(self.data, self.position, self, 0)
+        self.position += t._size_
+        return result
+
+    def read_struct_array(self, t: type[TStruct], count: int) -> CStructArray[TStruct]:
+        result = CStructArray(t, self.data, self.position, count, self)
+        self.position += count * t._size_
         return result
 
     def read_struct_list(self, t: type[TStruct], count: int) -> list[TStruct]:
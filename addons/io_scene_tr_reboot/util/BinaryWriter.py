@@ -1,111 +1,156 @@
 from array import array
-from io import SEEK_SET, BufferedIOBase
-from struct import pack
-from typing import Sequence
+from contextlib import contextmanager
+from ctypes import sizeof
+from struct import Struct, pack
+from typing import Iterator, Sequence
 from mathutils import Matrix, Vector
 from io_scene_tr_reboot.util.CStruct import CStruct
 from io_scene_tr_reboot.util.SlotsBase import SlotsBase
 
+_int8    = Struct("<b")
+_int16   = Struct("<h")
+_uint16  = Struct("<H")
+_int32   = Struct("<i")
+_uint32  = Struct("<I")
+_int64   = Struct("<q")
+_uint64  = Struct("<Q")
+_float   = Struct("<f")
+_vec3d   = Struct("<3f")
+_vec4d   = Struct("<4f")
+_mat4x4  = Struct("<16f")
+
 class BinaryWriter(SlotsBase):
-    stream: BufferedIOBase
+    data: bytearray
+    size: int
+    position: int
+
+    def __init__(self, capacity: int = 0x1000) -> None:
+        self.data = bytearray(capacity)
+        self.size = 0
+        self.position = 0
 
-    def __init__(self, stream: BufferedIOBase) -> None:
-        self.stream = stream
-    
     @property
-    def position(self) -> int:
-        return self.stream.tell()
-    
-    @position.setter
-    def position(self, value: int) -> None:
-        self.stream.seek(value, SEEK_SET)
-    
+    def buffer(self) -> memoryview:
+        return memoryview(self.data)[:self.size]
+
     def align(self, size: int) -> None:
-        while (self.stream.tell() % size) != 0:
-            self.write_byte(0)
-    
+        padding = -self.position % size
+        if padding > 0:
+            self.write_padding(padding)
+
+    def write_padding(self, length: int) -> None:
+        position = self.__advance(length)
+        self.data[position:position + length] = bytes(length)
+
+    def reserve(self, length: int) -> int:
+        position = self.position
+        self.write_padding(length)
+        return position
+
+    @contextmanager
+    def at(self, position: int) -> Iterator[None]:
+        prev_position = self.position
+        self.position = position
+        try:
+            yield
+        finally:
+            self.position = prev_position
+
     def write_bytes(self, value: bytes | bytearray | memoryview) -> None:
-        self.stream.write(value)
-    
+        length = value.nbytes if isinstance(value, memoryview) else len(value)
+        position = self.__advance(length)
+        self.data[position:position + length] = value
+
     def write_byte(self, value: int) -> None:
-        self.write_bytes(pack("<b", value))
-    
+        _int8.pack_into(self.data, self.__advance(1), value)
+
     def write_int16(self, value: int) -> None:
-        self.write_bytes(pack("<h", value))
-    
+        _int16.pack_into(self.data, self.__advance(2), value)
+
     def write_int16_list(self, values: Sequence[int]) -> None:
         self.__write_number_list(values, "h")
-    
+
     def write_uint16(self, value: int) -> None:
-        self.write_bytes(pack("<H", value))
+        _uint16.pack_into(self.data, self.__advance(2), value)
 
     def write_uint16_list(self, values: Sequence[int]) -> None:
         self.__write_number_list(values, "H")
-    
+
     def write_int32(self, value: int) -> None:
-        self.write_bytes(pack("<i", value))
-    
+        _int32.pack_into(self.data, self.__advance(4), value)
+
     def write_int32_list(self, values: Sequence[int]) -> None:
         self.__write_number_list(values, "i")
-    
+
     def write_uint32(self, value: int) -> None:
-        self.write_bytes(pack("<I", value))
-    
+        _uint32.pack_into(self.data, self.__advance(4), value)
+
     def write_uint32_list(self, values: Sequence[int]) -> None:
         self.__write_number_list(values, "I")
-    
+
     def write_int64(self, value: int) -> None:
-        self.write_bytes(pack("<q", value))
+        _int64.pack_into(self.data, self.__advance(8), value)
 
     def write_int64_list(self, values: Sequence[int]) -> None:
         self.__write_number_list(values, "q")
-    
+
     def write_uint64(self, value: int) -> None:
-        self.write_bytes(pack("<Q", value))
+        _uint64.pack_into(self.data, self.__advance(8), value)
 
     def write_uint64_list(self, values: Sequence[int]) -> None:
         self.__write_number_list(values, "Q")
-    
+
     def write_float(self, value: float) -> None:
-        self.write_bytes(pack("<f", value))
-    
+        _float.pack_into(self.data, self.__advance(4), value)
+
     def write_float_list(self, values: Sequence[float]) -> None:
         self.__write_number_list(values, "f")
-    
+
     def __write_number_list(self, values: Sequence[int | float], type: str) -> None:
         if isinstance(values, array) and values.typecode == type:
             self.write_bytes(memoryview(values))
         else:
             self.write_bytes(pack(f"<{len(values)}{type}", *values))
-    
+
     def write_vec3d(self, value: Vector) -> None:
-        self.write_float(value.x)
-        self.write_float(value.y)
-        self.write_float(value.z)
-    
+        _vec3d.pack_into(self.data, self.__advance(12), value.x, value.y, value.z)
+
     def write_vec3d_list(self, values: Sequence[Vector]) -> None:
         for value in values:
             self.write_vec3d(value)
-    
+
     def write_vec4d(self, value: Vector) -> None:
-        self.write_float(value.x)
-        self.write_float(value.y)
-        self.write_float(value.z)
-        self.write_float(0)
-    
+        _vec4d.pack_into(self.data, self.__advance(16), value.x, value.y, value.z, 0)
+
     def write_vec4d_list(self, values: Sequence[Vector]) -> None:
         for value in values:
             self.write_vec4d(value)
-    
+
     def write_mat4x4(self, value: Matrix) -> None:
-        for col in range(4):
-            for row in range(4):
-                self.write_float(value[row][col])
+        _mat4x4.pack_into(self.data, self.__advance(0x40), *(value[row][col] for col in range(4) for row in range(4)))
 
     def write_struct(self, value: CStruct) -> None:
         value.map_fields_to_c(self)
-        self.stream.write(value)
+        length = sizeof(value)
+        position = self.__advance(length)
+        self.data[position:position + length] = value
+
+    def write_struct_at(self, position: int, value: CStruct) -> None:
+        with self.at(position):
+            self.write_struct(value)
 
     def write_struct_list(self, values: Sequence[CStruct]) -> None:
         for value in values:
             self.write_struct(value)
+
+    def __advance(self, length: int) -> int:
+        position = self.position
+        end = position + length
+        if end > len(self.data):
+            self.data.extend(bytes(max(end, len(self.data) * 2) - len(self.data)))
+
+        if end > self.size:
+            self.size = end
+
+        self.position = end
+        return position
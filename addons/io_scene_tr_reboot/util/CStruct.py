@@ -195,12 +195,57 @@ class CStructMeta(type(ctypes.Structure)):
             namespace["_fields_"] = field_types
             namespace["_field_infos_"] = field_infos
 
-        return cast(type, super()).__new__(cls, class_name, bases, namespace)
+        struct_class = cast("type[CStruct]", cast(type, super()).__new__(cls, class_name, bases, namespace))
+        if class_name not in ("CStruct", "CStruct32", "CStruct64"):
+            CStructMeta.compile_codecs(struct_class)
+
+        return struct_class
 
     @staticmethod
     def get_c_field_name(name: str) -> str:
         return "_c_" + name
 
+    @staticmethod
+    def compile_codecs(struct_class: "type[CStruct]") -> None:
+        # Generate straight-line mapping functions for the struct so that reading/writing an instance doesn't need to
+        # walk _field_infos_ and resolve field names and type mappings every time. Fields without a type mapping
+        # are skipped entirely, as from_buffer_copy() already decodes them.
+        code_globals: dict[str, typing.Any] = { "from_buffer_copy": struct_class.from_buffer_copy }
+        from_c_lines: list[str] = []
+        to_c_lines: list[str] = []
+
+        for field_idx, (field_name, field_info) in enumerate(struct_class._field_infos_.items()):
+            c_field_name = CStructMeta.get_c_field_name(field_name)
+            if field_info.type_mapping is not None:
+                code_globals[f"map_from_c_{field_idx}"] = field_info.type_mapping.map_from_c
+                code_globals[f"map_to_c_{field_idx}"] = field_info.type_mapping.map_to_c
+                from_c_lines.append(f"self.{field_name} = map_from_c_{field_idx}(self.{c_field_name}, offset_in_parent + {field_info.offset}, context)")
+                to_c_lines.append(f"self.{c_field_name} = map_to_c_{field_idx}(self.{field_name}, offset_in_parent + {field_info.offset}, context)")
+            elif issubclass(field_info.type, CStruct):                                      # type: ignore
+                from_c_lines.append(f"struct_value = self.{c_field_name}")
+                from_c_lines.append(f"struct_value.map_fields_from_c(context, offset_in_parent + {field_info.offset})")
+                from_c_lines.append(f"self.{field_name} = struct_value")
+                to_c_lines.append(f"struct_value = self.{field_name}")
+                to_c_lines.append(f"struct_value.map_fields_to_c(context, offset_in_parent + {field_info.offset})")
+                to_c_lines.append(f"self.{c_field_name} = struct_value")
+
+        source = "def map_fields_from_c(self, context = None, offset_in_parent = 0):\n" + \
+                 "".join(f"    {line}\n" for line in from_c_lines or ["pass"]) + \
+                 "def map_fields_to_c(self, context = None, offset_in_parent = 0):\n" + \
+                 "".join(f"    {line}\n" for line in to_c_lines or ["pass"]) + \
+                 "def decode(buffer, offset, context, offset_in_parent = 0):\n" + \
+                 "    self = from_buffer_copy(buffer, offset)\n" + \
+                 "".join(f"    {line}\n" for line in from_c_lines) + \
+                 "    return self\n"
+
+        code_locals: dict[str, typing.Any] = {}
+        exec(compile(source, f"<CStruct {struct_class.__name__}>", "exec"), code_globals, code_locals)
+
+        setattr(struct_class, "map_fields_from_c", code_locals["map_fields_from_c"])
+        setattr(struct_class, "map_fields_to_c", code_locals["map_fields_to_c"])
+        setattr(struct_class, "_decode_", staticmethod(code_locals["decode"]))
+        setattr(struct_class, "_size_", ctypes.sizeof(struct_class))
+
     @staticmethod
     def make_flag_property(flags_field_name: str, flag_value: int) -> property:
         def get(struct: CStruct) -> bool:
@@ -228,6 +273,8 @@ class CStruct(ctypes.Structure, struct_secondary_base, metaclass=struct_metaclas
     _bitness: typing.ClassVar[Bitness] = Bitness.ANY
 
     _field_infos_: dict[str, CStructField] = {}
+    _size_: typing.ClassVar[int] = 0
+    _decode_: typing.ClassVar[typing.Callable[[typing.Any, int, object, int], typing.Any]]
 
     @classmethod
     def register_type_mappings(cls, *mappings: ICStructTypeMapping) -> None:
@@ -238,26 +285,10 @@ class CStruct(ctypes.Structure, struct_secondary_base, metaclass=struct_metaclas
                 _type_mappings[(mapping.mapped_type, Bitness.X64)] = mapping
 
     def map_fields_from_c(self, context: object = None, offset_in_parent: int = 0) -> None:
-        for field_name, field_info in self._field_infos_.items():
-            if field_info.type_mapping is not None:
-                c_value = getattr(self, CStructMeta.get_c_field_name(field_name))
-                mapped_value = field_info.type_mapping.map_from_c(c_value, offset_in_parent + field_info.offset, context)
-                setattr(self, field_name, mapped_value)
-            elif issubclass(field_info.type, CStruct):                                      # type: ignore
-                struct_value = typing.cast(CStruct, getattr(self, CStructMeta.get_c_field_name(field_name)))
-                struct_value.map_fields_from_c(context, offset_in_parent + field_info.offset)
-                setattr(self, field_name, struct_value)
+        pass
 
     def map_fields_to_c(self, context: object = None, offset_in_parent: int = 0) -> None:
-        for field_name, field_info in self._field_infos_.items():
-            if field_info.type_mapping is not None:
-                mapped_value = getattr(self, field_name)
-                c_value = field_info.type_mapping.map_to_c(mapped_value, offset_in_parent + field_info.offset, context)
-                setattr(self, CStructMeta.get_c_field_name(field_name), c_value)
-            elif issubclass(field_info.type, CStruct):                                      # type: ignore
-                struct_value = typing.cast(CStruct, getattr(self, field_name))
-                struct_value.map_fields_to_c(context, offset_in_parent + field_info.offset)
-                setattr(self, CStructMeta.get_c_field_name(field_name), struct_value)
+        pass
 
 class CStruct32(CStruct):
     _bitness = Bitness.X86
@@ -0,0 +1,82 @@
+from typing import Any, Generic, Iterator, Sequence, TypeVar, cast, overload
+import numpy
+from numpy.lib import recfunctions
+from mathutils import Vector
+from io_scene_tr_reboot.util.CStruct import CStruct
+
+TStruct = TypeVar("TStruct", bound = CStruct)
+
+class CStructArray(Sequence[TStruct], Generic[TStruct]):
+    struct_type: type[TStruct]
+    data: Any
+    position: int
+    count: int
+    context: Any
+    items: list[TStruct | None]
+
+    def __init__(self, struct_type: type[TStruct], data: Any, position: int, count: int, context: Any) -> None:
+        self.struct_type = struct_type
+        self.data = data
+        self.position = position
+        self.count = count
+        self.context = context
+        self.items = [None] * count
+
+    def __len__(self) -> int:
+        return self.count
+
+    @overload
+    def __getitem__(self, index: int) -> TStruct: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[TStruct]: ...
+
+    def __getitem__(self, index: int | slice) -> TStruct | list[TStruct]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+
+        if index < 0:
+            index += self.count
+
+        if index < 0 or index >= self.count:
+            raise IndexError()
+
+        item = self.items[index]
+        if item is None:
+            item = self.__map_item(index)
+
+        return item
+
+    def __iter__(self) -> Iterator[TStruct]:
+        items = self.items
+        for i in range(self.count):
+            item = items[i]
+            if item is None:
+                item = self.__map_item(i)
+
+            yield item
+
+    def __map_item(self, index: int) -> TStruct:
+        item_position = self.position + index * self.struct_type._size_
+        item: TStruct = self.struct_type._decode_(self.data, item_position, self.context, item_position - self.context.position)
+        self.items[index] = item
+        return item
+
+    def column(self, field_name: str) -> numpy.ndarray[Any, Any]:
+        field_info = self.struct_type._field_infos_[field_name]
+        c_type = field_info.type_mapping.c_type if field_info.type_mapping is not None else field_info.type
+        c_dtype = numpy.dtype(c_type)
+        values = numpy.ndarray(
+            (self.count,),
+            dtype = c_dtype,
+            buffer = cast(Any, self.data),
+            offset = self.position + field_info.offset,
+            strides = (self.struct_type._size_,)
+        )
+        if c_dtype.fields is not None:
+            values = recfunctions.structured_to_unstructured(values)
+            if field_info.type is Vector:
+                values = values[:, :3]
+
+        return values
+
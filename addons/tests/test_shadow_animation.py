@@ -0,0 +1,99 @@
+# Needs a Python that can import the addon (bpy, mathutils), e.g. run "python -m unittest discover tests" from the addons folder with the bpy module installed
+import math
+import os
+import sys
+import unittest
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from io_scene_tr_reboot.tr.Enumerations import CdcGame, ResourceType
+from io_scene_tr_reboot.tr.ResourceBuilder import ResourceBuilder
+from io_scene_tr_reboot.tr.ResourceKey import ResourceKey
+from io_scene_tr_reboot.tr.ResourceReader import ResourceReader
+from io_scene_tr_reboot.tr.shadow.ShadowAnimation import ShadowAnimation, ShadowAnimationTolerances
+
+class ShadowAnimationTests(unittest.TestCase):
+    num_frames = 53
+    bone_ids = [3, 7, 12, 40, 41, 90]
+    blend_shape_ids = [1, 5, 9]
+
+    def setUp(self) -> None:
+        rng = numpy.random.default_rng(1234)
+
+        animation = ShadowAnimation(1)
+        animation.num_frames = self.num_frames
+        animation.bone_distances_from_parent = [1.0] * len(self.bone_ids)
+        animation.create_bone_tracks(list(self.bone_ids))
+        animation.create_blend_shape_tracks(list(self.blend_shape_ids))
+
+        quats = rng.normal(size = (self.num_frames, len(self.bone_ids), 4))
+        animation.bone_tracks[:, :, 0:4] = quats / numpy.linalg.norm(quats, axis = -1, keepdims = True)
+        animation.bone_tracks[:, :, 4:7] = rng.uniform(-50, 50, (self.num_frames, len(self.bone_ids), 3))
+        animation.bone_tracks[:, :, 7:10] = rng.uniform(0.5, 2, (self.num_frames, len(self.bone_ids), 3))
+        animation.bone_tracks[:, 1, 4:7] = (10, 20, 30)
+        animation.bone_absence_mask[:] = False
+        animation.bone_absence_mask[2, 2] = True
+        animation.bone_tracks[:, 2, 7:10] = 1
+
+        animation.blend_shape_tracks[:] = rng.uniform(0, 1, (self.num_frames, len(self.blend_shape_ids)))
+        animation.blend_shape_absence_mask[:] = False
+
+        self.animation = animation
+        self.data = ShadowAnimationTests.write_animation(animation)
+
+    def test_round_trip_within_tolerances(self) -> None:
+        tolerances = ShadowAnimationTolerances()
+        original = self.animation
+        decoded = ShadowAnimationTests.read_animation(self.data)
+
+        self.assertEqual(decoded.num_frames, original.num_frames)
+        self.assertEqual(decoded.bone_ids, original.bone_ids)
+        self.assertEqual(decoded.blend_shape_ids, original.blend_shape_ids)
+        self.assertTrue(numpy.array_equal(decoded.bone_absence_mask, original.bone_absence_mask))
+        self.assertTrue(numpy.array_equal(decoded.blend_shape_absence_mask, original.blend_shape_absence_mask))
+
+        original_tracks = original.bone_tracks.astype(numpy.float64)
+        decoded_tracks = decoded.bone_tracks.astype(numpy.float64)
+        self.assertLessEqual(ShadowAnimationTests.get_rotation_errors(original_tracks[:, :, 0:4], decoded_tracks[:, :, 0:4]).max(), tolerances.rotation * 1.001)
+        self.assertLessEqual(numpy.linalg.norm(decoded_tracks[:, :, 4:7] - original_tracks[:, :, 4:7], axis = -1).max(), tolerances.translation * 1.001)
+        self.assertLessEqual(numpy.linalg.norm(decoded_tracks[:, :, 7:10] - original_tracks[:, :, 7:10], axis = -1).max(), tolerances.scale * 1.001)
+        self.assertLessEqual(numpy.abs(decoded.blend_shape_tracks.astype(numpy.float64) - original.blend_shape_tracks).max(), tolerances.blend_shape * 1.001)
+
+    def test_partial_read_matches_full_read(self) -> None:
+        full = ShadowAnimationTests.read_animation(self.data)
+
+        frame_range = range(5, 47, 3)
+        bone_ids = [7, 40, 90]
+        blend_shape_ids = [9, 1]
+        partial = ShadowAnimationTests.read_animation(self.data, frame_range, bone_ids, blend_shape_ids)
+
+        bone_idxs = [full.bone_ids.index(bone_id) for bone_id in partial.bone_ids]
+        blend_shape_idxs = [full.blend_shape_ids.index(blend_shape_id) for blend_shape_id in partial.blend_shape_ids]
+        frame_idxs = list(frame_range)
+        self.assertEqual(sorted(partial.bone_ids), sorted(bone_ids))
+        self.assertEqual(sorted(partial.blend_shape_ids), sorted(blend_shape_ids))
+        self.assertEqual(partial.num_frames, len(frame_idxs))
+        self.assertTrue(numpy.array_equal(partial.bone_tracks, full.bone_tracks[frame_idxs][:, bone_idxs]))
+        self.assertTrue(numpy.array_equal(partial.bone_absence_mask, full.bone_absence_mask[bone_idxs]))
+        self.assertTrue(numpy.array_equal(partial.blend_shape_tracks, full.blend_shape_tracks[frame_idxs][:, blend_shape_idxs]))
+
+    @staticmethod
+    def write_animation(animation: ShadowAnimation) -> bytes:
+        builder = ResourceBuilder(ResourceKey(ResourceType.ANIMATION, animation.id), CdcGame.SOTTR)
+        animation.write(builder)
+        return bytes(builder.build())
+
+    @staticmethod
+    def read_animation(data: bytes, frame_range: range | None = None, bone_ids: list[int] | None = None, blend_shape_ids: list[int] | None = None) -> ShadowAnimation:
+        animation = ShadowAnimation(1)
+        animation.read(ResourceReader(ResourceKey(ResourceType.ANIMATION, 1), data, True, CdcGame.SOTTR), frame_range, bone_ids, blend_shape_ids)
+        return animation
+
+    @staticmethod
+    def get_rotation_errors(quats1: numpy.ndarray, quats2: numpy.ndarray) -> numpy.ndarray:
+        relative_quats = ShadowAnimation.multiply_quats(quats1 * [1, -1, -1, -1], quats2)
+        return 2 * numpy.arctan2(numpy.linalg.norm(relative_quats[..., 1:4], axis = -1), numpy.abs(relative_quats[..., 0]))
+
+if __name__ == "__main__":
+    unittest.main()